@@ -0,0 +1,72 @@
+from sqlbuilder import smartsql
+
+try:
+    str = unicode  # Python 2.* compatible
+    string_types = (basestring,)
+except NameError:
+    string_types = (str,)
+
+
+class Aggregate(object):
+    """Aggregate function of field.
+
+    The name of field is resolved by Table.get_field() of the query, so, it can be a path through relations,
+    like "author__last_name".
+    """
+    function = None
+
+    def __init__(self, field, distinct=False):
+        """
+        :type field: str or sqlbuilder.smartsql.expressions.Operable
+        :type distinct: bool
+        """
+        self.field = field
+        self.distinct = distinct
+
+    @property
+    def default_alias(self):
+        if not isinstance(self.field, string_types):
+            raise TypeError("Alias is required for aggregate of expression {0!r}".format(self.field))
+        return '{0}__{1}'.format('all' if self.field == '*' else self.field, self.function.lower())
+
+    def get_field(self, table):
+        """
+        :type table: ascetic.query.Table
+        :rtype: sqlbuilder.smartsql.expressions.Operable
+        """
+        if self.field == '*':
+            return smartsql.Constant('*')
+        if isinstance(self.field, string_types):
+            return table.get_field(self.field)
+        return self.field
+
+    def wrap(self, expr):
+        if self.distinct:
+            expr = smartsql.Distinct(expr)
+        return getattr(smartsql.func, self.function)(expr)
+
+    def resolve(self, table):
+        return self.wrap(self.get_field(table))
+
+
+class Count(Aggregate):
+    function = 'Count'
+
+    def __init__(self, field='*', distinct=False):
+        super(Count, self).__init__(field, distinct)
+
+
+class Sum(Aggregate):
+    function = 'Sum'
+
+
+class Avg(Aggregate):
+    function = 'Avg'
+
+
+class Min(Aggregate):
+    function = 'Min'
+
+
+class Max(Aggregate):
+    function = 'Max'
@@ -1,6 +1,8 @@
 import copy
+import collections
 from ascetic.interfaces import IBaseRelation
 from ascetic.mappers import mapper_registry
+from ascetic.query import make_in_where
 from ascetic.relations import ForeignKey, OneToMany, cascade
 from ascetic.utils import cached_property, to_tuple
 
@@ -9,6 +11,7 @@ class GenericForeignKey(IBaseRelation):
     mapper_registry = mapper_registry
     descriptor = None
     owner = None
+    chunk_size = 500  # Count of keys per query of prefetch()
 
     def __init__(self, type_field="object_type_id", related_field=None, field=None, on_delete=cascade,
                  related_name=None, related_query=None, query=None):
@@ -19,9 +22,18 @@ class GenericForeignKey(IBaseRelation):
         self._related_name = related_name
         self._related_query = related_query
         self._query = query
+        self._relations = {}
 
     def _make_relation(self, instance):
-        related_model = self.get_mapper(getattr(instance, self.type_field)).model
+        return self._get_relation(getattr(instance, self.type_field))
+
+    def _get_relation(self, type_name):
+        """Returns bound ForeignKey for the content type, it's created once per content type."""
+        try:
+            return self._relations[type_name]
+        except KeyError:
+            pass
+        related_model = self.get_mapper(type_name).model
         relation = ForeignKey(
             related_model=related_model,
             related_field=self._related_field,
@@ -33,6 +45,7 @@ class GenericForeignKey(IBaseRelation):
         )
         relation.descriptor = self.descriptor
         relation = relation.bind(self.owner)
+        self._relations[type_name] = relation
         return relation
 
     @cached_property
@@ -43,12 +56,18 @@ class GenericForeignKey(IBaseRelation):
     def type_field(self):
         return self._type_field
 
+    @property
+    def related_query(self):
+        """Related query depends on content type, see prefetch()."""
+        return None
+
     def setup_reverse_relation(self):
         pass
 
     def bind(self, owner):
         c = copy.copy(self)
         c.owner = owner
+        c._relations = {}
         return c
 
     def get(self, instance):
@@ -63,11 +82,35 @@ class GenericForeignKey(IBaseRelation):
         setattr(instance, self.type_field, None)
         self._make_relation(instance).delete(instance)
 
+    def prefetch(self, objs, query=None):
+        """Loads related objects of objs by one query per content type and fills cache of relation."""
+        objs_by_type = {}
+        for obj in objs:
+            type_name = getattr(obj, self.type_field)
+            if type_name is not None:
+                objs_by_type.setdefault(type_name, []).append(obj)
+        for type_name, type_objs in objs_by_type.items():
+            relation = self._get_relation(type_name)
+            related_query = relation.related_query if query is None else query
+            related_query = related_query.db(relation.mapper.used_db(type_objs[0]))
+            values = list({relation.get_value(obj) for obj in type_objs if all(relation.get_value(obj))})
+            related_objs = {}
+            for i in range(0, len(values), self.chunk_size):
+                where = make_in_where(relation.related_mapper.sql_table, relation.related_field,
+                                      values[i:i + self.chunk_size])
+                for related_obj in related_query.where(where):
+                    related_objs[relation.get_related_value(related_obj)] = related_obj
+            for obj in type_objs:
+                related_obj = related_objs.get(relation.get_value(obj))
+                if related_obj is not None:
+                    relation._set_cache(obj, relation.name, related_obj)
+
     def get_mapper(self, model_or_name):
         return self.mapper_registry[model_or_name]
 
 
 class GenericRelation(OneToMany):
+    chunk_size = 500  # Count of keys per query of prefetch()
 
     @cached_property
     def related_field(self):
@@ -86,3 +129,28 @@ class GenericRelation(OneToMany):
         super(GenericRelation, self).validate_cached_related_obj(obj, cached_related_obj)
         if getattr(cached_related_obj, self.related_type_field) != self.get_mapper(obj.__class__).name:
             raise ValueError
+
+    def prefetch(self, objs, query=None):
+        """Loads related objects of objs by one query per type of objs and fills cache of relation."""
+        objs_by_type = {}
+        for obj in objs:
+            objs_by_type.setdefault(self.get_mapper(obj.__class__).name, []).append(obj)
+        if query is None:
+            query = self.related_query
+        t = self.related_mapper.sql_table
+        related_relation = self.related_mapper.relations[self.related_name]
+        for type_name, type_objs in objs_by_type.items():
+            related_query = query.db(self.mapper.used_db(type_objs[0]))
+            values = list({self.get_value(obj) for obj in type_objs})
+            related_objs = collections.defaultdict(list)
+            for i in range(0, len(values), self.chunk_size):
+                where = ((t.get_field(self.related_type_field) == type_name) &
+                         make_in_where(t, self.related_field, values[i:i + self.chunk_size]))
+                for related_obj in related_query.where(where):
+                    related_objs[self.get_related_value(related_obj)].append(related_obj)
+            for obj in type_objs:
+                object_list = related_objs.get(self.get_value(obj), [])
+                self.set(obj, object_list)
+                for related_obj in object_list:
+                    relation = related_relation._make_relation(related_obj)
+                    relation._set_cache(related_obj, relation.name, obj)
@@ -1,8 +1,10 @@
 import copy
 import collections
-from ascetic.mappers import Mapper
+from sqlbuilder import smartsql
+from ascetic.mappers import Load, Mapper
+from ascetic.query import Result, default_map
 from ascetic.signals import column_mangling
-from ascetic.utils import cached_property
+from ascetic.utils import cached_property, to_tuple, SpecialAttrAccessor
 
 # We can't use TranslationRegistry, because Mapper can be inherited, and we need to fix hierarchy???
 
@@ -10,6 +12,8 @@ from ascetic.utils import cached_property
 class TranslationMapper(Mapper):
 
     translated_fields = ()
+    translations = SpecialAttrAccessor('translations', default=dict)  # {language: {name: value}}, see all_languages()
+    result_factory = staticmethod(lambda *a, **kw: TranslationResult(*a, **kw))
 
     @cached_property
     def translated_columns(self):
@@ -46,7 +50,11 @@ class TranslationMapper(Mapper):
                 self.columns[self.translate_column(field.column, lang)] = field
 
     def make_identity_key(self, model, pk):
-        return super(TranslationMapper, self).make_identity_key(model, pk) + (self.get_language(),)
+        return self.make_neutral_identity_key(model, pk) + (self.get_language(),)
+
+    def make_neutral_identity_key(self, model, pk):
+        """Identity key of object which is shared by all languages, see TranslationResult.all_languages()."""
+        return super(TranslationMapper, self).make_identity_key(model, pk)
 
     def _do_prepare_model(self, model):
 
@@ -70,3 +78,90 @@ class TranslationMapper(Mapper):
 
     def get_languages(self):
         raise NotImplementedError
+
+
+class TranslationResult(Result):
+
+    def all_languages(self, val=True):
+        """Selects values of translated fields for all languages by single query.
+
+        Each row is loaded as single object, which is shared by all languages in identity map.
+        Translated fields of the object have values of the current language,
+        values of all languages are accessible by mapper.translations(obj).
+
+        Objects loaded without all_languages() have identity keys per language,
+        so such load returns another object, even in the language of the shared object.
+        """
+        if val:
+            self._map = TranslationMap
+        elif self._map is TranslationMap:
+            self._map = default_map
+        return self._query
+
+    def execute(self, server_side=False):
+        if self._map is TranslationMap:
+            if server_side:
+                return self._db.execute(self._make_all_languages_query(), server_side=True)
+            return self._db.execute(self._make_all_languages_query())
+        return super(TranslationResult, self).execute(server_side)
+
+    def _make_all_languages_query(self):
+        mapper = self.mapper
+        names = self._loaded_fields or mapper.fields
+        language = mapper.get_language()  # Column of the current language is already selected
+        fields = [smartsql.Field(mapper.translate_column(mapper.fields[name].column, lang), mapper.sql_table)
+                  for name in mapper.translated_fields if name in names
+                  for lang in mapper.get_languages() if lang != language]
+        if not fields:
+            return self._query
+        return self._query.fields(*fields)
+
+
+class TranslationMap(object):
+    """Loads objects with values of translated fields for all languages from rows of single query."""
+
+    def __init__(self, result):
+        mapper = result.mapper
+        self._result = result
+        self._language = mapper.get_language()
+        self._translated_columns = {}  # {column: (language, name)}
+        for name in mapper.translated_fields:
+            for lang in mapper.get_languages():
+                self._translated_columns[mapper.translate_column(mapper.fields[name].column, lang)] = (lang, name)
+        self._deferred_loader = mapper.deferred_loader_factory(mapper, result.db())
+
+    def __call__(self, row):
+        data = []
+        translations = collections.defaultdict(dict)
+        for column, value in row:
+            try:
+                lang, name = self._translated_columns[column]
+            except KeyError:
+                data.append((column, value))
+            else:
+                translations[lang][name] = value
+                if lang == self._language:
+                    data.append((column, value))
+        return TranslationLoad(
+            self._result.mapper, data, self._result.db(), dict(translations), deferred_loader=self._deferred_loader
+        ).compute()
+
+
+class TranslationLoad(Load):
+
+    def __init__(self, mapper, data, db, translations, deferred_loader=None):
+        """
+        :type mapper: TranslationMapper
+        :type translations: dict
+        """
+        super(TranslationLoad, self).__init__(mapper, data, db, True, False, deferred_loader)
+        self._translations = translations
+
+    def _make_identity_key(self, data_mapped):
+        pk = tuple(data_mapped[i] for i in to_tuple(self._mapper.pk))
+        return self._mapper.make_neutral_identity_key(self._mapper.model, pk)
+
+    def _do_load(self, data):
+        obj = super(TranslationLoad, self)._do_load(data)
+        self._mapper.translations(obj, self._translations)
+        return obj
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 from collections import OrderedDict
-from ascetic import exceptions
+from sqlbuilder import smartsql
 from ascetic.mappers import Load, Mapper, OneToOne, Result
+from ascetic.query import default_map, Returning
+from ascetic.signals import pre_save, post_save
 from ascetic.utils import to_tuple
 from ascetic.utils import cached_property
+from ascetic.validators import CompositeMappingValidator, MappingValidator
 from ascetic.contrib.gfk import GenericForeignKey
 
 # TODO: Support for native support inheritance:
@@ -32,11 +35,29 @@ class PolymorphicMapper(Mapper):
     def polymorphic_bases(self):
         return tuple(self.get_mapper(base_model) for base_model in self.get_polymorphic_bases(self.model))
 
+    @cached_property
+    def polymorphic_derived(self):
+        """Mappers of polymorphic subclasses of the model, ordered from base to leaf.
+
+        The cache is reset when a new mapper is registered.
+        """
+        derived = []
+        for mapper in self.mapper_registry.values():
+            if (mapper not in derived and mapper.model is not self.model and
+                    issubclass(mapper.model, self.model) and getattr(mapper, 'polymorphic', False)):
+                derived.append(mapper)
+        derived.sort(key=lambda mapper: len(mapper.model.__mro__))
+        return tuple(derived)
+
     # TODO: Fix the diamond inheritance problem???
     # I'm not sure is it a problem... After first base save model will has PK...
-    # @cached_property
-    # def polymorphic_mro(self):
-    #     pass
+    @cached_property
+    def polymorphic_mro(self):
+        """Mappers of tables of the model, ordered from base to leaf."""
+        mro = []
+        for base in self.polymorphic_bases:
+            mro += [mapper for mapper in base.polymorphic_mro if mapper not in mro]
+        return tuple(mro) + (self,)
 
     @cached_property
     def polymorphic_fields(self):
@@ -101,47 +122,201 @@ class PolymorphicMapper(Mapper):
                 ))
         super(PolymorphicMapper, self)._do_prepare_model(self.model)
 
-    def load(self, data, db, from_db=True, reload=False):
-        return PolymorphicLoad(self, data, db, from_db, reload).compute()
+    def load(self, data, db, from_db=True, reload=False, deferred_loader=None):
+        return PolymorphicLoad(self, data, db, from_db, reload, deferred_loader).compute()
 
-    def validate(self, obj, fields=frozenset(), exclude=frozenset()):
-        errors = {}
+    def set_defaults(self, obj):
         for base in self.polymorphic_bases:
-            try:
-                base.validate(obj, fields=fields, exclude=exclude)
-            except exceptions.ValidationError as e:
-                errors.update(e.args[0])
+            base.set_defaults(obj)
+        return super(PolymorphicMapper, self).set_defaults(obj)
 
-        try:
-            super(PolymorphicMapper, self).validate(obj, fields=fields, exclude=exclude)
-        except exceptions.ValidationError as e:
-            errors.update(e.args[0])
+    def get_polymorphic_changed(self, obj):
+        """Returns names of changed fields of all polymorphic bases."""
+        changed = set()
+        for mapper in self.polymorphic_mro:
+            changed.update(mapper.get_changed(obj))
+        return frozenset(changed)
 
-        if errors:
-            raise exceptions.ValidationError(errors)
+    def validate(self, obj, fields=frozenset(), exclude=frozenset()):
+        """Validates fields of all polymorphic bases by single pass."""
+        self.set_defaults(obj)
+        fields = set(fields or self.polymorphic_fields) - set(exclude)
+        fields &= set(self.polymorphic_fields)
+        CompositeMappingValidator(
+            MappingValidator({name: self.polymorphic_fields[name].validate for name in fields}),
+            *(mapper._do_validate for mapper in self.polymorphic_mro)
+        )(
+            {name: self.polymorphic_fields[name].get_value(obj) for name in fields}
+        )
 
     def save(self, obj):
+        """Saves object into tables of all polymorphic bases, from base to leaf.
+
+        Defaults are set and object is validated once per object. Signals are sent once
+        per polymorphic base which has receivers, the senders are models of bases, from base to leaf.
+        """
+        db = self._default_db()
         if not self.polymorphic_fields['polymorphic_type_id'].get_value(obj):
             obj.polymorphic_type_id = self.get_mapper(obj.__class__).name
-        for base in self.polymorphic_bases:
-            new_record = self.is_new(obj)
-            base.save(obj)
-            for key, base_key in zip(to_tuple(self.pk), to_tuple(base.pk)):
-                self.fields[key].set_value(obj, self.polymorphic_fields[base_key].get_value(obj))
-            self.is_new(obj, new_record)
-        return super(PolymorphicMapper, self).save(obj)
+        self.set_defaults(obj)
+        changed = self.get_polymorphic_changed(obj)
+        if changed:  # Empty fields mean all fields
+            self.validate(obj, fields=changed)
+        for mapper in self.polymorphic_mro:
+            if pre_save.has_receivers(mapper.model):
+                pre_save.send(sender=mapper.model, instance=obj, db=db)
+        is_new = self.is_new(obj)
+        for base, mapper in zip((None,) + self.polymorphic_mro, self.polymorphic_mro):
+            if base is not None:
+                self._set_base_pk(obj, mapper, base)
+            if is_new:
+                mapper._insert(obj, db)  # Generated primary key is read back by RETURNING where supported
+            else:
+                mapper._update(obj, db)
+        for mapper in self.polymorphic_mro:
+            if post_save.has_receivers(mapper.model):
+                post_save.send(sender=mapper.model, instance=obj, created=is_new, db=db)
+        if is_new or not self.original_data(obj):
+            self.set_original_data(obj, self._unload_polymorphic(obj))
+        else:
+            self.original_data(obj, **{name: self.polymorphic_fields[name].get_value(obj) for name in changed})
+            self.track_changes(obj)
+        self.is_new(obj, False)
+
+    def bulk_insert(self, objs, db=None):
+        """Inserts objects by one statement per table and chunk of objects.
+
+        Objects are grouped by their models. Generated primary keys of objects without
+        primary key are read back by RETURNING, or rows of the base table are inserted
+        one by one where it isn't supported. Defaults are set and objects are validated,
+        but signals are not sent.
+        """
+        db = db or self._default_db()
+        groups = OrderedDict()
+        for obj in objs:
+            groups.setdefault(self.get_mapper(obj.__class__), []).append(obj)
+        for mapper, group in groups.items():
+            PolymorphicInsert(mapper, group, db).compute()
+
+    def _unload_polymorphic(self, obj):
+        data = {}
+        for mapper in self.polymorphic_mro:
+            data.update(mapper.unload(obj, to_db=False))
+        return data
+
+    @staticmethod
+    def _set_base_pk(obj, mapper, base):
+        for key, base_key in zip(to_tuple(mapper.pk), to_tuple(base.pk)):
+            mapper.fields[key].set_value(obj, base.fields[base_key].get_value(obj))
+
+
+class PolymorphicInsert(object):
+
+    chunk_size = 500
+
+    def __init__(self, mapper, objs, db):
+        """
+        :type mapper: PolymorphicMapper
+        :type objs: list
+        :type db: ascetic.interfaces.IDatabase
+        """
+        self._mapper = mapper
+        self._objs = objs
+        self._db = db
+
+    def compute(self):
+        mapper = self._mapper
+        for obj in self._objs:
+            if not mapper.polymorphic_fields['polymorphic_type_id'].get_value(obj):
+                obj.polymorphic_type_id = mapper.name
+            mapper.validate(obj)
+        base = None
+        for table_mapper in mapper.polymorphic_mro:
+            objs = self._objs
+            if base is None:
+                # Rows without primary key are inserted separately, to read the generated key back
+                objs = [obj for obj in objs if all(to_tuple(table_mapper.get_pk(obj)))]
+                auto_pk_objs = [obj for obj in self._objs if not all(to_tuple(table_mapper.get_pk(obj)))]
+                if self._db.supports_returning:
+                    for i in range(0, len(auto_pk_objs), self.chunk_size):
+                        self._insert(table_mapper, auto_pk_objs[i:i + self.chunk_size], auto_pk=True)
+                else:
+                    for obj in auto_pk_objs:
+                        table_mapper._insert(obj, self._db)
+            else:
+                for obj in objs:
+                    mapper._set_base_pk(obj, table_mapper, base)
+            for i in range(0, len(objs), self.chunk_size):
+                self._insert(table_mapper, objs[i:i + self.chunk_size])
+            base = table_mapper
+        for obj in self._objs:
+            mapper.is_new(obj, False)
+            mapper.set_original_data(obj, mapper._unload_polymorphic(obj))
+
+    def _insert(self, mapper, objs, auto_pk=False):
+        if not objs:
+            return
+        table = mapper.sql_table
+        pk = to_tuple(mapper.pk)
+        names = [name for name, field in mapper.fields.items()
+                 if not getattr(field, 'virtual', False) and not (auto_pk and name in pk)]
+        rows = []
+        for obj in objs:
+            data = mapper.unload(obj, fields=names, to_db=True)
+            rows.append(tuple(data[name] for name in names))
+        query = smartsql.Insert(table=table, fields=[table.get_field(name) for name in names], values=rows)
+        if auto_pk:
+            # Generated keys are returned in order of the inserted rows
+            cursor = self._db.execute(Returning(query, [table.get_field(name) for name in pk]))
+            for obj, row in zip(objs, cursor.fetchall()):
+                mapper.set_pk(obj, row)
+        else:
+            self._db.execute(query)
+        identity_map = mapper.get_identity_map(self._db)
+        for obj in objs:
+            mapper.used_db(obj, self._db)
+            identity_map.add(mapper.make_identity_key(mapper.model, mapper.get_pk(obj)), obj)
 
 
 class PolymorphicResult(Result):
 
     _polymorphic = True
 
-    def polymorphic(self, val=True):
+    def polymorphic(self, val=True, eager=False):
+        """Sets loading of concrete instances.
+
+        If eager is True, tables of derived models are LEFT JOINed to the query,
+        and concrete instances are loaded from the same rows, by single query.
+        """
         self._polymorphic = val
+        if val and eager:
+            self._map = PolymorphicMap
+        elif self._map is PolymorphicMap:
+            self._map = default_map
         return self._query
 
+    def execute(self, server_side=False):
+        if self._map is PolymorphicMap:
+            if server_side:
+                return self._db.execute(self._make_eager_query(), server_side=True)
+            return self._db.execute(self._make_eager_query())
+        return super(PolymorphicResult, self).execute(server_side)
+
+    def _make_eager_query(self):
+        q = self._query
+        for derived_mapper in self.mapper.polymorphic_derived:
+            t = derived_mapper.sql_table
+            q = q.fields(
+                *derived_mapper.get_sql_fields()
+            ).tables((
+                q.tables() + t
+            ).on(
+                t.pk == derived_mapper.polymorphic_bases[0].sql_table.pk
+            ))
+        return q
+
     def fill_cache(self):
-        if self._cache is not None or not self._polymorphic:
+        if self._cache is not None or not self._polymorphic or self._map is PolymorphicMap:
             return super(PolymorphicResult, self).fill_cache()
 
         if self._cache is None:
@@ -152,9 +327,71 @@ class PolymorphicResult(Result):
             self._polymorphic = polymorphic
         return self
 
-    def iterator(self):
-        for obj in super(PolymorphicResult, self).iterator():
-            yield obj.concrete_instance if self._polymorphic and hasattr(obj, 'concrete_instance') else obj
+    def iterator(self, chunk_size=None):
+        """Yields concrete instances, they are selected by one query per type.
+
+        If chunk_size is given, rows are fetched by chunks, and concrete instances
+        of each chunk are selected separately, to bound memory usage.
+        """
+        if not self._polymorphic or self._map is PolymorphicMap:
+            for obj in super(PolymorphicResult, self).iterator(chunk_size):
+                yield obj
+            return
+
+        if chunk_size is None:
+            objs = list(super(PolymorphicResult, self).iterator())
+            for concrete_obj in PopulatePolymorphic(objs, self.mapper.get_mapper).compute():
+                yield concrete_obj
+            return
+
+        chunk = []
+        for obj in super(PolymorphicResult, self).iterator(chunk_size):
+            chunk.append(obj)
+            if len(chunk) >= chunk_size:
+                for concrete_obj in PopulatePolymorphic(chunk, self.mapper.get_mapper).compute():
+                    yield concrete_obj
+                chunk = []
+        for concrete_obj in PopulatePolymorphic(chunk, self.mapper.get_mapper).compute():
+            yield concrete_obj
+
+
+class PolymorphicMap(object):
+    """Loads concrete instances from rows of query with LEFT JOINed tables of derived models."""
+
+    def __init__(self, result):
+        self._result = result
+        self._base_length = len(result._query.fields())
+        self._derived = []  # (mapper, start, stop) of columns of derived mapper in row
+        start = self._base_length
+        for derived_mapper in result.mapper.polymorphic_derived:
+            stop = start + len(derived_mapper.get_sql_fields())
+            self._derived.append((derived_mapper, start, stop))
+            start = stop
+        self._type_column = result.mapper.polymorphic_fields['polymorphic_type_id'].column
+        self._deferred_loaders = {}
+
+    def __call__(self, row):
+        row = tuple(row)
+        data = row[:self._base_length]
+        mapper = self._get_concrete_mapper(dict(data).get(self._type_column))
+        for derived_mapper, start, stop in self._derived:
+            if issubclass(mapper.model, derived_mapper.model):
+                data += row[start:stop]
+        return mapper.load(data, self._result.db(), from_db=True, deferred_loader=self._get_deferred_loader(mapper))
+
+    def _get_concrete_mapper(self, type_id):
+        mapper = self._result.mapper
+        concrete_mapper = mapper.get_mapper(type_id) if type_id else None
+        if concrete_mapper is None or not issubclass(concrete_mapper.model, mapper.model):
+            return mapper
+        return concrete_mapper
+
+    def _get_deferred_loader(self, mapper):
+        try:
+            return self._deferred_loaders[mapper]
+        except KeyError:
+            loader = self._deferred_loaders[mapper] = mapper.deferred_loader_factory(mapper, self._result.db())
+            return loader
 
 
 class PopulatePolymorphic(object):
@@ -173,25 +410,26 @@ class PopulatePolymorphic(object):
         typed_objects = self._get_typed_objects()
         for i, obj in enumerate(rows):
             if obj.polymorphic_type_id in typed_objects:
-                rows[i] = typed_objects[obj.polymorphic_type_id][self._get_current_mapper().get_pk(obj)]
+                rows[i] = typed_objects[obj.polymorphic_type_id].get(self._get_pk(obj), obj)
         return rows
 
     def _get_typed_objects(self):
+        pks = OrderedDict()
+        for obj in self._get_untyped_rows():
+            pks.setdefault(obj.polymorphic_type_id, []).append(self._get_pk(obj))
         typed_objects = {}
-        pks = {self._get_current_mapper().get_pk(i) for i in self._rows}
-        for ct in self._get_content_types():
+        for ct, ct_pks in pks.items():
             mapper = self._get_mapper(ct)
-            typed_objects[ct] = {mapper.get_pk(i): i for i in mapper.query.where(mapper.sql_table.pk.in_(pks))}
+            typed_objects[ct] = {mapper.get_pk(i): i for i in mapper.query.where(mapper.sql_table.pk.in_(ct_pks))}
         return typed_objects
 
-    def _get_current_mapper(self):
-        current_model = self._rows[0].__class__
-        return self._get_mapper(current_model)
+    def _get_untyped_rows(self):
+        """Rows can be already concrete instances, if they are taken from identity map."""
+        return [obj for obj in self._rows
+                if obj.polymorphic_type_id and obj.polymorphic_type_id != self._get_mapper(obj.__class__).name]
 
-    def _get_content_types(self):
-        content_types = {i.polymorphic_type_id for i in self._rows}
-        content_types -= {self._get_current_mapper().name}
-        return content_types
+    def _get_pk(self, obj):
+        return self._get_mapper(obj.__class__).get_pk(obj)
 
 
 class PolymorphicLoad(Load):
@@ -1,6 +1,7 @@
 import unittest
 from ascetic import validators
 from ascetic.databases import databases
+from ascetic.instrumentation import QueryLog
 from ascetic.contrib.gfk import GenericForeignKey, GenericRelation
 from ascetic.mappers import Mapper, mapper_registry
 
@@ -157,3 +158,72 @@ class TestGenericForeignKey(unittest.TestCase):
 
         author = author_mapper.get(author_pk)
         self.assertEqual(book_mapper.get_pk(author.books[0]), book_pk)
+
+    def test_prefetch(self):
+        db = databases['default']
+        author_mapper = mapper_registry[Author]
+        book_mapper = mapper_registry[Book]
+        authors = [Author(id=i, lang='en', first_name='First name', last_name='Last name') for i in (1, 2)]
+        for author in authors:
+            author_mapper.save(author)
+        books = [Book(id=i, lang='en', title='Book {0}'.format(i)) for i in range(1, 5)]
+        books[0].author = books[1].author = authors[0]
+        books[2].author = authors[1]
+        books[3].author = books[0]  # The other content type
+        for book in books:
+            book_mapper.save(book)
+
+        with QueryLog(db) as queries:
+            books = list(book_mapper.query.order_by(book_mapper.sql_table.id).prefetch('author'))
+            self.assertEqual(len(queries), 3)
+            self.assertEqual([author_mapper.get_pk(book.author) for book in books[:3]], [(1, 'en'), (1, 'en'), (2, 'en')])
+            self.assertEqual(book_mapper.get_pk(books[3].author), (1, 'en'))
+            self.assertIs(books[0].author, books[1].author)
+            self.assertEqual(len(queries), 3)
+
+    def test_prefetch_generic_relation(self):
+        db = databases['default']
+        author_mapper = mapper_registry[Author]
+        book_mapper = mapper_registry[Book]
+        authors = [Author(id=i, lang='en', first_name='First name', last_name='Last name') for i in (1, 2, 3)]
+        for author in authors:
+            author_mapper.save(author)
+        books = [Book(id=i, lang='en', title='Book {0}'.format(i)) for i in range(1, 5)]
+        books[0].author = books[1].author = authors[0]
+        books[2].author = authors[1]
+        books[3].author = books[0]  # The same object_id, but the other content type
+        for book in books:
+            book_mapper.save(book)
+
+        with QueryLog(db) as queries:
+            authors = list(author_mapper.query.order_by(author_mapper.sql_table.id).prefetch('books'))
+            self.assertEqual(len(queries), 2)
+            self.assertEqual([sorted(book.id for book in author.books) for author in authors], [[1, 2], [3], []])
+            self.assertIs(authors[0].books[0].author, authors[0])
+            self.assertEqual(len(queries), 2)
+
+    def test_prefetch_chunks(self):
+        count = 600  # More than chunk of prefetch()
+        self._insert_many(count)
+        book_mapper = mapper_registry[Book]
+        books = list(book_mapper.query.order_by(book_mapper.sql_table.id).prefetch('author'))
+        self.assertEqual([mapper_registry[Author].get_pk(book.author) for book in books],
+                         [(i, 'en') for i in range(1, count + 1)])
+
+    def _insert_many(self, count):
+        """Inserts count of authors with one book per author."""
+        db = databases['default']
+        db.executemany('INSERT INTO {0} (id, lang, first_name, last_name) VALUES (%s, %s, %s, %s)'.format(
+            db.qn('ascetic_gfk_author')
+        ), [(i, 'en', 'First name', 'Last name') for i in range(1, count + 1)])
+        db.executemany('INSERT INTO {0} (id, lang, title, object_type_id, object_id) VALUES (%s, %s, %s, %s, %s)'.format(
+            db.qn('ascetic_gfk_book')
+        ), [(i, 'en', 'Book', mapper_registry[Author].name, i) for i in range(1, count + 1)])
+
+    def test_prefetch_generic_relation_chunks(self):
+        count = 600  # More than chunk of prefetch()
+        self._insert_many(count)
+        author_mapper = mapper_registry[Author]
+        authors = list(author_mapper.query.order_by(author_mapper.sql_table.id).prefetch('books'))
+        self.assertEqual([[book.id for book in author.books] for author in authors],
+                         [[i] for i in range(1, count + 1)])
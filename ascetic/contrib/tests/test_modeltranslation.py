@@ -4,6 +4,7 @@ from threading import local
 from sqlbuilder import smartsql
 from ascetic.contrib import modeltranslation
 from ascetic.databases import databases
+from ascetic.instrumentation import QueryLog
 from ascetic.mappers import Mapper, mapper_registry
 
 Author = None
@@ -162,3 +163,46 @@ class TestModelTranslation(unittest.TestCase):
         author = author_mapper.get(author_mapper.get_pk(author))
         self.assertEqual(author.first_alias, u'Имя')
         self.assertEqual(author.last_name, u'Фамилия')
+
+    def test_all_languages(self):
+        db = databases['default']
+        context.current_language = 'ru'
+        author_mapper = mapper_registry[Author]
+        author = Author(first_alias=u'Имя', last_name=u'Фамилия')
+        author_mapper.save(author)
+        context.current_language = 'en'
+        author.first_alias = 'First name'
+        author.last_name = 'Last name'
+        author_mapper.save(author)
+        context.current_language = 'ru'
+
+        db.identity_map.enable()
+        try:
+            with QueryLog(db) as queries:
+                authors = list(author_mapper.query.all_languages())
+                self.assertEqual(len(queries), 1)
+                self.assertEqual(len(authors), 1)
+                self.assertEqual(authors[0].first_alias, u'Имя')
+                self.assertEqual(author_mapper.translations(authors[0]), {
+                    'ru': {'first_alias': u'Имя', 'last_name': u'Фамилия'},
+                    'en': {'first_alias': 'First name', 'last_name': 'Last name'},
+                })
+
+                # The object is shared by all languages
+                context.current_language = 'en'
+                self.assertIs(list(author_mapper.query.all_languages())[0], authors[0])
+
+            # Load per language doesn't return the shared object
+            context.current_language = 'en'
+            author = author_mapper.query.all_languages().all_languages(False)[0]
+            self.assertIsNot(author, authors[0])
+            self.assertEqual(author.first_alias, 'First name')
+            context.current_language = 'ru'
+            author = author_mapper.get(author_mapper.get_pk(authors[0]))
+            self.assertIsNot(author, authors[0])
+            self.assertEqual(author.first_alias, u'Имя')
+            self.assertIs(author_mapper.get(author_mapper.get_pk(authors[0])), author)
+            self.assertEqual(authors[0].first_alias, u'Имя')
+        finally:
+            context.current_language = 'ru'
+            db.identity_map.disable()
@@ -1,6 +1,7 @@
 import unittest
-from ascetic import validators
+from ascetic import signals, validators
 from ascetic.databases import databases
+from ascetic.instrumentation import QueryLog
 from ascetic.contrib.polymorphic import PolymorphicMapper
 from ascetic.mappers import Mapper, mapper_registry
 from ascetic.exceptions import ObjectDoesNotExist
@@ -211,7 +212,8 @@ class TestPolymorphic(unittest.TestCase):
     def setUp(self):
         db = databases['default']
         db.identity_map.disable()
-        for table in ('ascetic_polymorphic_author', 'ascetic_polymorphic_book',):
+        for table in ('ascetic_polymorphic_avia', 'ascetic_polymorphic_nonfiction',
+                      'ascetic_polymorphic_book', 'ascetic_polymorphic_author'):
             db.execute('DELETE FROM {0}'.format(db.qn(table)))
 
     def test_book(self):
@@ -348,3 +350,270 @@ class TestPolymorphic(unittest.TestCase):
 
         avia_mapper.delete(avia)
         self.assertRaises(ObjectDoesNotExist, book_mapper.get, avia_pk)
+
+    def test_eager(self):
+        db = databases['default']
+        author_mapper = mapper_registry[Author]
+        book_mapper = mapper_registry[Book]
+        author = Author(id=1, lang='en', first_name='First name', last_name='Last name')
+        author_mapper.save(author)
+        for obj in (Book(id=1, lang='en', title='Book'),
+                    Nonfiction(id=2, lang='en', title='Nonfiction', branch='instruction'),
+                    Avia(id=3, lang='en', title='Avia', branch='aviation', model='An')):
+            obj.author = author
+            mapper_registry[obj.__class__].save(obj)
+
+        with QueryLog(db) as queries:
+            objs = list(book_mapper.query.order_by(book_mapper.sql_table.pk).polymorphic(eager=True))
+            self.assertEqual(len(queries), 1)
+        self.assertEqual([obj.__class__ for obj in objs], [Book, Nonfiction, Avia])
+        self.assertEqual([obj.title for obj in objs], ['Book', 'Nonfiction', 'Avia'])
+        self.assertEqual((objs[1].branch, objs[2].branch, objs[2].model), ('instruction', 'aviation', 'An'))
+        self.assertEqual(mapper_registry[Avia].get_pk(objs[2]), (3, 'en'))
+
+        nonfiction_mapper = mapper_registry[Nonfiction]
+        objs = list(nonfiction_mapper.query.order_by(nonfiction_mapper.sql_table.pk).polymorphic(eager=True))
+        self.assertEqual([obj.__class__ for obj in objs], [Nonfiction, Avia])
+        self.assertEqual(objs[1].model, 'An')
+
+        objs = list(book_mapper.query.order_by(book_mapper.sql_table.pk).polymorphic(eager=True).polymorphic(False))
+        self.assertEqual([obj.__class__ for obj in objs], [Book, Book, Book])
+
+    def test_polymorphic_derived(self):
+        book_mapper = mapper_registry[Book]
+        derived = (mapper_registry[Nonfiction], mapper_registry[Avia])
+        self.assertEqual(book_mapper.polymorphic_derived, derived)
+        self.assertIs(book_mapper.polymorphic_derived, book_mapper.polymorphic_derived)
+
+        mapper_registry.register(mapper_registry[Avia].name, Avia, mapper_registry[Avia])
+        self.assertNotIn('polymorphic_derived', book_mapper.__dict__)
+        self.assertEqual(book_mapper.polymorphic_derived, derived)
+
+    def test_iterator(self):
+        db = databases['default']
+        author_mapper = mapper_registry[Author]
+        book_mapper = mapper_registry[Book]
+        author = Author(id=1, lang='en', first_name='First name', last_name='Last name')
+        author_mapper.save(author)
+        for obj in (Book(id=1, lang='en', title='Book'),
+                    Nonfiction(id=2, lang='en', title='Nonfiction', branch='instruction'),
+                    Avia(id=3, lang='en', title='Avia', branch='aviation', model='An'),
+                    Avia(id=4, lang='en', title='Avia 2', branch='aviation', model='Tu')):
+            obj.author = author
+            mapper_registry[obj.__class__].save(obj)
+
+        with QueryLog(db) as queries:
+            objs = list(book_mapper.query.order_by(book_mapper.sql_table.pk).iterator(chunk_size=2))
+            # One query of base rows, and one query per type of each chunk
+            self.assertEqual(len(queries), 3)
+        self.assertEqual([obj.__class__ for obj in objs], [Book, Nonfiction, Avia, Avia])
+        self.assertEqual([obj.title for obj in objs], ['Book', 'Nonfiction', 'Avia', 'Avia 2'])
+        self.assertEqual(objs[3].model, 'Tu')
+
+        with QueryLog(db) as queries:
+            objs = list(book_mapper.query.order_by(book_mapper.sql_table.pk).iterator(chunk_size=1))
+            self.assertEqual(len(queries), 4)
+
+        with QueryLog(db) as queries:
+            objs = list(book_mapper.query.order_by(book_mapper.sql_table.pk).iterator())
+            # Single pass, one query of base rows, and one query per type
+            self.assertEqual(len(queries), 3)
+        self.assertEqual([obj.__class__ for obj in objs], [Book, Nonfiction, Avia, Avia])
+
+    def test_save(self):
+        db = databases['default']
+        author_mapper = mapper_registry[Author]
+        book_mapper = mapper_registry[Book]
+        avia_mapper = mapper_registry[Avia]
+        author = Author(id=1, lang='en', first_name='First name', last_name='Last name')
+        author_mapper.save(author)
+
+        validated = []
+        book_mapper._do_validate = lambda items: validated.append(sorted(items))
+        try:
+            with QueryLog(db) as queries:
+                avia = Avia(id=5, lang='en', title='Book title', branch='instruction', model='An')
+                avia.author = author
+                avia_mapper.save(avia)
+                self.assertEqual(len(validated), 1)
+                self.assertIn('model', validated[0])
+                self.assertEqual(len(queries), 3)
+
+                del queries[:]
+                avia.model = 'Tu'
+                avia_mapper.save(avia)
+                self.assertEqual(len(queries), 1)
+        finally:
+            del book_mapper._do_validate
+
+        avia = book_mapper.get((5, 'en'))
+        self.assertIsInstance(avia, Avia)
+        self.assertEqual((avia.title, avia.branch, avia.model), ('Book title', 'instruction', 'Tu'))
+
+    def test_save_signals(self):
+        author_mapper = mapper_registry[Author]
+        author = Author(id=1, lang='en', first_name='First name', last_name='Last name')
+        author_mapper.save(author)
+        saved = []
+
+        def receiver(sender, instance, **kwargs):
+            saved.append((sender, instance))
+
+        signals.pre_save.connect(receiver, sender=Book)
+        signals.post_save.connect(receiver, sender=Avia)
+        try:
+            avia = Avia(id=5, lang='en', title='Book title', branch='instruction', model='An')
+            avia.author = author
+            mapper_registry[Avia].save(avia)
+        finally:
+            signals.pre_save.disconnect(receiver, sender=Book)
+            signals.post_save.disconnect(receiver, sender=Avia)
+        self.assertEqual(saved, [(Book, avia), (Avia, avia)])
+
+    def test_bulk_insert(self):
+        db = databases['default']
+        author_mapper = mapper_registry[Author]
+        book_mapper = mapper_registry[Book]
+        author = Author(id=1, lang='en', first_name='First name', last_name='Last name')
+        author_mapper.save(author)
+        objs = [Book(id=1, lang='en', title='Book')]
+        objs += [Avia(id=i, lang='en', title='Avia {0}'.format(i), branch='aviation', model='An') for i in range(2, 5)]
+        for obj in objs:
+            obj.author = author
+
+        with QueryLog(db) as queries:
+            book_mapper.bulk_insert(objs)
+            # One statement per table of each model
+            self.assertEqual(len(queries), 4)
+        self.assertFalse(book_mapper.is_new(objs[1]))
+        self.assertFalse(book_mapper.get_polymorphic_changed(objs[1]))
+
+        objs = list(book_mapper.query.order_by(book_mapper.sql_table.pk))
+        self.assertEqual([obj.__class__ for obj in objs], [Book, Avia, Avia, Avia])
+        self.assertEqual([obj.title for obj in objs], ['Book', 'Avia 2', 'Avia 3', 'Avia 4'])
+        self.assertEqual(objs[3].model, 'An')
+
+
+class TestPolymorphicAutoPk(unittest.TestCase):
+
+    create_sql = {
+        'postgresql': """
+            DROP TABLE IF EXISTS ascetic_polymorphic_document CASCADE;
+            CREATE TABLE ascetic_polymorphic_document (
+                id serial NOT NULL PRIMARY KEY,
+                title VARCHAR(255),
+                polymorphic_type_id VARCHAR(255)
+            );
+            DROP TABLE IF EXISTS ascetic_polymorphic_report CASCADE;
+            CREATE TABLE ascetic_polymorphic_report (
+                report_ptr_id integer NOT NULL PRIMARY KEY REFERENCES ascetic_polymorphic_document (id) ON DELETE CASCADE,
+                period VARCHAR(255)
+            );
+         """,
+        'mysql': """
+            DROP TABLE IF EXISTS ascetic_polymorphic_report CASCADE;
+            DROP TABLE IF EXISTS ascetic_polymorphic_document CASCADE;
+            CREATE TABLE ascetic_polymorphic_document (
+                id INT(11) NOT NULL auto_increment,
+                title VARCHAR(255),
+                polymorphic_type_id VARCHAR(255),
+                PRIMARY KEY (id)
+            );
+            CREATE TABLE ascetic_polymorphic_report (
+                report_ptr_id INT(11) NOT NULL,
+                period VARCHAR(255),
+                PRIMARY KEY (report_ptr_id),
+                FOREIGN KEY (report_ptr_id) REFERENCES ascetic_polymorphic_document (id)
+            );
+         """,
+        'sqlite3': """
+            DROP TABLE IF EXISTS ascetic_polymorphic_document;
+            CREATE TABLE ascetic_polymorphic_document (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title VARCHAR(255),
+                polymorphic_type_id VARCHAR(255)
+            );
+            DROP TABLE IF EXISTS ascetic_polymorphic_report;
+            CREATE TABLE ascetic_polymorphic_report (
+                report_ptr_id INTEGER PRIMARY KEY REFERENCES ascetic_polymorphic_document (id) ON DELETE CASCADE,
+                period VARCHAR(255)
+            );
+        """
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        db = databases['default']
+        db.cursor().execute(cls.create_sql[db.engine])
+
+        class Document(object):
+            def __init__(self, id=None, polymorphic_type_id=None, title=None):
+                self.id = id
+                self.polymorphic_type_id = polymorphic_type_id
+                self.title = title
+
+        class DocumentMapper(PolymorphicMapper, Mapper):
+            name = 'ascetic.contrib.tests.test_polymorphic.Document'
+            db_table = 'ascetic_polymorphic_document'
+            polymorphic = True
+
+        DocumentMapper(Document)
+
+        class Report(Document):
+            def __init__(self, report_ptr_id=None, period=None, **kwargs):
+                super(Report, self).__init__(**kwargs)
+                self.report_ptr_id = report_ptr_id
+                self.period = period
+
+        class ReportMapper(PolymorphicMapper, Mapper):
+            name = 'ascetic.contrib.tests.test_polymorphic.Report'
+            db_table = 'ascetic_polymorphic_report'
+            polymorphic = True
+
+        ReportMapper(Report)
+        cls.Document, cls.Report = Document, Report
+
+    def setUp(self):
+        db = databases['default']
+        db.identity_map.disable()
+        for table in ('ascetic_polymorphic_report', 'ascetic_polymorphic_document'):
+            db.execute('DELETE FROM {0}'.format(db.qn(table)))
+
+    def test_bulk_insert(self):
+        db = databases['default']
+        document_mapper = mapper_registry[self.Document]
+        objs = [self.Report(title='Report {0}'.format(i), period='Q{0}'.format(i)) for i in range(1, 4)]
+
+        with QueryLog(db) as queries:
+            document_mapper.bulk_insert(objs)
+            if db.supports_returning:
+                # One statement per table, keys are read back by RETURNING
+                self.assertEqual(len(queries), 2)
+            else:
+                # One statement per object of the base table
+                self.assertEqual(len(queries), 4)
+        pks = [obj.id for obj in objs]
+        self.assertEqual(pks, sorted(set(pks)))
+        self.assertEqual([obj.report_ptr_id for obj in objs], pks)
+
+        objs = list(document_mapper.query.order_by(document_mapper.sql_table.pk))
+        self.assertEqual([obj.id for obj in objs], pks)
+        self.assertEqual([obj.__class__ for obj in objs], [self.Report] * 3)
+        self.assertEqual([obj.period for obj in objs], ['Q1', 'Q2', 'Q3'])
+
+    def test_bulk_insert_without_returning(self):
+        db = databases['default']
+        document_mapper = mapper_registry[self.Document]
+        objs = [self.Report(title='Report {0}'.format(i), period='Q{0}'.format(i)) for i in range(1, 4)]
+
+        db.supports_returning = False
+        try:
+            with QueryLog(db) as queries:
+                document_mapper.bulk_insert(objs)
+                self.assertEqual(len(queries), 4)
+        finally:
+            del db.supports_returning
+        pks = [obj.id for obj in objs]
+        self.assertEqual(pks, sorted(set(pks)))
+        objs = list(document_mapper.query.order_by(document_mapper.sql_table.pk))
+        self.assertEqual([obj.period for obj in objs], ['Q1', 'Q2', 'Q3'])
@@ -1,9 +1,10 @@
 import unittest
 from ascetic.databases import databases
+from ascetic.instrumentation import QueryLog
 from ascetic.mappers import Mapper, mapper_registry
-from ascetic.contrib.tree import MpMapper, MpModel
+from ascetic.contrib.tree import ClosureTableMapper, MpMapper, MpModel, NestedSetMapper
 
-Location = None
+Location = ClosureLocation = NestedSetLocation = None
 
 
 class TestMpTree(unittest.TestCase):
@@ -102,3 +103,449 @@ class TestMpTree(unittest.TestCase):
         location_mapper.save(obj_1_1)
 
         self.assertIn(location_mapper.get_pk(obj_1_1), tuple(location_mapper.get_pk(i) for i in root.get_children()))
+        self.assertNotIn(location_mapper.get_pk(root), tuple(location_mapper.get_pk(i) for i in root.get_children()))
+
+    def test_get_ancestors(self):
+        location_mapper = mapper_registry[Location]
+        root = Location(id=1, lang='en', name='root')
+        location_mapper.save(root)
+        obj_1_1 = Location(id=2, lang='en', name='1.1')
+        obj_1_1.parent = root
+        location_mapper.save(obj_1_1)
+        obj_1_1_1 = Location(id=3, lang='en', name='1.1.1')
+        obj_1_1_1.parent = obj_1_1
+        location_mapper.save(obj_1_1_1)
+
+        self.assertEqual([i.name for i in obj_1_1_1.get_ancestors()], ['1.1'])
+        self.assertEqual([i.name for i in obj_1_1_1.get_ancestors(root=True)], ['root', '1.1'])
+        self.assertEqual([i.name for i in obj_1_1_1.get_ancestors(root=True, me=True, reverse=False)],
+                         ['1.1.1', '1.1', 'root'])
+        self.assertEqual(obj_1_1_1.get_hierarchical_name(namegetter=lambda i: i.name), '1.1, 1.1.1')
+        self.assertEqual(root.get_descendant_count(), 2)
+
+    def test_get_ancestors_many(self):
+        db = databases['default']
+        location_mapper = mapper_registry[Location]
+        root = Location(id=1, lang='en', name='root')
+        location_mapper.save(root)
+        objs = {}
+        for pk, name, parent in ((2, '1.1', root), (3, '1.2', root), (4, '1.1.1', '1.1'), (5, '1.1.2', '1.1')):
+            obj = Location(id=pk, lang='en', name=name)
+            obj.parent = objs.get(parent, root)
+            location_mapper.save(obj)
+            objs[name] = obj
+
+        with QueryLog(db) as queries:
+            result = location_mapper.get_ancestors_many([objs['1.1.1'], objs['1.1.2'], objs['1.2']], root=True)
+            self.assertEqual(len(queries), 1)
+        self.assertEqual([i.name for i in result[objs['1.1.1']]], ['root', '1.1'])
+        self.assertEqual([i.name for i in result[objs['1.1.2']]], ['root', '1.1'])
+        self.assertEqual([i.name for i in result[objs['1.2']]], ['root'])
+
+        result = location_mapper.get_ancestors_many([objs['1.1.1'], objs['1.2']], me=True, reverse=False)
+        self.assertEqual([i.name for i in result[objs['1.1.1']]], ['1.1.1', '1.1'])
+        self.assertEqual([i.name for i in result[objs['1.2']]], ['1.2'])
+        self.assertEqual(location_mapper.get_ancestors_many([]), {})
+
+    def test_load_tree(self):
+        db = databases['default']
+        location_mapper = mapper_registry[Location]
+        root = Location(id=1, lang='en', name='root')
+        location_mapper.save(root)
+        for pk, name, parent_pk in ((2, '1.1', 1), (3, '1.1.1', 2), (4, '1.1.1.1', 3), (5, '1.2', 1)):
+            obj = Location(id=pk, lang='en', name=name)
+            obj.parent = location_mapper.get((parent_pk, 'en'))
+            location_mapper.save(obj)
+
+        root = location_mapper.get((1, 'en'))
+        with QueryLog(db) as queries:
+            objs = location_mapper.load_tree(root)
+            self.assertEqual(len(queries), 1)
+            self.assertEqual([i.name for i in objs], ['1.1', '1.1.1', '1.1.1.1', '1.2'])
+            self.assertEqual([i.name for i in location_mapper.get_descendants_recursive(root)],
+                             ['1.1', '1.1.1', '1.1.1.1', '1.2'])
+            self.assertEqual([i.name for i in location_mapper.get_ancestors_chained(objs[2], me=True)],
+                             ['1.1', '1.1.1', '1.1.1.1'])
+            self.assertEqual(len(queries), 1)
+
+            objs = location_mapper.load_tree(root, depth=2)
+            self.assertEqual([i.name for i in objs], ['1.1', '1.1.1', '1.2'])
+            self.assertEqual(len(queries), 2)
+
+        self.assertEqual(objs[1].tree_path, objs[0].tree_path + '0000000003:00000000en/')
+        # Nodes below the depth are filtered by the query, not only by load_tree()
+        self.assertEqual([i.name for i in location_mapper._get_tree_query(root, depth=1)], ['1.1', '1.2'])
+        self.assertEqual([i.name for i in location_mapper._get_tree_query(root, depth=2)], ['1.1', '1.1.1', '1.2'])
+
+    def test_move(self):
+        db = databases['default']
+        location_mapper = mapper_registry[Location]
+        root_1 = Location(id=1, lang='en', name='root 1')
+        location_mapper.save(root_1)
+        root_2 = Location(id=2, lang='en', name='root 2')
+        location_mapper.save(root_2)
+        obj_1_1 = Location(id=3, lang='en', name='1.1')
+        obj_1_1.parent = root_1
+        location_mapper.save(obj_1_1)
+        obj_1_1_1 = Location(id=4, lang='en', name='1.1.1')
+        obj_1_1_1.parent = obj_1_1
+        location_mapper.save(obj_1_1_1)
+
+        db.identity_map.enable()
+        try:
+            db.identity_map.clear()
+            obj_1_1 = location_mapper.get((3, 'en'))
+            obj_1_1_1 = location_mapper.get((4, 'en'))
+            old_tree_path, old_child_tree_path = obj_1_1.tree_path, obj_1_1_1.tree_path
+            obj_1_1.parent = root_2
+            location_mapper.save(obj_1_1)
+            self.assertTrue(obj_1_1.tree_path.startswith(root_2.tree_path))
+            self.assertEqual(obj_1_1_1.tree_path, obj_1_1.tree_path + old_child_tree_path[len(old_tree_path):])
+            self.assertFalse(location_mapper.get_changed(obj_1_1_1))
+        finally:
+            db.identity_map.clear()
+            db.identity_map.disable()
+
+        self.assertEqual(location_mapper.get((4, 'en')).tree_path, obj_1_1_1.tree_path)
+        self.assertEqual(location_mapper.get((1, 'en')).tree_path, root_1.tree_path)
+
+        db.commit()
+        obj_1_1 = location_mapper.get((3, 'en'))
+        obj_1_1.parent = root_1
+        location_mapper._move_subtree = lambda *args: 1 / 0
+        try:
+            self.assertRaises(ZeroDivisionError, location_mapper.save, obj_1_1)
+        finally:
+            del location_mapper._move_subtree
+        # The parent of node and paths of its subtree are rolled back together
+        self.assertEqual(location_mapper.get((3, 'en')).parent_id, 2)
+        self.assertTrue(location_mapper.get((4, 'en')).tree_path.startswith(root_2.tree_path))
+        self.assertEqual(
+            sorted(location_mapper.get_pk(i) for i in root_2.get_descendants()),
+            [(3, 'en'), (4, 'en')]
+        )
+
+
+class TreeBackendTestMixin(object):
+    """Common tests of tree backends, self.model is the model of tree."""
+
+    tables = ()
+
+    def setUp(self):
+        db = databases['default']
+        db.identity_map.disable()
+        for table in self.tables:
+            db.execute('DELETE FROM {0}'.format(db.qn(table)))
+
+    def create_tree(self):
+        """Creates tree:
+
+        root 1
+            1.1
+                1.1.1
+                1.1.2
+            1.2
+        root 2
+        """
+        objs = {}
+        for pk, name, parent in ((1, 'root 1', None), (2, 'root 2', None), (3, '1.1', 'root 1'),
+                                 (4, '1.1.1', '1.1'), (5, '1.1.2', '1.1'), (6, '1.2', 'root 1')):
+            obj = self.model(id=pk, lang='en', name=name)
+            if parent:
+                obj.parent = objs[parent]
+            mapper_registry[self.model].save(obj)
+            objs[name] = obj
+        return objs
+
+    def reload(self, obj):
+        mapper = mapper_registry[self.model]
+        return mapper.get(mapper.get_pk(obj))
+
+    def test_get_ancestors(self):
+        objs = self.create_tree()
+        obj = self.reload(objs['1.1.1'])
+        self.assertEqual([i.name for i in obj.get_ancestors()], ['1.1'])
+        self.assertEqual([i.name for i in obj.get_ancestors(root=True)], ['root 1', '1.1'])
+        self.assertEqual([i.name for i in obj.get_ancestors(root=True, me=True, reverse=False)],
+                         ['1.1.1', '1.1', 'root 1'])
+
+    def test_get_descendants(self):
+        objs = self.create_tree()
+        obj = self.reload(objs['root 1'])
+        self.assertEqual(sorted(i.name for i in obj.get_descendants()), ['1.1', '1.1.1', '1.1.2', '1.2'])
+        self.assertEqual(sorted(i.name for i in obj.get_descendants(me=True)), ['1.1', '1.1.1', '1.1.2', '1.2', 'root 1'])
+        self.assertEqual(obj.get_descendant_count(), 4)
+        self.assertEqual(self.reload(objs['1.2']).get_descendant_count(), 0)
+        self.assertEqual(sorted(i.name for i in self.reload(objs['1.1']).get_children()), ['1.1.1', '1.1.2'])
+
+    def test_move(self):
+        mapper = mapper_registry[self.model]
+        objs = self.create_tree()
+        obj = self.reload(objs['1.1'])
+        obj.parent = self.reload(objs['root 2'])
+        mapper.save(obj)
+        self.assertEqual(sorted(i.name for i in self.reload(objs['root 1']).get_descendants()), ['1.2'])
+        self.assertEqual(sorted(i.name for i in self.reload(objs['root 2']).get_descendants()), ['1.1', '1.1.1', '1.1.2'])
+        self.assertEqual([i.name for i in self.reload(objs['1.1.2']).get_ancestors(root=True)], ['root 2', '1.1'])
+
+        obj = self.reload(objs['root 2'])
+        obj.parent = self.reload(objs['1.2'])
+        mapper.save(obj)
+        self.assertEqual([i.name for i in self.reload(objs['1.1.1']).get_ancestors(root=True)],
+                         ['root 1', '1.2', 'root 2', '1.1'])
+        self.assertEqual(self.reload(objs['root 1']).get_descendant_count(), 5)
+
+    def test_delete(self):
+        mapper = mapper_registry[self.model]
+        objs = self.create_tree()
+        mapper.delete(self.reload(objs['1.1']))
+        self.assertEqual(sorted(i.name for i in self.reload(objs['root 1']).get_descendants()), ['1.2'])
+        self.assertEqual(self.reload(objs['root 1']).get_descendant_count(), 1)
+
+    def test_query_delete(self):
+        mapper = mapper_registry[self.model]
+        objs = self.create_tree()
+        t = mapper.sql_table
+        self.assertEqual(mapper.query.where(t.name.in_(['1.1', '1.1.1', 'root 2'])).delete(), 3)
+        self.assertEqual(sorted(i.name for i in self.reload(objs['root 1']).get_descendants()), ['1.2'])
+        self.assertEqual(self.reload(objs['root 1']).get_descendant_count(), 1)
+        rows = self.dump()
+        mapper.rebuild()
+        self.assertEqual(self.dump(), rows)  # State of tree is consistent
+
+    def test_save_atomic(self):
+        db = databases['default']
+        mapper = mapper_registry[self.model]
+        objs = self.create_tree()
+        db.commit()
+        rows = self.dump()
+        obj = self.model(id=2, lang='en', name='duplicate')  # Primary key of "root 2"
+        obj.parent = self.reload(objs['1.1'])
+        self.assertRaises(Exception, mapper.save, obj)
+        self.assertEqual(self.dump(), rows)  # Changes of tree structure are rolled back
+
+    def dump(self):
+        db = databases['default']
+        return [sorted(db.execute('SELECT * FROM {0}'.format(db.qn(table))).fetchall()) for table in self.tables]
+
+    def test_load_tree(self):
+        db = databases['default']
+        objs = self.create_tree()
+        root = self.reload(objs['root 1'])
+        with QueryLog(db) as queries:
+            mapper = mapper_registry[self.model]
+            self.assertEqual(sorted(i.name for i in mapper.load_tree(root)), ['1.1', '1.1.1', '1.1.2', '1.2'])
+            self.assertEqual(len(queries), 1)
+            children = list(root.children)
+            self.assertEqual(sorted(i.name for i in children), ['1.1', '1.2'])
+            grandchild = [i for i in children if i.name == '1.1'][0].children[0]
+            self.assertEqual([i.name for i in mapper.get_ancestors_chained(grandchild, root=True)], ['root 1', '1.1'])
+            self.assertEqual(len(queries), 1)
+
+            self.assertEqual(sorted(i.name for i in mapper.load_tree(root, depth=1)), ['1.1', '1.2'])
+            self.assertEqual(len(queries), 2)
+
+    def test_rebuild(self):
+        mapper = mapper_registry[self.model]
+        objs = self.create_tree()
+        self.corrupt()
+        mapper.rebuild()
+        self.assertEqual([i.name for i in self.reload(objs['1.1.2']).get_ancestors(root=True)], ['root 1', '1.1'])
+        self.assertEqual(sorted(i.name for i in self.reload(objs['1.1']).get_descendants()), ['1.1.1', '1.1.2'])
+        self.assertEqual(self.reload(objs['root 1']).get_descendant_count(), 4)
+
+
+class TestClosureTree(TreeBackendTestMixin, unittest.TestCase):
+
+    tables = ('ascetic_tree_closure_location_closure', 'ascetic_tree_closure_location')
+
+    create_sql = {
+        'postgresql': """
+            DROP TABLE IF EXISTS ascetic_tree_closure_location_closure CASCADE;
+            DROP TABLE IF EXISTS ascetic_tree_closure_location CASCADE;
+            CREATE TABLE ascetic_tree_closure_location (
+                id INTEGER NOT NULL,
+                lang VARCHAR(6) NOT NULL,
+                name VARCHAR(40),
+                parent_id integer,
+                parent_lang VARCHAR(6),
+                PRIMARY KEY (id, lang),
+                FOREIGN KEY (parent_id, parent_lang) REFERENCES ascetic_tree_closure_location (id, lang) ON DELETE CASCADE
+            );
+            CREATE TABLE ascetic_tree_closure_location_closure (
+                ancestor_id INTEGER NOT NULL,
+                ancestor_lang VARCHAR(6) NOT NULL,
+                descendant_id INTEGER NOT NULL,
+                descendant_lang VARCHAR(6) NOT NULL,
+                depth INTEGER NOT NULL,
+                PRIMARY KEY (ancestor_id, ancestor_lang, descendant_id, descendant_lang)
+            );
+         """,
+        'mysql': """
+            DROP TABLE IF EXISTS ascetic_tree_closure_location_closure CASCADE;
+            DROP TABLE IF EXISTS ascetic_tree_closure_location CASCADE;
+            CREATE TABLE ascetic_tree_closure_location (
+                id INTEGER NOT NULL,
+                lang VARCHAR(6) NOT NULL,
+                name VARCHAR(40),
+                parent_id integer,
+                parent_lang VARCHAR(6),
+                PRIMARY KEY (id, lang),
+                FOREIGN KEY (parent_id, parent_lang) REFERENCES ascetic_tree_closure_location (id, lang) ON DELETE CASCADE
+            );
+            CREATE TABLE ascetic_tree_closure_location_closure (
+                ancestor_id INTEGER NOT NULL,
+                ancestor_lang VARCHAR(6) NOT NULL,
+                descendant_id INTEGER NOT NULL,
+                descendant_lang VARCHAR(6) NOT NULL,
+                depth INTEGER NOT NULL,
+                PRIMARY KEY (ancestor_id, ancestor_lang, descendant_id, descendant_lang)
+            );
+         """,
+        'sqlite3': """
+            DROP TABLE IF EXISTS ascetic_tree_closure_location_closure CASCADE;
+            DROP TABLE IF EXISTS ascetic_tree_closure_location CASCADE;
+            CREATE TABLE ascetic_tree_closure_location (
+                id INTEGER NOT NULL,
+                lang VARCHAR(6) NOT NULL,
+                name VARCHAR(40),
+                parent_id integer,
+                parent_lang VARCHAR(6),
+                PRIMARY KEY (id, lang),
+                FOREIGN KEY (parent_id, parent_lang) REFERENCES ascetic_tree_closure_location (id, lang) ON DELETE CASCADE
+            );
+            CREATE TABLE ascetic_tree_closure_location_closure (
+                ancestor_id INTEGER NOT NULL,
+                ancestor_lang VARCHAR(6) NOT NULL,
+                descendant_id INTEGER NOT NULL,
+                descendant_lang VARCHAR(6) NOT NULL,
+                depth INTEGER NOT NULL,
+                PRIMARY KEY (ancestor_id, ancestor_lang, descendant_id, descendant_lang)
+            );
+        """
+    }
+
+    @classmethod
+    def create_models(cls):
+
+        class ClosureLocation(MpModel):
+            def __init__(self, id=None, lang=None, name=None, parent_id=None, parent_lang=None):
+                self.id = id
+                self.lang = lang
+                self.name = name
+                self.parent_id = parent_id
+                self.parent_lang = parent_lang
+
+        class ClosureLocationMapper(ClosureTableMapper, Mapper):
+            db_table = 'ascetic_tree_closure_location'
+
+        ClosureLocationMapper(ClosureLocation)
+
+        return locals()
+
+    @classmethod
+    def setUpClass(cls):
+        db = databases['default']
+        db.cursor().execute(cls.create_sql[db.engine])
+        for model_name, model in cls.create_models().items():
+            globals()[model_name] = model
+
+    @property
+    def model(self):
+        return ClosureLocation
+
+    def corrupt(self):
+        db = databases['default']
+        db.execute('DELETE FROM {0}'.format(db.qn('ascetic_tree_closure_location_closure')))
+
+
+class TestNestedSetTree(TreeBackendTestMixin, unittest.TestCase):
+
+    tables = ('ascetic_tree_nested_set_location',)
+
+    create_sql = {
+        'postgresql': """
+            DROP TABLE IF EXISTS ascetic_tree_nested_set_location CASCADE;
+            CREATE TABLE ascetic_tree_nested_set_location (
+                id INTEGER NOT NULL,
+                lang VARCHAR(6) NOT NULL,
+                name VARCHAR(40),
+                parent_id integer,
+                parent_lang VARCHAR(6),
+                lft INTEGER,
+                rgt INTEGER,
+                PRIMARY KEY (id, lang),
+                FOREIGN KEY (parent_id, parent_lang) REFERENCES ascetic_tree_nested_set_location (id, lang) ON DELETE CASCADE
+            );
+         """,
+        'mysql': """
+            DROP TABLE IF EXISTS ascetic_tree_nested_set_location CASCADE;
+            CREATE TABLE ascetic_tree_nested_set_location (
+                id INTEGER NOT NULL,
+                lang VARCHAR(6) NOT NULL,
+                name VARCHAR(40),
+                parent_id integer,
+                parent_lang VARCHAR(6),
+                lft INTEGER,
+                rgt INTEGER,
+                PRIMARY KEY (id, lang),
+                FOREIGN KEY (parent_id, parent_lang) REFERENCES ascetic_tree_nested_set_location (id, lang) ON DELETE CASCADE
+            );
+         """,
+        'sqlite3': """
+            DROP TABLE IF EXISTS ascetic_tree_nested_set_location CASCADE;
+            CREATE TABLE ascetic_tree_nested_set_location (
+                id INTEGER NOT NULL,
+                lang VARCHAR(6) NOT NULL,
+                name VARCHAR(40),
+                parent_id integer,
+                parent_lang VARCHAR(6),
+                lft INTEGER,
+                rgt INTEGER,
+                PRIMARY KEY (id, lang),
+                FOREIGN KEY (parent_id, parent_lang) REFERENCES ascetic_tree_nested_set_location (id, lang) ON DELETE CASCADE
+            );
+        """
+    }
+
+    @classmethod
+    def create_models(cls):
+
+        class NestedSetLocation(MpModel):
+            def __init__(self, id=None, lang=None, name=None, parent_id=None, parent_lang=None, lft=None, rgt=None):
+                self.id = id
+                self.lang = lang
+                self.name = name
+                self.parent_id = parent_id
+                self.parent_lang = parent_lang
+                self.lft = lft
+                self.rgt = rgt
+
+        class NestedSetLocationMapper(NestedSetMapper, Mapper):
+            db_table = 'ascetic_tree_nested_set_location'
+
+        NestedSetLocationMapper(NestedSetLocation)
+
+        return locals()
+
+    @classmethod
+    def setUpClass(cls):
+        db = databases['default']
+        db.cursor().execute(cls.create_sql[db.engine])
+        for model_name, model in cls.create_models().items():
+            globals()[model_name] = model
+
+    @property
+    def model(self):
+        return NestedSetLocation
+
+    def corrupt(self):
+        db = databases['default']
+        db.execute('UPDATE {0} SET lft = NULL, rgt = NULL'.format(db.qn('ascetic_tree_nested_set_location')))
+
+    def test_move_into_own_subtree(self):
+        mapper = mapper_registry[NestedSetLocation]
+        objs = self.create_tree()
+        obj = self.reload(objs['1.1'])
+        obj.parent = self.reload(objs['1.1.1'])
+        self.assertRaises(ValueError, mapper.save, obj)
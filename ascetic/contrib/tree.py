@@ -1,6 +1,11 @@
 from __future__ import absolute_import
+import collections
+import operator
+from functools import reduce
 from sqlbuilder import smartsql
+from ascetic.instrumentation import LazyLoadDetector
 from ascetic.mappers import mapper_registry, Mapper
+from ascetic.query import RelationPresetter
 from ascetic.relations import ForeignKey, RelationDescriptor
 from ascetic.utils import cached_property, classproperty, to_tuple
 
@@ -13,7 +18,114 @@ except NameError:
     integer_types = (int,)
 
 
-class MpMapper(Mapper):
+class TreeMapper(Mapper):
+    """Base class of tree mappers.
+
+    The tree is defined by "parent" relation (fields "parent_<pk>" are required),
+    the subclass defines the way to select ancestors and descendants.
+    """
+
+    def _do_prepare_model(self, model):
+        setattr(model, 'parent', RelationDescriptor(ForeignKey(
+            'self',
+            field=tuple('parent_{}'.format(k) for k in to_tuple(self.pk)),
+            related_name="children"
+        )))
+        super(TreeMapper, self)._do_prepare_model(self.model)
+
+    @cached_property
+    def mp_root(self):
+        return self.get_mapper(self.relations['parent'].model)
+
+    def _get_parent_key(self, obj):
+        return self.mp_root.relations['parent'].get_value(obj)
+
+    def _is_moved(self, obj):
+        original_data = self.original_data(obj)
+        rel = self.mp_root.relations['parent']
+        return tuple(original_data.get(name) for name in rel.field) != rel.get_value(obj)
+
+    def _get_loaded_objects(self, db):
+        for obj in list(self.get_identity_map(db).alive.values()):
+            if isinstance(obj, self.mp_root.model):
+                yield obj
+
+    def get_ancestors_chained(self, obj, root=False, me=False, reverse=True):
+        objs = []
+        current = obj
+        while (current if root else current.parent_id):
+            if current != obj or me:
+                objs.append(current)
+            current = current.parent
+        if reverse:
+            objs.reverse()
+        return objs
+
+    def get_ancestors(self, obj, root=False, me=False, reverse=True):
+        raise NotImplementedError
+
+    def get_hierarchical_name(self, obj, sep=', ', root=False, me=True, reverse=True, namegetter=str):
+        """returns children QuerySet instance for given parent_id"""
+        return sep.join(map(namegetter, self.get_ancestors(obj, root=root, me=me, reverse=reverse)))
+
+    def get_children(self, obj):
+        """Fix for MTI"""
+        rel = self.mp_root.relations['parent']
+        return self.query.where(self.mp_root.sql_table.get_field(rel.field) == rel.get_related_value(obj))
+
+    def _descendants(self, obj):
+        r = []
+        for i in obj.children:
+            r.append(i)
+            r += self._descendants(i)
+        return r
+
+    def get_descendants_recursive(self, obj, me=False):
+        r = []
+        if me:
+            r.append(obj)
+        r += self._descendants(obj)
+        return r
+
+    def get_descendants(self, obj, me=False):
+        raise NotImplementedError
+
+    def get_descendant_count(self, obj):
+        return self.get_descendants(obj).count()
+
+    def _get_tree_query(self, root, depth=None):
+        """Returns query of descendants of root, parents should precede their children."""
+        return self.get_descendants(root)
+
+    def load_tree(self, root, depth=None):
+        """Loads subtree of root by single query and presets relations "parent" and "children" of its nodes.
+
+        So, walking the tree (obj.children, obj.parent, get_ancestors_chained()) needs no queries.
+        Children of the nodes of the last level are not preset if depth is given.
+        Returns list of loaded descendants.
+        """
+        rel = self.mp_root.relations['parent']
+        preset_parent = RelationPresetter(rel)
+        nodes = {rel.get_related_value(root): 0}  # Depth of node relative to root
+        objs = []
+        with LazyLoadDetector.suspend():
+            root.children = []
+            for obj in self._get_tree_query(root, depth):
+                parent_key = rel.get_value(obj)
+                if parent_key not in nodes or (depth is not None and nodes[parent_key] >= depth):
+                    continue
+                nodes[rel.get_related_value(obj)] = nodes[parent_key] + 1
+                if depth is None or nodes[parent_key] + 1 < depth:
+                    obj.children = []
+                objs.append(obj)
+            parents = {rel.get_related_value(root): root}
+            parents.update((rel.get_related_value(obj), obj) for obj in objs)
+            for obj in objs:
+                preset_parent(obj, parents[rel.get_value(obj)])
+        return objs
+
+
+class MpMapper(TreeMapper):
     """The simplest Materialized Path realization.
 
     Strong KISS principle.
@@ -25,13 +137,7 @@ class MpMapper(Mapper):
     KEY_SEPARATOR = ':'
     PATH_DIGITS = 10
 
-    def _do_prepare_model(self, model):
-        setattr(model, 'parent', RelationDescriptor(ForeignKey(
-            'self',
-            field=tuple('parent_{}'.format(k) for k in to_tuple(self.pk)),
-            related_name="children"
-        )))
-        super(MpMapper, self)._do_prepare_model(self.model)
+    chunk_size = 500  # Count of paths per query of get_ancestors_many()
 
     def _mp_encode(self, value):
         return str(value).replace('&', '&a').replace(self.KEY_SEPARATOR, '&k').replace(self.PATH_SEPARATOR, '&p')
@@ -41,118 +147,430 @@ class MpMapper(Mapper):
 
     def _make_tree_path(self, obj):
         tree_path = self.KEY_SEPARATOR.join(self._mp_encode(i).zfill(self.PATH_DIGITS) for i in to_tuple(self.get_pk(obj)))
-        if obj.parent:
-            tree_path = self.PATH_SEPARATOR.join((obj.parent.tree_path, tree_path))
         tree_path += self.PATH_SEPARATOR
+        if obj.parent:
+            tree_path = obj.parent.tree_path + tree_path  # Path of parent already ends with separator
         return tree_path
 
-    @cached_property
-    def mp_root(self):
-        return self.get_mapper(self.relations['parent'].model)
-
     def save(self, obj):
-        """Sets content_type and calls parent method."""
+        """Saves object and updates tree_path of object and its descendants."""
         try:
             old_tree_path = self.original_data(obj)['tree_path']
         except (AttributeError, KeyError):
             old_tree_path = None
 
-        super(MpMapper, self).save(obj)
-
-        tree_path = self._make_tree_path(obj)
-
-        if old_tree_path != tree_path:
-            obj.tree_path = tree_path
-            self.original_data(obj, tree_path=tree_path)
-            self.mp_root.base_query.where(
-                self.mp_root.sql_table.pk == self.get_pk(obj)
-            ).update({
-                'tree_path': tree_path
-            })
-
-            if old_tree_path is not None:
-                for obj in self.mp_root.base_query.where(
-                    self.mp_root.sql_table.tree_path.startswith(old_tree_path) &
-                    self.mp_root.sql_table.pk != self.get_pk(obj)
-                ).iterator():
-                    self.mp_root.base_query.where(
-                        self.mp_root.sql_table.pk == self.get_pk(obj)
-                    ).update({
-                        'tree_path': tree_path + obj.tree_path[len(old_tree_path):]
-                    })
-        return self
+        db = self._default_db()
+        with db.transaction:
+            super(MpMapper, self).save(obj)
 
-    def get_ancestors_chained(self, obj, root=False, me=False, reverse=True):
-        objs = []
-        current = obj
-        while (current if root else current.parent_id):
-            if current != obj or me:
-                objs.append(current)
-            current = current.parent
-        if reverse:
-            objs.reverse()
-        return objs
+            tree_path = self._make_tree_path(obj)
 
-    def get_ancestors(self, obj, root=False, me=False, reverse=True):
-        q = self.query
+            if old_tree_path != tree_path:
+                t = self.mp_root.sql_table
+                if old_tree_path is None:
+                    db.execute(smartsql.Update(table=t, mapping={t.tree_path: tree_path}, where=(t.pk == self.get_pk(obj))))
+                else:
+                    self._move_subtree(db, old_tree_path, tree_path)
+                obj.tree_path = tree_path
+                self.original_data(obj, tree_path=tree_path)
+        return self
+
+    def _move_subtree(self, db, old_tree_path, tree_path):
+        """Replaces prefix of tree_path of node and all its descendants by single statement."""
         t = self.mp_root.sql_table
-        steps = obj.tree_path.split(self.PATH_SEPARATOR)
+        db.execute(smartsql.Update(
+            table=t,
+            mapping={t.tree_path: smartsql.Concat(tree_path, smartsql.func.Substr(t.tree_path, len(old_tree_path) + 1))},
+            where=t.tree_path.startswith(old_tree_path)
+        ))
+        # Patch loaded descendants instead of reloading of them.
+        tree_path_field = self.mp_root.fields['tree_path']
+        for obj in self._get_loaded_objects(db):
+            obj_tree_path = tree_path_field.get_value(obj)
+            if obj_tree_path and obj_tree_path.startswith(old_tree_path):
+                obj_tree_path = tree_path + obj_tree_path[len(old_tree_path):]
+                tree_path_field.set_value(obj, obj_tree_path)
+                self.mp_root.original_data(obj, tree_path=obj_tree_path)
+
+    def _get_ancestor_paths(self, obj):
+        """Returns paths of object and its ancestors, from object to root."""
+        steps = obj.tree_path.split(self.PATH_SEPARATOR)[:-1]
         paths = []
         while steps:
-            paths.append(self.PATH_SEPARATOR.join(steps) + self.PATH_SEPARATOR)
-            paths.pop()
-        q = q.where(t.tree_path.in_(paths))
+            if steps[-1]:
+                paths.append(self.PATH_SEPARATOR.join(steps) + self.PATH_SEPARATOR)
+            steps.pop()
+        return paths
 
-        if not root:
-            q = q.where(t.parent.is_not(None))
+    def get_ancestors(self, obj, root=False, me=False, reverse=True):
+        t = self.mp_root.sql_table
+        paths = self._get_ancestor_paths(obj)
         if not me:
-            q = q.where(t.pk != self.get_pk(obj))
-
+            paths = paths[1:]
+        if not root:
+            paths = paths[:-1]
+        if not paths:  # "IN ()" is not valid SQL for most of databases
+            paths = [None]
+        q = self.query.where(t.tree_path.in_(paths))
         if reverse:
             q = q.order_by((t.tree_path,))
         else:
             q = q.order_by((t.tree_path.desc(),))
         return q
 
+    def get_ancestors_many(self, objs, root=False, me=False, reverse=True):
+        """Returns dict {obj: list of ancestors} by one query per chunk of ancestor paths.
+
+        The common ancestors are selected once and shared by objects.
+        """
+        t = self.mp_root.sql_table
+        objs_paths = []
+        all_paths = set()
+        for obj in objs:
+            paths = self._get_ancestor_paths(obj)
+            if not me:
+                paths = paths[1:]
+            if not root:
+                paths = paths[:-1]
+            if reverse:
+                paths.reverse()
+            objs_paths.append((obj, paths))
+            all_paths.update(paths)
+
+        all_paths = sorted(all_paths)
+        ancestors = {}
+        for i in range(0, len(all_paths), self.chunk_size):
+            for ancestor in self.query.where(t.tree_path.in_(all_paths[i:i + self.chunk_size])):
+                ancestors[ancestor.tree_path] = ancestor
+        return {obj: [ancestors[path] for path in paths if path in ancestors] for obj, paths in objs_paths}
+
     def _make_ancestors_cond(self, obj):
-        steps = obj.tree_path.split(self.PATH_SEPARATOR)
-        paths = []
-        while steps:
-            paths.append(self.PATH_SEPARATOR.join(steps) + self.PATH_SEPARATOR)
-            paths.pop()
-        return self.mp_root.sql_table.tree_path.in_(paths)
+        return self.mp_root.sql_table.tree_path.in_(self._get_ancestor_paths(obj))
 
     def _make_ancestors_cond2(self, obj):
         return smartsql.P(obj.tree_path).startswith(self.mp_root.sql_table.tree_path)
 
-    def get_hierarchical_name(self, obj, sep=', ', root=False, me=True, reverse=True, namegetter=str):
-        """returns children QuerySet instance for given parent_id"""
-        return sep.join(map(namegetter, self.get_ancestors(obj, root=root, me=me, reverse=reverse)))
+    def get_descendants(self, obj, me=False):
+        t = self.mp_root.sql_table
+        q = self.query.where(t.tree_path.startswith(obj.tree_path))
+        if not me:
+            q = q.where(~(t.pk == self.get_pk(obj)))  # "!=" of composite key means "!=" of each column
+        return q
 
-    def get_children(self, obj):
-        """Fix for MTI"""
-        return self.query.where(self.mp_root.sql_table.parent == self.get_pk(obj))
+    def _get_tree_query(self, root, depth=None):
+        t = self.mp_root.sql_table
+        q = self.get_descendants(root).order_by(t.tree_path)
+        if depth is not None:
+            # Each level appends "<key><separator>" to the path of parent,
+            # so paths of nodes below the given depth contain more separators.
+            pattern = smartsql.EscapeForLike(root.tree_path)
+            q = q.where(~smartsql.Like(
+                t.tree_path,
+                smartsql.Concat(pattern, smartsql.Value(('%' + self.PATH_SEPARATOR) * (depth + 1) + '%')),
+                escape=pattern.escape
+            ))
+        return q
 
-    def _descendants(self, obj):
-        r = list(self.get_children(obj))
-        for i in r:
-            r += i._descendants(obj)
-        return r
 
-    def get_descendants_recursive(self, obj, me=False):
-        r = []
-        if me:
-            r.append(obj)
-        r += self._descendants(obj)
-        return r
+class ClosureTableMapper(TreeMapper):
+    """Closure Table realization.
+
+    All paths of the tree are stored in the separate table "<db_table>_closure"
+    (see closure_db_table) with columns "ancestor_<pk column>", "descendant_<pk column>"
+    and "depth". Path of each node to itself (with depth 0) is also stored.
+    """
+
+    closure_db_table = None
+
+    @cached_property
+    def closure_table(self):
+        return smartsql.Table(self.mp_root.closure_db_table or '{0}_closure'.format(self.mp_root.db_table))
+
+    def _get_closure_columns(self, side):
+        return tuple('{0}_{1}'.format(side, self.mp_root.fields[name].column) for name in to_tuple(self.mp_root.pk))
+
+    def _get_closure_field(self, side, table=None):
+        table = table or self.closure_table
+        return smartsql.CompositeExpr(*(smartsql.Field(column, table) for column in self._get_closure_columns(side)))
+
+    def _get_closure_fields(self, table=None):
+        table = table or self.closure_table
+        return (list(self._get_closure_field('ancestor', table)) +
+                list(self._get_closure_field('descendant', table)) +
+                [table.depth])
+
+    def _in_subtree(self, side, key):
+        """Returns condition "column IN subtree of key".
+
+        The subquery is wrapped by derived table, since MySQL can't select from the table under modification.
+        """
+        subtree = smartsql.Query(self.closure_table).fields(
+            list(self._get_closure_field('descendant'))
+        ).where(
+            self._get_closure_field('ancestor') == key
+        ).as_table('subtree')
+        subquery = smartsql.Query(subtree).fields([
+            smartsql.Field(column, subtree) for column in self._get_closure_columns('descendant')
+        ])
+        return smartsql.Binary(smartsql.Parentheses(self._get_closure_field(side)), 'IN', subquery)
+
+    def save(self, obj):
+        """Saves object and maintains paths of its subtree."""
+        db = self._default_db()
+        with db.transaction:
+            is_new = self.is_new(obj)
+            is_moved = not is_new and self._is_moved(obj)
+            super(ClosureTableMapper, self).save(obj)
+            key = to_tuple(self.get_pk(obj))
+            parent_key = self._get_parent_key(obj)
+            has_parent = all(i is not None for i in parent_key)
+            ct = self.closure_table
+            fields = self._get_closure_fields()
+            if is_new:
+                db.execute(smartsql.Insert(ct, fields=fields, values=(key + key + (0,),)))
+                if has_parent:
+                    db.execute(smartsql.Insert(ct, fields=fields, values=smartsql.Query(ct).fields(
+                        list(self._get_closure_field('ancestor')) + [smartsql.Param(i) for i in key] + [ct.depth + 1]
+                    ).where(
+                        self._get_closure_field('descendant') == parent_key
+                    )))
+            elif is_moved:
+                # Paths from former ancestors to the subtree
+                db.execute(smartsql.Delete(table=ct, where=(
+                    self._in_subtree('descendant', key) & ~self._in_subtree('ancestor', key)
+                )))
+                if has_parent:
+                    # Paths from each new ancestor to each node of the subtree
+                    ancestor, descendant = ct.as_('ancestor_paths'), ct.as_('descendant_paths')
+                    db.execute(smartsql.Insert(ct, fields=fields, values=smartsql.Query(
+                        (ancestor & descendant).on(self._get_closure_field('ancestor', descendant) == key)
+                    ).fields(
+                        list(self._get_closure_field('ancestor', ancestor)) +
+                        list(self._get_closure_field('descendant', descendant)) +
+                        [ancestor.depth + descendant.depth + 1]
+                    ).where(
+                        self._get_closure_field('descendant', ancestor) == parent_key
+                    )))
+        return self
+
+    def delete(self, obj, db=None, visited=None):
+        db = db or self._default_db()
+        with db.transaction:
+            db.execute(smartsql.Delete(table=self.closure_table, where=self._in_subtree(
+                'descendant', to_tuple(self.get_pk(obj))
+            )))
+            result = super(ClosureTableMapper, self).delete(obj, db, visited)
+        return result
+
+    def rebuild(self, db=None):
+        """Rebuilds closure table by "parent" relation, by one statement per level of the tree."""
+        db = db or self._default_db()
+        t, ct = self.mp_root.sql_table, self.closure_table
+        pk = list(t.get_field(to_tuple(self.mp_root.pk)))
+        db.execute(smartsql.Delete(table=ct))
+        db.execute(smartsql.Insert(ct, fields=self._get_closure_fields(), values=smartsql.Query(t).fields(
+            pk + pk + [smartsql.Param(0)]
+        )))
+        depth = 0
+        while db.execute(smartsql.Insert(ct, fields=self._get_closure_fields(), values=smartsql.Query(
+            (ct & t).on(t.get_field(self.mp_root.relations['parent'].field) == self._get_closure_field('descendant'))
+        ).fields(
+            list(self._get_closure_field('ancestor')) + pk + [ct.depth + 1]
+        ).where(
+            ct.depth == depth
+        ))).rowcount:
+            depth += 1
+
+    def get_ancestors(self, obj, root=False, me=False, reverse=True):
+        t, ct = self.mp_root.sql_table, self.closure_table
+        q = self.query
+        q = q.tables(
+            (q.tables() & ct).on(self._get_closure_field('ancestor') == t.pk)
+        ).where(
+            self._get_closure_field('descendant') == to_tuple(self.get_pk(obj))
+        )
+        if not me:
+            q = q.where(ct.depth > 0)
+        if not root:
+            q = q.where(t.get_field(self.mp_root.relations['parent'].field[0]) != None)  # noqa
+        if reverse:
+            q = q.order_by(ct.depth.desc())
+        else:
+            q = q.order_by(ct.depth)
+        return q
 
     def get_descendants(self, obj, me=False):
-        t = self.mp_root.sql_table
-        q = self.query.where(t.tree_path.startswith(obj.tree_path))
+        t, ct = self.mp_root.sql_table, self.closure_table
+        q = self.query
+        q = q.tables(
+            (q.tables() & ct).on(self._get_closure_field('descendant') == t.pk)
+        ).where(
+            self._get_closure_field('ancestor') == to_tuple(self.get_pk(obj))
+        )
         if not me:
-            q = q.where(t.pk != self.get_pk(obj))
+            q = q.where(ct.depth > 0)
+        return q.order_by(ct.depth, t.pk)
+
+    def _get_tree_query(self, root, depth=None):
+        q = self.get_descendants(root)
+        if depth is not None:
+            q = q.where(self.closure_table.depth <= depth)
+        return q
+
+    def get_descendant_count(self, obj):
+        ct = self.closure_table
+        return self._default_db().execute(smartsql.Query(ct).fields(smartsql.func.Count(smartsql.Constant('*'))).where(
+            (self._get_closure_field('ancestor') == to_tuple(self.get_pk(obj))) & (ct.depth > 0)
+        )).fetchone()[0]
+
+
+class NestedSetMapper(TreeMapper):
+    """Nested Sets realization.
+
+    You should to create integer fields with names "lft" and "rgt".
+    New node is appended as the last child of its parent (or as the last root),
+    moved node becomes the last child of its new parent.
+    """
+
+    def _get_bounds(self, db, key):
+        """Reads bounds of node from DB, since values of loaded objects can be out of date."""
+        t = self.mp_root.sql_table
+        return tuple(db.execute(smartsql.Query(t).fields(t.lft, t.rgt).where(
+            t.get_field(to_tuple(self.mp_root.pk)) == key
+        )).fetchone())
+
+    def _get_position(self, db, obj):
+        """Returns the value of lft for the last child of the new parent of object."""
+        parent_key = self._get_parent_key(obj)
+        if all(i is not None for i in parent_key):
+            return self._get_bounds(db, parent_key)[1]
+        t = self.mp_root.sql_table
+        return (db.execute(smartsql.Query(t).fields(smartsql.func.Max(t.rgt))).fetchone()[0] or 0) + 1
+
+    def _shift(self, db, shifts):
+        """Shifts bounds which are in the given ranges by single statement.
+
+        :param shifts: list of (first, last, delta), the last is None for unbounded range.
+        """
+        t = self.mp_root.sql_table
+
+        def make_cond(field, first, last):
+            return field >= first if last is None else field.between(first, last)
+
+        cond = reduce(operator.or_, (make_cond(t.lft, first, last) | make_cond(t.rgt, first, last)
+                                     for first, last, delta in shifts))
+        db.execute(smartsql.Update(table=t, mapping=collections.OrderedDict((
+            (field, smartsql.Case([(make_cond(field, first, last), field + delta) for first, last, delta in shifts],
+                                  default=field))
+            for field in (t.lft, t.rgt)
+        )), where=cond))
+
+        def shift(value):
+            for first, last, delta in shifts:
+                if first <= value and (last is None or value <= last):
+                    return value + delta
+            return value
+
+        # Patch loaded objects instead of reloading of them.
+        for obj in self._get_loaded_objects(db):
+            if obj.lft is not None and obj.rgt is not None:
+                obj.lft, obj.rgt = shift(obj.lft), shift(obj.rgt)
+                self.mp_root.original_data(obj, lft=obj.lft, rgt=obj.rgt)
+
+    def save(self, obj):
+        """Saves object and maintains bounds of nodes."""
+        db = self._default_db()
+        with db.transaction:
+            if self.is_new(obj):
+                position = self._get_position(db, obj)
+                self._shift(db, [(position, None, 2)])
+                obj.lft, obj.rgt = position, position + 1
+                super(NestedSetMapper, self).save(obj)
+            elif self._is_moved(obj):
+                lft, rgt = self._get_bounds(db, to_tuple(self.get_pk(obj)))
+                position = self._get_position(db, obj)
+                if lft <= position <= rgt:
+                    raise ValueError("Can't move node {0!r} into its own subtree".format(obj))
+                super(NestedSetMapper, self).save(obj)
+                width = rgt - lft + 1
+                if position > rgt:
+                    shifts = [(lft, rgt, position - rgt - 1), (rgt + 1, position - 1, -width)]
+                else:
+                    shifts = [(lft, rgt, position - lft), (position, lft - 1, width)]
+                self._shift(db, shifts)
+                obj.lft, obj.rgt = lft + shifts[0][2], rgt + shifts[0][2]
+                self.mp_root.original_data(obj, lft=obj.lft, rgt=obj.rgt)
+            else:
+                super(NestedSetMapper, self).save(obj)
+        return self
+
+    def delete(self, obj, db=None, visited=None):
+        db = db or self._default_db()
+        with db.transaction:
+            lft, rgt = self._get_bounds(db, to_tuple(self.get_pk(obj)))
+            result = super(NestedSetMapper, self).delete(obj, db, visited)
+            # Descendants are deleted by cascade of "children" relation, so we only close the gap.
+            self._shift(db, [(rgt + 1, None, lft - rgt - 1)])
+        return result
+
+    def rebuild(self, db=None):
+        """Rebuilds lft and rgt by "parent" relation. Siblings are ordered by primary key."""
+        db = db or self._default_db()
+        t = self.mp_root.sql_table
+        pk = to_tuple(self.mp_root.pk)
+        children = collections.OrderedDict()
+        for row in db.execute(smartsql.Query(t).fields(
+            list(t.get_field(pk)) + list(t.get_field(self.mp_root.relations['parent'].field))
+        ).order_by(t.pk)).fetchall():
+            children.setdefault(tuple(row[len(pk):]), []).append(tuple(row[:len(pk)]))
+
+        bounds = {}
+        counter = 0
+        stack = [(key, False) for key in reversed(children.get((None,) * len(pk), []))]
+        while stack:
+            key, is_visited = stack.pop()
+            counter += 1
+            if is_visited:
+                bounds[key] = (bounds[key], counter)
+            else:
+                bounds[key] = counter
+                stack.append((key, True))
+                stack.extend((child, False) for child in reversed(children.get(key, [])))
+
+        query = smartsql.Update(table=t, mapping=collections.OrderedDict(((t.lft, 0), (t.rgt, 0))),
+                                where=(t.get_field(pk) == (0,) * len(pk)))
+        db.executemany(query, [value + key for key, value in bounds.items()])
+        for obj in self._get_loaded_objects(db):
+            key = to_tuple(self.mp_root.get_pk(obj))
+            if key in bounds:
+                obj.lft, obj.rgt = bounds[key]
+                self.mp_root.original_data(obj, lft=obj.lft, rgt=obj.rgt)
+
+    def get_ancestors(self, obj, root=False, me=False, reverse=True):
+        t = self.mp_root.sql_table
+        if me:
+            q = self.query.where((t.lft <= obj.lft) & (t.rgt >= obj.rgt))
+        else:
+            q = self.query.where((t.lft < obj.lft) & (t.rgt > obj.rgt))
+        if not root:
+            q = q.where(t.get_field(self.mp_root.relations['parent'].field[0]) != None)  # noqa
+        if reverse:
+            q = q.order_by(t.lft)
+        else:
+            q = q.order_by(t.lft.desc())
         return q
 
+    def get_descendants(self, obj, me=False):
+        t = self.mp_root.sql_table
+        if me:
+            q = self.query.where(t.lft.between(obj.lft, obj.rgt))
+        else:
+            q = self.query.where((t.lft > obj.lft) & (t.lft < obj.rgt))
+        return q.order_by(t.lft)
+
+    def get_descendant_count(self, obj):
+        return (obj.rgt - obj.lft - 1) // 2
+
 
 class MpModel(object):
 
@@ -168,6 +586,9 @@ class MpModel(object):
     def get_descendants(self, me=False):
         return self._mapper.get_descendants(self, me)
 
+    def get_descendant_count(self):
+        return self._mapper.get_descendant_count(self)
+
     @classproperty
     def _mapper(cls):
         return mapper_registry[cls]
@@ -1,8 +1,9 @@
 from __future__ import absolute_import
-import logging, time, weakref
+import sys, logging, time, weakref
 from functools import wraps
 from sqlbuilder import smartsql
 from ascetic import interfaces, observable, settings, utils
+from ascetic.instrumentation import ExecuteEvent, SlowQueryLog
 
 try:
     str = unicode  # Python 2.* compatible
@@ -23,8 +24,11 @@ class Database(interfaces.IDatabase):
     placeholder = '%s'
     compile = smartsql.compile
     connection = None
+    supports_returning = False
+    supports_server_side_cursors = False
 
-    def __init__(self, alias, engine, initial_sql, always_reconnect=False, debug=False, **kwargs):
+    def __init__(self, alias, engine, initial_sql, always_reconnect=False, debug=False, slow_query_threshold=None,
+                 **kwargs):
         self.alias = alias
         self.engine = engine
         self.debug = debug
@@ -32,9 +36,14 @@ class Database(interfaces.IDatabase):
         self.always_reconnect = always_reconnect
         self._conf = kwargs
         self._logger = logging.getLogger('.'.join((__name__, self.alias)))
+        observable.observe(self)
+        self._execute = self.instrument(self._execute)
+        self._executemany = self.instrument(self._executemany)
         if self.debug:
             self._execute = self.log_sql(self._execute)
-        observable.observe(self)
+            self._executemany = self.log_sql(self._executemany)
+        if slow_query_threshold is not None:
+            SlowQueryLog(slow_query_threshold, self._logger).observe(self)
 
     def connection_factory(self, **kwargs):
         raise NotImplementedError
@@ -51,10 +60,10 @@ class Database(interfaces.IDatabase):
         logger = self._logger
 
         @wraps(f)
-        def wrapper(sql, params=()):
+        def wrapper(sql, params=(), **kwargs):
             start = time.time()
             try:
-                return f(sql, params)
+                return f(sql, params, **kwargs)
             except Exception as e:
                 logger.exception(e)
                 raise
@@ -68,36 +77,86 @@ class Database(interfaces.IDatabase):
                 # import traceback; traceback.print_stack()
         return wrapper
 
-    def _execute(self, sql, params=()):
-        cursor = self.cursor()
+    def instrument(self, f):
+        """Notifies observers of "execute" aspect. Costs nothing while there are no observers."""
+        observed = self.observed()
+
+        @wraps(f)
+        def wrapper(sql, params=(), **kwargs):
+            if not observed.is_observed('execute'):
+                return f(sql, params, **kwargs)
+            cursor = None
+            start = time.time()
+            try:
+                cursor = f(sql, params, **kwargs)
+                return cursor
+            finally:
+                duration = time.time() - start
+                observed.notify('execute', ExecuteEvent(sql, params, duration, cursor, sys._getframe(1)))
+        return wrapper
+
+    def _execute(self, sql, params=(), server_side=False):
+        cursor = self.cursor(server_side)
         try:
             cursor.execute(sql, params)
         except Exception:
             if self.always_reconnect or self.transaction.can_reconnect():
                 self._ensure_connected()
-                cursor = self.cursor()
+                cursor = self.cursor(server_side)
                 cursor.execute(sql, params)
             else:
                 raise
         return cursor
 
-    def execute(self, sql, params=()):
+    def _executemany(self, sql, seq_of_params):
+        # It's not retried on reconnect, since a part of rows can be already written,
+        # and seq_of_params can be an iterator which is already consumed.
+        cursor = self.cursor()
+        self._do_executemany(cursor, sql, seq_of_params)
+        return cursor
+
+    def _do_executemany(self, cursor, sql, seq_of_params):
+        cursor.executemany(sql, seq_of_params)
+
+    def execute(self, sql, params=(), server_side=False):
+        """Executes the statement.
+
+        If server_side is True, the result is kept on server and fetched by cursor.fetchmany() chunks,
+        where the database supports it, see supports_server_side_cursors.
+        """
         if not isinstance(sql, string_types):
             sql, params = self.compile(sql)
+        sql = self._prepare_sql(sql)
+        if server_side and self.supports_server_side_cursors:
+            return self._execute(sql, params, server_side=True)
+        return self._execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        """Executes the statement against all parameter sequences.
+
+        The statement is compiled only once. If it's an expression,
+        its own params are ignored, and seq_of_params are bound to its placeholders.
+        """
+        if not isinstance(sql, string_types):
+            sql, params = self.compile(sql)
+        sql = self._prepare_sql(sql)
+        cursor = self._executemany(sql, seq_of_params)
+        return cursor
+
+    def _prepare_sql(self, sql):
         sql = sql.rstrip("; \t\n\r")
         if self.placeholder != PLACEHOLDER:
             sql = self._sql_replace(sql, PLACEHOLDER, self.placeholder)
-        cursor = self._execute(sql, params)
-        return cursor
+        return sql
 
     @staticmethod
-    def _sql_replace(self, statement, old, new):
+    def _sql_replace(statement, old, new):
         tokens = statement.split("'")
         for i in range(0, len(tokens), 2):
             tokens[i] = tokens[i].replace(old, new)
         return "'".join(tokens)
 
-    def cursor(self):
+    def cursor(self, server_side=False):
         if not self.connection:
             self._ensure_connected()
         return self.connection.cursor()
@@ -105,6 +164,12 @@ class Database(interfaces.IDatabase):
     def last_insert_id(self, cursor):
         return cursor.lastrowid
 
+    def copy_from(self, db_table, columns, rows):
+        raise NotImplementedError
+
+    def copy_to(self, sql, file_or_callback, params=(), type_codes=None):
+        raise NotImplementedError
+
     def begin(self):
         self.execute("BEGIN")
         self.observed().notify('begin')
@@ -118,15 +183,15 @@ class Database(interfaces.IDatabase):
         self.observed().notify('rollback')
 
     def begin_savepoint(self, name):
-        self.execute("SAVEPOINT %s", name)
+        self.execute("SAVEPOINT {0}".format(self.qn(name)))
         self.observed().notify('begin_savepoint', name)
 
     def commit_savepoint(self, name):
-        self.execute("RELEASE SAVEPOINT %s", name)
+        self.execute("RELEASE SAVEPOINT {0}".format(self.qn(name)))
         self.observed().notify('commit_savepoint', name)
 
     def rollback_savepoint(self, name):
-        self.execute("ROLLBACK TO SAVEPOINT %s", name)
+        self.execute("ROLLBACK TO SAVEPOINT {0}".format(self.qn(name)))
         self.observed().notify('rollback_savepoint', name)
 
     def set_autocommit(self, autocommit):
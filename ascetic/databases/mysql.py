@@ -7,6 +7,9 @@ from ascetic.databases.base import Database
 class MySQLDatabase(Database):
 
     compile = mysql.compile
+    # SSCursor of MySQLdb streams the result, but the connection can't execute other statements
+    # until the result is read to the end, while prefetch and lazy loading do it during iteration.
+    supports_server_side_cursors = False
 
     def connection_factory(self, **kwargs):
         import MySQLdb
@@ -38,7 +41,7 @@ class MySQLDatabase(Database):
                 'position': row[1],
                 'data_type': row[2],
                 'null': row[3].upper() == 'YES',
-                # 'default': row[4],
+                'db_default': row[4],
                 'max_length': row[5],
             }
             schema[col['column']] = col
@@ -1,11 +1,36 @@
+import io
+import codecs
+import re
+import json
+import binascii
+import itertools
 import collections
 from ascetic.databases.base import Database
 from ascetic.utils import cached_property
 
+try:
+    str = unicode  # Python 2.* compatible
+    string_types = (basestring,)
+    integer_types = (int, long)
+    binary_types = (bytearray, buffer, memoryview)
+except NameError:
+    string_types = (str,)
+    integer_types = (int,)
+    binary_types = (bytes, bytearray, memoryview)
+
+COPY_NULL = '\\N'
+COPY_ESCAPES = (('\\', '\\\\'), ('\t', '\\t'), ('\n', '\\n'), ('\r', '\\r'))
+COPY_UNESCAPES = {'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t', 'v': '\v'}
+
 
 @Database.register('postgresql')
 class PostgreSQLDatabase(Database):
 
+    executemany_page_size = 100
+    supports_returning = True
+    supports_server_side_cursors = True
+    _cursor_names = itertools.count()
+
     @cached_property
     def psycopg2(self):
         import psycopg2
@@ -16,10 +41,61 @@ class PostgreSQLDatabase(Database):
     def connection_factory(self, **kwargs):
         return self.psycopg2.connect(**kwargs)
 
+    def cursor(self, server_side=False):
+        if not server_side:
+            return super(PostgreSQLDatabase, self).cursor()
+        if not self.connection:
+            self._ensure_connected()
+        # Named cursor is declared on server, outside of transaction it should be held.
+        return self.connection.cursor(
+            name='ascetic_cursor_{0}'.format(next(self._cursor_names)), withhold=self.connection.autocommit
+        )
+
+    def _do_executemany(self, cursor, sql, seq_of_params):
+        # cursor.executemany() of psycopg2 makes a round trip per parameter set.
+        from psycopg2.extras import execute_batch
+        execute_batch(cursor, sql, seq_of_params, page_size=self.executemany_page_size)
+
     def last_insert_id(self, cursor):
         cursor.execute("SELECT lastval()")
         return cursor.fetchone()[0]
 
+    def copy_from(self, db_table, columns, rows):
+        """Loads rows into the table by COPY FROM STDIN.
+
+        Rows are encoded lazily, so memory usage does not depend on the number of rows.
+        """
+        sql = "COPY {0} ({1}) FROM STDIN".format(self.qn(db_table), ", ".join(self.qn(c) for c in columns))
+        cursor = self.cursor()
+        cursor.copy_expert(sql, CopyFromStream(rows))
+        return cursor.rowcount
+
+    def copy_to(self, sql, file_or_callback, params=(), type_codes=None):
+        """Streams result of the query by COPY TO STDOUT.
+
+        If file_or_callback is a callable, it will be called with tuple of values for each row.
+        The values are in text representation, unless type_codes of columns are given,
+        in this case they are decoded by typecasters of psycopg2, like values of cursor.
+        """
+        if not isinstance(sql, string_types):
+            sql, params = self.compile(sql)
+        cursor = self.cursor()
+        encoding = self.psycopg2.extensions.encodings[self.connection.encoding]
+        sql = cursor.mogrify(sql.rstrip("; \t\n\r"), params)
+        if isinstance(sql, bytes):
+            sql = sql.decode(encoding)
+        if hasattr(file_or_callback, 'write'):
+            stream = file_or_callback
+        else:
+            casters = None
+            if type_codes is not None:
+                casters = tuple(self.psycopg2.extensions.string_types.get(i) for i in type_codes)
+            stream = CopyToStream(file_or_callback, casters, cursor, encoding)
+        cursor.copy_expert("COPY ({0}) TO STDOUT".format(sql), stream)
+        if stream is not file_or_callback:
+            stream.close()
+        return cursor.rowcount
+
     def read_pk(self, db_table):
         # https://wiki.postgresql.org/wiki/Retrieve_primary_key_columns
         cursor = self.execute("""
@@ -46,7 +122,7 @@ class PostgreSQLDatabase(Database):
                 'position': row[1],
                 'data_type': row[2],
                 'null': row[3].upper() == 'YES',
-                # 'default': row[4],
+                'db_default': row[4],
                 'max_length': row[5],
             }
             schema[col['column']] = col
@@ -61,3 +137,104 @@ class PostgreSQLDatabase(Database):
         # self.execute("SET AUTOCOMMIT = {}".format('ON' if autocommit else 'OFF'))
         self.connection.set_session(autocommit=autocommit)
         super(PostgreSQLDatabase, self).set_autocommit(autocommit)
+
+
+class CopyFromStream(io.TextIOBase):
+    """File-like object which encodes rows to COPY text format on demand."""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._buffer = ''
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size is None or size < 0 or len(self._buffer) < size:
+            try:
+                row = next(self._rows)
+            except StopIteration:
+                break
+            self._buffer += self.encode_row(row)
+        if size is None or size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def readline(self, size=-1):
+        while '\n' not in self._buffer:
+            try:
+                row = next(self._rows)
+            except StopIteration:
+                break
+            self._buffer += self.encode_row(row)
+        data, sep, self._buffer = self._buffer.partition('\n')
+        return data + sep
+
+    @staticmethod
+    def encode_value(value):
+        if value is None:
+            return COPY_NULL
+        if isinstance(value, binary_types):
+            value = '\\x' + binascii.hexlify(value).decode('ascii')  # Hex format of bytea
+        elif isinstance(value, (dict, list)):
+            value = json.dumps(value)
+        elif isinstance(value, bool):
+            value = 't' if value else 'f'
+        else:
+            value = str(value)
+        for old, new in COPY_ESCAPES:
+            value = value.replace(old, new)
+        return value
+
+    def encode_row(self, row):
+        return '\t'.join(self.encode_value(value) for value in row) + '\n'
+
+
+class CopyToStream(io.TextIOBase):
+    """File-like object which decodes COPY text format and passes each row to the callback."""
+
+    _unescape_re = re.compile(r'\\(.)')
+
+    def __init__(self, callback, casters=None, cursor=None, encoding='utf-8'):
+        """
+        :param casters: typecasters of psycopg2 per column, None to keep text representation.
+        :param encoding: encoding of connection, to decode chunks of bytes.
+        """
+        self._callback = callback
+        self._casters = casters
+        self._cursor = cursor
+        # A multibyte character can be split between chunks.
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._buffer = ''
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if isinstance(data, bytes):
+            data = self._decoder.decode(data)
+        lines = (self._buffer + data).split('\n')
+        self._buffer = lines.pop()
+        for line in lines:
+            self._callback(self.decode_row(line))
+        return len(data)
+
+    def close(self):
+        self._buffer += self._decoder.decode(b'', final=True)
+        if self._buffer:
+            self._callback(self.decode_row(self._buffer))
+            self._buffer = ''
+        super(CopyToStream, self).close()
+
+    def decode_value(self, value):
+        if value == COPY_NULL:
+            return None
+        return self._unescape_re.sub(lambda m: COPY_UNESCAPES.get(m.group(1), m.group(1)), value)
+
+    def decode_row(self, line):
+        row = tuple(self.decode_value(value) for value in line.split('\t'))
+        if self._casters is None:
+            return row
+        return tuple(value if value is None or caster is None else caster(value, self._cursor)
+                     for value, caster in zip(row, self._casters))
@@ -1,5 +1,7 @@
+import collections
 from sqlbuilder.smartsql.dialects import sqlite
 from ascetic.databases.base import Database
+from ascetic.utils import cached_property
 
 
 @Database.register('sqlite3')
@@ -7,7 +9,37 @@ class SqliteDatabase(Database):
 
     placeholder = '?'
     compile = sqlite.compile
+    supports_server_side_cursors = True  # cursor of sqlite3 steps through the result on fetch
+
+    @cached_property
+    def supports_returning(self):
+        import sqlite3
+        return sqlite3.sqlite_version_info >= (3, 35, 0)
 
     def connection_factory(self, **kwargs):
         import sqlite3
         return sqlite3.connect(**kwargs)
+
+    def describe_table(self, db_table):
+        cursor = self.execute('PRAGMA table_info({0})'.format(self.qn(db_table)))
+        schema = collections.OrderedDict()
+        for row in cursor.fetchall():
+            col = {
+                'column': row[1],
+                'position': row[0] + 1,
+                'data_type': row[2],
+                'null': not row[3],
+                'db_default': row[4],
+            }
+            schema[col['column']] = col
+        return schema
+
+    def begin(self):
+        if not self.connection:
+            self._ensure_connected()
+        if getattr(self.connection, 'in_transaction', False):
+            # sqlite3 module implicitly opens transaction before DML, and it can't be nested by BEGIN.
+            # So, like PostgreSQL does, the opened transaction is used.
+            self.observed().notify('begin')
+        else:
+            super(SqliteDatabase, self).begin()
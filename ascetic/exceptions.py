@@ -12,3 +12,11 @@ class ObjectDoesNotExist(OrmException):
 
 class ValidationError(ValueError):
     pass
+
+
+class NPlusOneError(OrmException):
+    pass
+
+
+class NPlusOneWarning(UserWarning):
+    pass
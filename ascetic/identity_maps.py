@@ -2,6 +2,7 @@ import weakref
 from ascetic import interfaces
 from ascetic.databases import databases
 from ascetic.exceptions import ObjectDoesNotExist
+from ascetic.utils import to_tuple
 
 
 class NonexistentObject(object):
@@ -30,7 +31,7 @@ class CacheLru(object):
     def remove(self, value):
         try:
             self._order.remove(value)
-        except IndexError:
+        except ValueError:
             pass
 
     def clear(self):
@@ -228,9 +229,9 @@ class Sync(object):
         self._identity_map = identity_map
 
     def _sync(self):
-        for model, model_object_map in self._get_typed_objects():
+        for model, model_object_map in self._get_typed_objects().items():
             mapper = self._get_mapper(model)
-            pks = list(model_object_map.values())
+            pks = list(model_object_map)
             for obj in self._make_query(mapper, pks):
                 assert mapper.get_pk(obj) in model_object_map
                 assert not mapper.get_changed(obj)
@@ -238,6 +239,8 @@ class Sync(object):
     def _get_typed_objects(self):
         typed_objects = {}
         for obj in self._identity_map.alive.values():
+            if isinstance(obj, NonexistentObject):
+                continue
             model = obj.__class__
             if model not in typed_objects:
                 typed_objects[model] = {}
@@ -246,8 +249,9 @@ class Sync(object):
         return typed_objects
 
     def _make_query(self, mapper, pks):
+        from ascetic.query import make_in_where
         db = self._identity_map.db()
-        query = mapper.query.db(db).where(mapper.sql_table.pk.in_(pks))
+        query = mapper.query.db(db).where(make_in_where(mapper.sql_table, mapper.pk, [to_tuple(pk) for pk in pks]))
         query = query.map(lambda result, row, state: result.mapper.load(row, db, from_db=True, reload=True))
         return query
 
@@ -0,0 +1,292 @@
+from __future__ import absolute_import
+import re
+import sys
+import bisect
+import logging
+import warnings
+import itertools
+import threading
+import traceback
+import collections
+from contextlib import contextmanager
+from ascetic.exceptions import NPlusOneError, NPlusOneWarning
+from ascetic.utils import cached_property, SpecialAttrAccessor
+
+FINGERPRINT_RULES = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),  # string literals
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),  # numeric literals
+    (re.compile(r"(?:%s|\?)(?:\s*,\s*(?:%s|\?))+"), "..."),  # lists of values, like IN (%s, %s, %s)
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\s+"), " "),
+)
+
+HISTOGRAM_BOUNDS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_fingerprint_cache = {}
+
+
+def fingerprint(sql):
+    """Returns normalized statement without literals and placeholders, to group the same queries."""
+    try:
+        return _fingerprint_cache[sql]
+    except KeyError:
+        pass
+    result = sql
+    for regexp, replacement in FINGERPRINT_RULES:
+        result = regexp.sub(replacement, result)
+    result = result.strip()
+    if len(_fingerprint_cache) > 1000:
+        _fingerprint_cache.clear()
+    _fingerprint_cache[sql] = result
+    return result
+
+
+def get_caller(frame):
+    """Returns (filename, lineno, function name) of the nearest frame outside of ORM."""
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if not module.startswith(('ascetic.', 'sqlbuilder.')) or '.tests' in module:
+            return (frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name)
+        frame = frame.f_back
+    return None
+
+
+class ExecuteEvent(object):
+    """Event of the "execute" aspect of database.
+
+    Fingerprint and caller are computed lazily, only if an observer asks for them.
+    """
+    def __init__(self, sql, params, duration, cursor, frame):
+        """
+        :type sql: str
+        :type params: collections.Iterable
+        :type duration: float
+        :type cursor: sqlite3.Cursor or None
+        :type frame: frame
+        """
+        self.sql = sql
+        self.params = params
+        self.duration = duration
+        self.rowcount = getattr(cursor, 'rowcount', None)
+        self._frame = frame
+
+    @cached_property
+    def fingerprint(self):
+        return fingerprint(self.sql)
+
+    @cached_property
+    def caller(self):
+        return get_caller(self._frame)
+
+    @cached_property
+    def stack(self):
+        return ''.join(traceback.format_stack(self._frame))
+
+
+class Histogram(object):
+
+    def __init__(self, bounds=HISTOGRAM_BOUNDS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent):
+        """Returns upper bound of the bucket which contains given percentile."""
+        threshold = self.count * percent / 100.0
+        accumulated = 0
+        for bound, count in zip(self.bounds + (self.max,), self.buckets):
+            accumulated += count
+            if accumulated >= threshold:
+                return min(bound, self.max)
+        return self.max
+
+
+class QueryStats(object):
+    """Aggregates duration of statements per fingerprint.
+
+    Example of usage:
+    >>> stats = QueryStats()
+    >>> disposable = stats.observe(databases['default'])
+    >>> ...
+    >>> stats.top(10)
+    """
+    def __init__(self, histogram_factory=Histogram):
+        self.histograms = collections.defaultdict(histogram_factory)
+
+    def __call__(self, subject, aspect, event):
+        self.histograms[event.fingerprint].add(event.duration)
+
+    def observe(self, db):
+        """
+        :type db: ascetic.interfaces.IDatabase
+        :rtype: ascetic.interfaces.IDisposable
+        """
+        return db.observed().attach('execute', self)
+
+    def top(self, limit=None, key='total'):
+        result = sorted(self.histograms.items(), key=lambda i: getattr(i[1], key), reverse=True)
+        return result[:limit] if limit else result
+
+    def clear(self):
+        self.histograms.clear()
+
+
+class SlowQueryLog(object):
+    """Logs only statements which are slower than threshold (in seconds), with a stack sample."""
+
+    def __init__(self, threshold, logger=None):
+        self.threshold = threshold
+        self._logger = logger or logging.getLogger(__name__)
+
+    def __call__(self, subject, aspect, event):
+        if event.duration < self.threshold:
+            return
+        self._logger.warning(
+            'Slow query (%.4f) %s; caller=%s\n%s', event.duration, event.fingerprint, event.caller, event.stack,
+            extra={'duration': event.duration, 'sql': event.sql, 'fingerprint': event.fingerprint,
+                   'rowcount': event.rowcount}
+        )
+
+    def observe(self, db):
+        """
+        :type db: ascetic.interfaces.IDatabase
+        :rtype: ascetic.interfaces.IDisposable
+        """
+        return db.observed().attach('execute', self)
+
+
+class QueryLog(object):
+    """Collects SQL of executed statements, for example, to count queries in tests.
+
+    Example of usage:
+    >>> with QueryLog(databases['default']) as queries:
+    ...     list(Book.q.prefetch('author'))
+    >>> len(queries)
+    """
+    def __init__(self, db):
+        """
+        :type db: ascetic.interfaces.IDatabase
+        """
+        self._db = db
+        self._disposable = None
+        self.queries = []
+
+    def __call__(self, subject, aspect, event):
+        self.queries.append(event.sql)
+
+    def __enter__(self):
+        self._disposable = self._db.observed().attach('execute', self)
+        return self.queries
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._disposable.dispose()
+        self._disposable = None
+
+
+class LazyLoadDetector(object):
+    """Detects N+1 problem, when the same relation is lazily loaded for sibling objects of one result.
+
+    Example of usage:
+    >>> with LazyLoadDetector(threshold=1, raise_error=True):
+    ...     for book in Book.q:
+    ...         book.author  # raises NPlusOneError on second book
+
+    Use start() and stop() to enable detector per request.
+    """
+    _local = threading.local()
+    _counter = itertools.count(1)
+    origin = SpecialAttrAccessor('lazy_load_origin')
+
+    def __init__(self, threshold=1, raise_error=False):
+        """
+        :param threshold: max number of lazy loads of a relation for objects of the same result.
+        :param raise_error: raise NPlusOneError instead of warning.
+        """
+        self.threshold = threshold
+        self.raise_error = raise_error
+        self.lazy_loads = collections.Counter()  # (model name, relation name, caller) => number of loads
+        self._counts = collections.Counter()
+        self._reported = set()
+
+    @classmethod
+    def current(cls):
+        """
+        :rtype: LazyLoadDetector or None
+        """
+        stack = getattr(cls._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    @classmethod
+    @contextmanager
+    def suspend(cls):
+        """Disables detection, for example, while prefetched objects are populated."""
+        if not hasattr(cls._local, 'stack'):
+            cls._local.stack = []
+        cls._local.stack.append(None)
+        try:
+            yield
+        finally:
+            cls._local.stack.pop()
+
+    def start(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        self._local.stack.append(self)
+        return self
+
+    def stop(self):
+        self._local.stack.remove(self)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def make_origin(self):
+        """Returns token which marks sibling objects of one result."""
+        return next(self._counter)
+
+    def on_load(self, obj, origin):
+        try:
+            self.origin.set(obj, origin)
+        except AttributeError:  # __slots__
+            pass
+
+    def on_lazy_load(self, relation, instance):
+        """
+        :type relation: ascetic.interfaces.IRelation
+        :type instance: object
+        """
+        caller = get_caller(sys._getframe(1))
+        self.lazy_loads[(relation.mapper.name, relation.name, caller)] += 1
+        origin = getattr(instance, '_lazy_load_origin', None)
+        if origin is None:
+            return
+        key = (relation.mapper.name, relation.name, origin)
+        self._counts[key] += 1
+        if self._counts[key] > self.threshold and key not in self._reported:
+            self._reported.add(key)
+            self._report(relation, self._counts[key], caller)
+
+    def _report(self, relation, count, caller):
+        message = (
+            'N+1 queries: relation "{0}" of "{1}" is lazily loaded {2} times for objects of the same result, '
+            'called from {3}. Use .prefetch(\'{0}\') for the query of "{1}".'
+        ).format(relation.name, relation.mapper.name, count, '{0}:{1} in {2}()'.format(*caller) if caller else None)
+        if self.raise_error:
+            raise NPlusOneError(message)
+        warnings.warn(message, NPlusOneWarning, stacklevel=3)
@@ -23,6 +23,13 @@ class IObservable(object):
         """
         raise NotImplementedError
 
+    def is_observed(self, aspect):
+        """
+        :type aspect: collections.Hashable
+        :rtype: bool
+        """
+        raise NotImplementedError
+
     def is_null(self):
         """
         :rtype: bool
@@ -57,16 +64,26 @@ class IDatabase(object):
         """
         raise NotImplementedError
 
-    def execute(self, sql, params=()):
+    def execute(self, sql, params=(), server_side=False):
         """
         :type sql: str
         :type params: collections.Iterable
+        :type server_side: bool
+        :rtype: sqlite3.Cursor
+        """
+        raise NotImplementedError
+
+    def executemany(self, sql, seq_of_params):
+        """
+        :type sql: str
+        :type seq_of_params: collections.Iterable
         :rtype: sqlite3.Cursor
         """
         raise NotImplementedError
 
-    def cursor(self):
+    def cursor(self, server_side=False):
         """
+        :type server_side: bool
         :rtype: sqlite3.Cursor
         """
         raise NotImplementedError
@@ -74,6 +91,25 @@ class IDatabase(object):
     def last_insert_id(self, cursor):
         raise NotImplementedError
 
+    def copy_from(self, db_table, columns, rows):
+        """
+        :type db_table: str
+        :type columns: list[str]
+        :type rows: collections.Iterable
+        :rtype: int
+        """
+        raise NotImplementedError
+
+    def copy_to(self, sql, file_or_callback, params=(), type_codes=None):
+        """
+        :type sql: str
+        :type file_or_callback: file or collections.Callable
+        :type params: collections.Iterable
+        :type type_codes: collections.Sequence or None
+        :rtype: int
+        """
+        raise NotImplementedError
+
     def begin(self):
         raise NotImplementedError
 
@@ -2,7 +2,9 @@ from __future__ import absolute_import
 
 import collections
 import copy
+import itertools
 import re
+import weakref
 from threading import RLock
 
 from sqlbuilder import smartsql
@@ -10,7 +12,7 @@ from sqlbuilder import smartsql
 from ascetic import interfaces
 from ascetic.exceptions import ObjectDoesNotExist, MapperNotRegistered
 from ascetic.fields import Field
-from ascetic.utils import to_tuple, SpecialAttrAccessor, SpecialMappingAccessor
+from ascetic.utils import to_tuple, cached_property, SpecialAttrAccessor, SpecialMappingAccessor, Snapshot
 from ascetic.databases import databases
 from ascetic.signals import pre_save, post_save, pre_delete, post_delete, class_prepared
 from ascetic.validators import MappingValidator, CompositeMappingValidator
@@ -24,6 +26,11 @@ except NameError:
     integer_types = (int,)
 
 
+# Writes of the object are tracked, but there are no writes yet. The set of names is created by the first write,
+# see Model.__setattr__(), so, loaded objects which are never written don't keep an own set.
+NOT_CHANGED = frozenset()
+
+
 def thread_safe(func):
     def _deco(*args, **kwargs):
         with RLock():
@@ -40,6 +47,9 @@ class MapperRegistry(object):
     def register(self, name, model, mapper):
         self._model_registry[model] = mapper
         self._name_registry[name] = mapper
+        for registered_mapper in self._model_registry.values():
+            registered_mapper.__dict__.pop('dependent_relations', None)  # New model can add reverse relations
+            registered_mapper.__dict__.pop('polymorphic_derived', None)  # New model can be a polymorphic subclass
 
     def __contains__(self, key):
         registry = self._name_registry if isinstance(key, string_types) else self._model_registry
@@ -89,8 +99,11 @@ class Mapper(object):
     original_data = SpecialMappingAccessor(SpecialAttrAccessor('original_data', default=dict))
     is_new = SpecialAttrAccessor('new_record', default=True)
     used_db = SpecialAttrAccessor('db')
+    changed_fields = SpecialAttrAccessor('changed')  # Names written after loading, see Model.__setattr__()
+    deferred_loader = SpecialAttrAccessor('deferred')
     field_factory = Field
     result_factory = staticmethod(lambda *a, **kw: Result(*a, **kw))
+    deferred_loader_factory = staticmethod(lambda *a, **kw: DeferredLoader(*a, **kw))
 
     @thread_safe
     def __init__(self, model=None, default_db_accessor=lambda: databases['default']):
@@ -229,6 +242,20 @@ class Mapper(object):
             prefix = smartsql.Table(prefix)
         return [prefix.get_field(f.name) for f in self.fields.values() if not getattr(f, 'virtual', False)]
 
+    def create_compact_model(self, model):
+        """Creates subclass of model with __slots__ for fields, see ascetic.models.CompactModel"""
+        existing_slots = set()
+        for cls in model.__mro__:
+            existing_slots.update(to_tuple(cls.__dict__.get('__slots__', ())))
+        slots = [name for name in self.fields if name not in existing_slots]
+        slots += [name for name in ('_state', '__weakref__') if name not in existing_slots]
+        compact_model = type.__new__(type(model), model.__name__, (model,), {
+            '__slots__': tuple(slots),
+            '__module__': model.__module__,
+        })
+        self.mapper_registry.register(self.name, compact_model, self)
+        return compact_model
+
     def _prepare_model(self, model):
         self._do_prepare_model(model)
         PrepareModel(self, model).compute()
@@ -260,23 +287,83 @@ class Mapper(object):
                     result[key] = value.get_bound_relation(self.model)
         return result
 
-    def load(self, data, db, from_db=True, reload=False):
-        return Load(self, data, db, from_db, reload).compute()
+    @cached_property
+    def dependent_relations(self):
+        """Relations of rows which depend on rows of this mapper, i.e. the cascade graph of delete().
+
+        The cache is reset when a new mapper is registered.
+        """
+        pk = to_tuple(self.pk)
+        return tuple(rel for rel in self.relations.values()
+                     if isinstance(rel, OneToMany) or (isinstance(rel, OneToOne) and rel.field == pk))
+
+    def load(self, data, db, from_db=True, reload=False, deferred_loader=None):
+        return Load(self, data, db, from_db, reload, deferred_loader).compute()
 
     def unload(self, obj, fields=frozenset(), exclude=frozenset(), to_db=True):
         return Unload(self, obj, self._get_specified_fields(fields, exclude), to_db).compute()
 
+    def copy_from(self, objs, db=None, fields=frozenset(), exclude=frozenset()):
+        """Bulk loading of objects or dicts of field values by COPY.
+
+        Signals, validation and identity map are bypassed.
+        """
+        db = db or self._default_db()
+        return CopyFrom(self, objs, db, fields, exclude).compute()
+
+    def upsert(self, obj_or_objs, conflict_fields=None, update_fields=None, db=None):
+        """Inserts objects, or updates rows which conflict by unique fields, by one statement per chunk.
+
+        Uses "ON CONFLICT ... DO UPDATE" or "ON DUPLICATE KEY UPDATE" for MySQL.
+        Returns primary key of object, or list of primary keys for list of objects.
+        Defaults are set and objects are validated, but signals are not sent.
+
+        :param conflict_fields: names of unique fields, primary key by default.
+        :param update_fields: names of fields to update on conflict, all other fields by default.
+        """
+        db = db or self._default_db()
+        if isinstance(obj_or_objs, (list, tuple)):
+            return Upsert(self, obj_or_objs, db, conflict_fields, update_fields).compute()
+        return Upsert(self, (obj_or_objs,), db, conflict_fields, update_fields).compute()[0]
+
     def make_identity_key(self, model, pk):
         return (model, to_tuple(pk))
 
     def get_changed(self, obj):
-        if not self.original_data(obj):
+        original_data = self.original_data(obj)
+        if not original_data:
             return set(self.fields)
-        return frozenset(k for k, v in self.original_data(obj).items() if k in self.fields and self.fields[k].get_value(obj) != v)
+        names = getattr(obj, '_changed', None)
+        if names is None:  # Writes are not tracked, so, compare all fields
+            names = original_data
+        return frozenset(k for k in names if k in self.fields and k in original_data and
+                         self.fields[k].get_value(obj) != original_data[k])
+
+    def set_original_data(self, obj, data):
+        """Stores snapshot of data for dirty tracking and resets tracked writes."""
+        self.original_data(obj, data if isinstance(data, Snapshot) else Snapshot(data))
+        self.track_changes(obj)
+
+    def track_changes(self, obj):
+        if hasattr(obj.__class__, '_changed'):  # Model supports tracking of writes
+            self.changed_fields(obj, NOT_CHANGED)
+
+    def get_deferred(self, obj):
+        """Returns names of fields which are not loaded yet."""
+        loader = getattr(obj, '_deferred', None)
+        return loader.names if loader is not None else frozenset()
+
+    def load_deferred(self, obj):
+        """Loads deferred fields of the object and its siblings."""
+        loader = getattr(obj, '_deferred', None)
+        if loader is not None:
+            loader.compute()
 
     def set_defaults(self, obj):
+        deferred = self.get_deferred(obj)
         for name, field in self.fields.items():
-            field.set_default(obj)
+            if name not in deferred:
+                field.set_default(obj)
         return obj
 
     def validate(self, obj, fields=frozenset(), exclude=frozenset()):
@@ -301,9 +388,11 @@ class Mapper(object):
         fields &= set(self.fields)
         return fields
 
-    def _insert_query(self, obj):
-        auto_pk = not all(to_tuple(self.get_pk(obj)))
-        data = self.unload(obj, exclude=(to_tuple(self.pk) if auto_pk else ()), to_db=True)
+    def _insert_query(self, obj, exclude=None):
+        if exclude is None:
+            auto_pk = not all(to_tuple(self.get_pk(obj)))
+            exclude = to_tuple(self.pk) if auto_pk else ()
+        data = self.unload(obj, exclude=exclude, to_db=True)
         data = {self.sql_table.get_field(k): v for k, v in data.items()}
         return smartsql.Insert(table=self.sql_table, mapping=data)
 
@@ -319,51 +408,102 @@ class Mapper(object):
         """Sets defaults, validates and inserts into or updates database"""
         db = db or self._default_db()
         self.set_defaults(obj)
-        self.validate(obj, fields=self.get_changed(obj))
+        changed = self.get_changed(obj)
+        if changed:  # Empty fields mean all fields
+            self.validate(obj, fields=changed)
         pre_save.send(sender=self.model, instance=obj, db=db)
         is_new = self.is_new(obj)
         result = self._insert(obj, db) if is_new else self._update(obj, db)
-        # TODO: Set default values from DB?
         post_save.send(sender=self.model, instance=obj, created=is_new, db=db)
-        self.original_data(obj, **self.unload(obj, to_db=False))
+        if is_new or not self.original_data(obj):
+            self.set_original_data(obj, self.unload(obj, to_db=False))
+        else:
+            self.original_data(obj, **{name: self.fields[name].get_value(obj) for name in self.get_changed(obj)})
+            self.track_changes(obj)
         self.is_new(obj, False)
         return result
 
     def _insert(self, obj, db):
-        cursor = db.execute(self._insert_query(obj))
-        if not all(to_tuple(self.get_pk(obj))):
-            self.set_pk(obj, db.last_insert_id(cursor))
+        pk = to_tuple(self.pk)
+        auto_pk = not all(to_tuple(self.get_pk(obj)))
+        generated = list(pk) if auto_pk else []
+        generated += self._get_generated_fields(obj, exclude=generated)
+        query = self._insert_query(obj, exclude=generated)
+        if generated and db.supports_returning:
+            # Primary key and values which are set by DB are read back by the same statement
+            self._returning(obj, db, query, generated)
+        else:
+            cursor = db.execute(query)
+            if auto_pk:
+                self.set_pk(obj, db.last_insert_id(cursor))
         self.used_db(obj, db)
-        self.get_identity_map(db).add(self.make_identity_key(self.model, self.get_pk(obj)))
+        self.get_identity_map(db).add(self.make_identity_key(self.model, self.get_pk(obj)), obj)
 
     def _update(self, obj, db):
-        db.execute(self._update_query(obj))
+        changed = self.get_changed(obj)
+        if not changed:  # Empty fields mean all fields for unload(), and deferred fields would be loaded
+            return
+        query = self._update_query(obj)
+        generated = self._get_generated_fields(obj, exclude=changed.union(to_tuple(self.pk)))
+        if generated and db.supports_returning:
+            self._returning(obj, db, query, generated)
+        else:
+            db.execute(query)
+
+    def _returning(self, obj, db, query, names):
+        row = db.execute(Returning(query, [self.sql_table.get_field(name) for name in names])).fetchone()
+        if row is None:
+            return {}
+        data = dict(zip(names, row))
+        for name, value in data.items():
+            self.fields[name].set_value(obj, value)
+        return data
+
+    def _get_generated_fields(self, obj, exclude=()):
+        """Returns names of fields which values are set by DB.
+
+        These are fields declared with db_generated=True (computed columns, or columns maintained by triggers),
+        and fields with DB defaults which values are still None.
+        """
+        exclude = self.get_deferred(obj).union(exclude)
+        return [name for name, field in self.fields.items()
+                if name not in exclude and not getattr(field, 'virtual', False) and (
+                    getattr(field, 'db_generated', False) or
+                    (getattr(field, 'db_default', None) is not None and field.get_value(obj) is None))]
 
     def delete(self, obj, db=None, visited=None):
+        """Deletes object and its dependent rows by one statement per table of relation level.
+
+        Signals are sent only for mappers which have receivers.
+        """
         db = db or self._default_db()
         if visited is None:
             visited = set()
-        if self in visited:
+        key = self.make_identity_key(self.model, self.get_pk(obj))
+        if key in visited:
             return False
-        visited.add(self)
-        pre_delete.send(sender=self.model, instance=obj, db=db)
-        for key, rel in self.relations.items():
-            if isinstance(rel, OneToMany):
-                for child in getattr(obj, key).iterator():
-                    rel.on_delete(obj, child, rel, db, visited)
-            elif isinstance(rel, OneToOne):
-                try:
-                    child = getattr(obj, key)
-                except ObjectDoesNotExist:
-                    pass
-                else:
-                    rel.on_delete(obj, child, rel, db, visited)
-
-        db.execute(self._delete_query(obj))
-        post_delete.send(sender=self.model, instance=obj, db=db)
-        self.get_identity_map(db).remove(self.make_identity_key(self.model, self.get_pk(obj)))
+        visited.add(key)
+        BulkDelete(self, db, None, visited).delete(self, self.sql_table.pk == self.get_pk(obj), [obj])
         return True
 
+    def bulk_update(self, query, values, db=None, signals=False):
+        """Updates rows of query by single statement, returns number of rows.
+
+        Objects are loaded only to send signals. Updated objects are evicted from identity map.
+        """
+        db = db or self._default_db()
+        return BulkUpdate(self, db, values, signals).compute(query)
+
+    def bulk_delete(self, query, db=None, signals=False):
+        """Deletes rows of query by set-based statements, returns number of rows.
+
+        Cascades are resolved by one statement per relation level.
+        Objects are loaded only to send signals and for custom on_delete handlers.
+        Deleted objects are evicted from identity map.
+        """
+        db = db or self._default_db()
+        return BulkDelete(self, db, signals).compute(query)
+
     def get(self, _obj_pk=None, _db=None, **kwargs):
         if isinstance(_obj_pk, interfaces.IDatabase):
             _db, _obj_pk = _obj_pk, _db
@@ -438,26 +578,28 @@ class PrepareModel(object):
 
 class Load(object):
 
-    def __init__(self, mapper, data, db, from_db, reload):
+    def __init__(self, mapper, data, db, from_db, reload, deferred_loader=None):
         """
         :type mapper: Mapper
         :type data: tuple
         :type db: ascetic.interfaces.IDatabase
         :type from_db: bool
         :type reload: bool
+        :type deferred_loader: DeferredLoader or None
         """
         self._mapper = mapper
         self._data = data
         self._db = db
         self._from_db = from_db
         self._reload = reload
+        self._deferred_loader = deferred_loader
 
     def compute(self):
         if self._from_db:
             data_mapped = self._map_data_from_db(self._data)
         else:
             data_mapped = dict(self._data)
-        key = self._mapper.make_identity_key(self._mapper.model, tuple(data_mapped[i] for i in to_tuple(self._mapper.pk)))
+        key = self._make_identity_key(data_mapped)
         try:
             obj = self._identity_map.get(key)
         except KeyError:  # First loading
@@ -465,16 +607,21 @@ class Load(object):
         except ObjectDoesNotExist:  # Serializable transaction level
             raise
         else:
-            if reload:
+            if self._reload:
                 self._do_reload(obj, data_mapped)
             else:
                 return obj
-        self._mapper.original_data(obj, data_mapped)
+        self._mapper.set_original_data(obj, data_mapped)
         self._mapper.is_new(obj, False)
         self._mapper.used_db(obj, self._db)
+        if self._deferred_loader is not None:
+            self._deferred_loader.add(obj, data_mapped)
         self._identity_map.add(key, obj)
         return obj
 
+    def _make_identity_key(self, data_mapped):
+        return self._mapper.make_identity_key(self._mapper.model, tuple(data_mapped[i] for i in to_tuple(self._mapper.pk)))
+
     def _map_data_from_db(self, data, columns=None):
         columns = columns or self._mapper.columns
         data_mapped = {}
@@ -500,6 +647,72 @@ class Load(object):
         return self._mapper.get_identity_map(self._db)
 
 
+class DeferredLoader(object):
+    """Loads fields which were not selected, by single query for all sibling objects of one result."""
+
+    chunk_size = 500
+
+    def __init__(self, mapper, db):
+        """
+        :type mapper: Mapper
+        :type db: ascetic.interfaces.IDatabase
+        """
+        self._mapper = mapper
+        self._db = db
+        self._objs = []
+        self.names = None
+
+    def add(self, obj, data):
+        if self.names is None:
+            self.names = frozenset(name for name, field in self._mapper.fields.items()
+                                   if name not in data and not getattr(field, 'virtual', False))
+        if not self.names:
+            return
+        if hasattr(obj.__class__, '_deferred'):  # Model, see Model.__getattr__()
+            for name in self.names:
+                try:
+                    delattr(obj, name)
+                except AttributeError:
+                    pass
+        self._mapper.deferred_loader(obj, self)
+        self._objs.append(weakref.ref(obj))
+
+    def compute(self):
+        mapper = self._mapper
+        objs = {}
+        for ref in self._objs:
+            obj = ref()
+            if obj is not None and getattr(obj, '_deferred', None) is self:
+                objs[to_tuple(mapper.get_pk(obj))] = obj
+        self._objs = []
+        pk = to_tuple(mapper.pk)
+        names = tuple(self.names)
+        keys = list(objs)
+        for i in range(0, len(keys), self.chunk_size):
+            for row in self._db.execute(self._make_query(pk, names, keys[i:i + self.chunk_size])).fetchall():
+                self._populate(objs[tuple(row[:len(pk)])], names, row[len(pk):])
+        for obj in objs.values():
+            mapper.deferred_loader(obj, None)
+
+    def _make_query(self, pk, names, keys):
+        table = self._mapper.sql_table
+        where = make_in_where(table, pk, keys)
+        return smartsql.Query(table).fields([table.get_field(name) for name in pk + names]).where(where)
+
+    def _populate(self, obj, names, values):
+        mapper = self._mapper
+        changed = getattr(obj, '_changed', None)
+        written = frozenset(changed or ())  # Don't overwrite values written by user
+        for name, value in zip(names, values):
+            if name not in written:
+                mapper.fields[name].set_value(obj, value)
+        if changed is NOT_CHANGED:
+            mapper.changed_fields(obj, NOT_CHANGED)  # Loading of deferred fields is not a write
+        elif changed is not None:
+            changed.difference_update(set(names) - written)
+        mapper.original_data(obj, **dict(zip(names, values)))
+
+
 class Unload(object):
 
     def __init__(self, mapper, obj, fields, to_db):
@@ -529,5 +742,365 @@ class Unload(object):
     def _do_unload(self):
         return {name: self._mapper.fields[name].get_value(self._obj) for name in self._fields}
 
-from ascetic.relations import RelationDescriptor, OneToOne, OneToMany
-from ascetic.query import factory as sql, Result
+class CopyFrom(object):
+
+    def __init__(self, mapper, objs, db, fields, exclude):
+        """
+        :type mapper: Mapper
+        :type objs: collections.Iterable
+        :type db: ascetic.interfaces.IDatabase
+        :type fields: set
+        :type exclude: set
+        """
+        self._mapper = mapper
+        self._objs = objs
+        self._db = db
+        self._fields = fields
+        self._exclude = exclude
+
+    def compute(self):
+        objs = iter(self._objs)
+        try:
+            first = next(objs)
+        except StopIteration:
+            return 0
+        names = self._get_field_names(first)
+        columns = [self._mapper.fields[name].column for name in names]
+        rows = (self._unload(obj, names) for obj in itertools.chain((first,), objs))
+        return self._db.copy_from(self._mapper.db_table, columns, rows)
+
+    def _get_field_names(self, obj):
+        exclude = set(self._exclude)
+        if not all(self._get_pk(obj)):
+            exclude |= set(to_tuple(self._mapper.pk))
+        names = self._mapper._get_specified_fields(self._fields, exclude)
+        return [name for name, field in self._mapper.fields.items()
+                if name in names and not getattr(field, 'virtual', False)]
+
+    def _get_pk(self, obj):
+        if isinstance(obj, dict):
+            return tuple(obj.get(k) for k in to_tuple(self._mapper.pk))
+        return to_tuple(self._mapper.get_pk(obj))
+
+    def _unload(self, obj, names):
+        if isinstance(obj, dict):
+            return tuple(obj.get(name) for name in names)
+        data = self._mapper.unload(obj, fields=names, to_db=False)
+        return tuple(data[name] for name in names)
+
+
+class Upsert(object):
+
+    chunk_size = 500
+
+    def __init__(self, mapper, objs, db, conflict_fields, update_fields):
+        """
+        :type mapper: Mapper
+        :type objs: collections.Sequence
+        :type db: ascetic.interfaces.IDatabase
+        :type conflict_fields: collections.Iterable or None
+        :type update_fields: collections.Iterable or None
+        """
+        self._mapper = mapper
+        self._objs = objs
+        self._db = db
+        self._pk = to_tuple(mapper.pk)
+        self._conflict_fields = tuple(conflict_fields) if conflict_fields else self._pk
+        self._update_fields = update_fields
+
+    def compute(self):
+        mapper = self._mapper
+        for obj in self._objs:
+            mapper.set_defaults(obj)
+            mapper.validate(obj)
+        # Statement has the same columns for all rows, so, objects with auto primary key are inserted separately
+        for auto_pk in (False, True):
+            objs = [obj for obj in self._objs if all(to_tuple(mapper.get_pk(obj))) != auto_pk]
+            if auto_pk and objs and set(self._pk) & set(self._conflict_fields):
+                raise ValueError("Objects without primary key can't conflict by primary key, "
+                                 "specify conflict_fields or use save().")
+            names = self._get_field_names(auto_pk)
+            update_names = self._get_update_field_names(names)
+            for i in range(0, len(objs), self.chunk_size):
+                self._upsert(objs[i:i + self.chunk_size], names, update_names)
+        return [mapper.get_pk(obj) for obj in self._objs]
+
+    def _get_field_names(self, auto_pk):
+        exclude = self._pk if auto_pk else ()
+        return [name for name, field in self._mapper.fields.items()
+                if name not in exclude and not getattr(field, 'virtual', False)]
+
+    def _get_update_field_names(self, names):
+        if self._update_fields is not None:
+            update_fields = set(self._update_fields)
+            return [name for name in names if name in update_fields]
+        return [name for name in names if name not in self._conflict_fields and name not in self._pk]
+
+    def _upsert(self, objs, names, update_names):
+        mapper = self._mapper
+        table = mapper.sql_table
+        rows = [self._unload(obj, names) for obj in objs]
+        query = smartsql.Insert(
+            table=table,
+            fields=[table.get_field(name) for name in names],
+            values=rows,
+            ignore=not update_names,
+            on_duplicate_key_update=collections.OrderedDict(
+                (table.get_field(name), Excluded(mapper.fields[name].column)) for name in update_names
+            ),
+            duplicate_key=[table.get_field(name) for name in self._conflict_fields]
+        )
+        self._db.execute(query)
+        if self._is_reload_required(names, update_names):
+            self._reload(objs)
+        identity_map = mapper.get_identity_map(self._db)
+        for obj in objs:
+            mapper.is_new(obj, False)
+            mapper.used_db(obj, self._db)
+            mapper.set_original_data(obj, mapper.unload(obj, to_db=False))
+            identity_map.add(mapper.make_identity_key(mapper.model, mapper.get_pk(obj)), obj)
+
+    def _is_reload_required(self, names, update_names):
+        """Objects have the state of rows, if row of object has been inserted or all its values have been updated.
+
+        Otherwise generated keys and not updated values of conflicting rows should be selected.
+        """
+        written = set(self._conflict_fields) | set(update_names)
+        return not set(self._pk) <= set(self._conflict_fields) or not written >= set(names)
+
+    def _reload(self, objs):
+        mapper = self._mapper
+        table = mapper.sql_table
+        conflict = self._conflict_fields
+        names = self._get_field_names(False)
+        objs_by_key = {self._unload(obj, conflict): obj for obj in objs}
+        where = make_in_where(table, conflict, list(objs_by_key))
+        query = smartsql.Query(table).fields([table.get_field(name) for name in names]).where(where)
+        for row in self._db.execute(query).fetchall():
+            data = dict(zip(names, row))
+            obj = objs_by_key.get(tuple(data[name] for name in conflict))
+            if obj is not None:
+                for name, value in data.items():
+                    mapper.fields[name].set_value(obj, value)
+
+    def _unload(self, obj, names):
+        data = self._mapper.unload(obj, fields=names, to_db=False)
+        return tuple(data[name] for name in names)
+
+
+class BulkOperation(object):
+    """Base class of set-based statements for rows of query."""
+
+    def __init__(self, mapper, db, signals):
+        """
+        :type mapper: Mapper
+        :type db: ascetic.interfaces.IDatabase
+        :param signals: True, False or None to send signals only for mappers which have receivers.
+        """
+        self._mapper = mapper
+        self._db = db
+        self._signals = signals
+
+    def _get_where(self, query):
+        """Selects keys by the query itself, so it can contain joins, limit etc."""
+        mapper = self._mapper
+        pk = to_tuple(mapper.pk)
+        query = query.fields([mapper.sql_table.get_field(name) for name in pk], reset=True)
+        if query._limit is None and not query._offset:
+            query = query.order_by(reset=True)
+        return make_in_where(mapper.sql_table, pk, self._wrap(query, [mapper.fields[name].column for name in pk]))
+
+    def _select(self, mapper, names, where):
+        table = mapper.sql_table
+        query = smartsql.Query(table).fields([table.get_field(name) for name in names]).where(where)
+        return self._wrap(query, [mapper.fields[name].column for name in names])
+
+    @staticmethod
+    def _wrap(query, columns):
+        # Derived table, since MySQL can't select from the table which is modified by the statement.
+        derived = query.as_table('bulk_keys')
+        return smartsql.Query(derived).fields([smartsql.Field(column, derived) for column in columns])
+
+    def _load(self, mapper, where):
+        return list(mapper.query.db(self._db).where(where))
+
+    def _evict(self, mapper, where, objs=None):
+        identity_map = mapper.get_identity_map(self._db)
+        model = mapper.model
+        if objs is None:
+            if not any(key[0] is model for key in list(identity_map.alive.keys())):
+                return
+            table = mapper.sql_table
+            pk = to_tuple(mapper.pk)
+            query = smartsql.Query(table).fields([table.get_field(name) for name in pk]).where(where)
+            keys = self._db.execute(query).fetchall()
+        else:
+            keys = [mapper.get_pk(obj) for obj in objs]
+        for key in keys:
+            identity_map.remove(mapper.make_identity_key(model, key))
+
+
+class BulkUpdate(BulkOperation):
+
+    chunk_size = 500
+
+    def __init__(self, mapper, db, values, signals):
+        """
+        :type values: dict
+        """
+        super(BulkUpdate, self).__init__(mapper, db, signals)
+        self._values = values
+
+    def compute(self, query):
+        mapper = self._mapper
+        table = mapper.sql_table
+        where = self._get_where(query)
+        objs = self._load(mapper, where) if self._signals else None
+        for obj in objs or ():
+            pre_save.send(sender=mapper.model, instance=obj, db=self._db)
+        mapping = {(table.get_field(k) if isinstance(k, string_types) else k): v for k, v in self._values.items()}
+        self._evict(mapper, where, objs)
+        cursor = self._db.execute(smartsql.Update(table=table, mapping=mapping, where=where))
+        if objs:
+            self._refresh(mapper, objs)
+            for obj in objs:
+                post_save.send(sender=mapper.model, instance=obj, created=False, db=self._db)
+        return cursor.rowcount
+
+    def _refresh(self, mapper, objs):
+        """Updated values can be expressions, so, objects which were sent to pre_save are refreshed in place.
+
+        Rows are selected by keys, since the condition of query can be changed by the update.
+        """
+        table = mapper.sql_table
+        pk = to_tuple(mapper.pk)
+        names = [name for name, field in mapper.fields.items() if not getattr(field, 'virtual', False)]
+        objs_by_key = {to_tuple(mapper.get_pk(obj)): obj for obj in objs}
+        keys = list(objs_by_key)
+        identity_map = mapper.get_identity_map(self._db)
+        for i in range(0, len(keys), self.chunk_size):
+            where = make_in_where(table, pk, keys[i:i + self.chunk_size])
+            query = smartsql.Query(table).fields([table.get_field(name) for name in names]).where(where)
+            for row in self._db.execute(query).fetchall():
+                data = dict(zip(names, row))
+                obj = objs_by_key.get(tuple(data[name] for name in pk))
+                if obj is None:  # Primary key has been changed by the update
+                    continue
+                for name, value in data.items():
+                    mapper.fields[name].set_value(obj, value)
+                mapper.set_original_data(obj, data)
+                identity_map.add(mapper.make_identity_key(mapper.model, mapper.get_pk(obj)), obj)
+
+
+class BulkDelete(BulkOperation):
+    """Deletes rows and its dependent rows by one statement per table of relation level.
+
+    Dependent rows are selected by subquery "fk IN (SELECT ...)" of the parent level.
+    """
+    max_depth = 100
+
+    def __init__(self, mapper, db, signals, visited=None):
+        """
+        :param visited: identity keys of objects which are deleted by custom on_delete handlers.
+        """
+        super(BulkDelete, self).__init__(mapper, db, signals)
+        self._visited = set() if visited is None else visited
+
+    def compute(self, query):
+        where = self._get_where(query)
+        if self._has_own_delete(self._mapper):
+            return self._delete_objects(self._mapper, where)
+        return self.delete(self._mapper, where)
+
+    def delete(self, mapper, where, objs=None, incoming=None, path=()):
+        if len(path) > self.max_depth:
+            raise Exception("Cascade of {0!r} is too deep, possibly rows have circular references.".format(mapper))
+        if objs is None and self._has_signals(mapper):
+            objs = self._load(mapper, where)
+        if objs is not None and self._has_signals(mapper):
+            for obj in objs:
+                pre_delete.send(sender=mapper.model, instance=obj, db=self._db)
+        path += (mapper,)
+        for rel in mapper.dependent_relations:
+            if (incoming is not None and rel.related_mapper is incoming.mapper and
+                    rel.related_field == incoming.field and rel.field == incoming.related_field):
+                continue  # Reverse side of OneToOne with shared primary key
+            related_mapper = rel.related_mapper
+            related_where = self._get_related_where(mapper, rel, where)
+            if rel.on_delete is do_nothing:
+                continue
+            elif rel.on_delete is cascade:
+                if related_mapper not in path and self._has_own_delete(related_mapper):
+                    self._delete_objects(related_mapper, related_where)
+                    continue
+                # Self-referencing relations are followed while there are dependent rows
+                if related_mapper in path and not self._exists(related_mapper, related_where):
+                    continue
+                self.delete(related_mapper, related_where, None, rel, path)
+            elif rel.on_delete is set_null:
+                self._evict(related_mapper, related_where)
+                self._db.execute(smartsql.Update(
+                    table=related_mapper.sql_table,
+                    mapping={related_mapper.sql_table.get_field(name): None for name in rel.related_field},
+                    where=related_where
+                ))
+            else:
+                if objs is None:
+                    objs = self._load(mapper, where)
+                self._call_handler(rel, objs)
+        self._evict(mapper, where, objs)
+        cursor = self._db.execute(smartsql.Delete(table=mapper.sql_table, where=where))
+        if objs is not None and self._has_signals(mapper):
+            for obj in objs:
+                post_delete.send(sender=mapper.model, instance=obj, db=self._db)
+        return cursor.rowcount
+
+    @staticmethod
+    def _has_own_delete(mapper):
+        """Mapper which overrides delete() maintains additional state of rows, e.g. tree mappers."""
+        method = type(mapper).delete
+        return getattr(method, '__func__', method) is not getattr(Mapper.delete, '__func__', Mapper.delete)
+
+    def _delete_objects(self, mapper, where):
+        """Deletes objects one by one by mapper.delete().
+
+        The own delete() of mapper is responsible for rows which depend on the object by the same mapper
+        (e.g. subtree), so objects which have been deleted by previous objects are skipped.
+        """
+        objs = self._load(mapper, where)
+        for obj in objs:
+            if self._exists(mapper, mapper.sql_table.pk == mapper.get_pk(obj)):
+                mapper.delete(obj, db=self._db, visited=self._visited)
+        return len(objs)
+
+    def _has_signals(self, mapper):
+        if self._signals is None:
+            return pre_delete.has_receivers(mapper.model) or post_delete.has_receivers(mapper.model)
+        return self._signals
+
+    def _get_related_where(self, mapper, rel, where):
+        related_where = make_in_where(rel.related_mapper.sql_table, rel.related_field,
+                                      self._select(mapper, rel.field, where))
+        related_type_field = getattr(rel, 'related_type_field', None)  # GenericRelation
+        if related_type_field is not None:
+            related_where &= rel.related_mapper.sql_table.get_field(related_type_field) == mapper.name
+        return related_where
+
+    def _exists(self, mapper, where):
+        query = smartsql.Query(mapper.sql_table).fields(smartsql.Constant('1')).where(where).limit(1)
+        return self._db.execute(query).fetchone() is not None
+
+    def _call_handler(self, rel, objs):
+        for obj in objs:
+            if isinstance(rel, OneToMany):
+                children = getattr(obj, rel.name).iterator()
+            else:
+                try:
+                    children = (getattr(obj, rel.name),)
+                except ObjectDoesNotExist:
+                    continue
+            for child in children:
+                rel.on_delete(obj, child, rel, self._db, self._visited)
+
+from ascetic.relations import RelationDescriptor, OneToOne, OneToMany, cascade, set_null, do_nothing
+from ascetic.query import factory as sql, Result, Excluded, Returning, make_in_where
@@ -1,4 +1,4 @@
-from ascetic.mappers import Mapper, thread_safe
+from ascetic.mappers import NOT_CHANGED, Mapper, thread_safe
 from ascetic.signals import pre_init, post_init
 from ascetic.utils import classproperty, to_tuple
 
@@ -12,7 +12,7 @@ class ModelBase(type):
 
         new_cls = type.__new__(mcs, name, bases, attrs)
 
-        if name in ('Model', 'NewBase', ):
+        if name in ('Model', 'CompactModel', 'NewBase', ):
             return new_cls
 
         mapper_class = getattr(new_cls, 'Mapper', None) or getattr(new_cls, 'Meta', None)
@@ -30,9 +30,12 @@ class ModelBase(type):
         return new_cls
 
 
-class Model(ModelBase("NewBase", (object, ), {})):
+class Model(ModelBase("NewBase", (object, ), {'__slots__': ()})):
 
+    __slots__ = ()
     _new_record = True
+    _changed = None
+    _deferred = None
     _s = None
 
     def __init__(self, *args, **kwargs):
@@ -43,6 +46,23 @@ class Model(ModelBase("NewBase", (object, ), {})):
             self.__dict__.update(kwargs)
         post_init.send(sender=self.__class__, instance=self)
 
+    def __setattr__(self, name, value):
+        super(Model, self).__setattr__(name, value)
+        changed = getattr(self, '_changed', None)
+        if changed is not None and name in self._mapper.fields:  # Writes are tracked
+            if changed is NOT_CHANGED:
+                self._changed = {name}
+            else:
+                changed.add(name)
+
+    def __getattr__(self, name):
+        if name in self._mapper.fields:
+            loader = getattr(self, '_deferred', None)
+            if loader is not None and name in loader.names:  # Deferred field, see Result.only()
+                loader.compute()
+                return getattr(self, name)
+        raise AttributeError(name)
+
     def __eq__(self, other):
         return isinstance(other, self.__class__) and self._get_pk() == other._get_pk()
 
@@ -91,6 +111,80 @@ class Model(ModelBase("NewBase", (object, ), {})):
         return "<{0}.{1}: {2}>".format(type(self).__module__, type(self).__name__, self.pk)
 
 
+class CompactModelBase(ModelBase):
+    """Metaclass for CompactModel"""
+
+    @thread_safe
+    def __new__(mcs, name, bases, attrs):
+        attrs.setdefault('__slots__', ())
+        new_cls = super(CompactModelBase, mcs).__new__(mcs, name, bases, attrs)
+        if name in ('CompactModel', 'NewBase', ):
+            return new_cls
+        new_cls._compact_class = new_cls._mapper.create_compact_model(new_cls)
+        return new_cls
+
+
+class StateAttribute(object):
+    """Stores special attribute of ORM in the single "_state" slot of CompactModel instance."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        try:
+            return instance._state[self.name]
+        except (AttributeError, KeyError):
+            raise AttributeError(self.name)
+
+    def __set__(self, instance, value):
+        try:
+            state = instance._state
+        except AttributeError:
+            state = instance._state = {}
+        state[self.name] = value
+
+    def __delete__(self, instance):
+        try:
+            del instance._state[self.name]
+        except (AttributeError, KeyError):
+            raise AttributeError(self.name)
+
+
+class CompactModel(CompactModelBase("NewBase", (Model, ), {'__slots__': ()})):
+    """Model without __dict__.
+
+    The mapper generates a subclass with __slots__ for all fields, and one slot for the state of ORM,
+    so, instances can't have attributes which are not fields of the mapper.
+    """
+    __slots__ = ()
+
+    _original_data = StateAttribute('_original_data')
+    _new_record = StateAttribute('_new_record')
+    _db = StateAttribute('_db')
+    _cache = StateAttribute('_cache')
+    _changed = StateAttribute('_changed')
+    _deferred = StateAttribute('_deferred')
+    _lazy_load_origin = StateAttribute('_lazy_load_origin')
+
+    def __new__(cls, *args, **kwargs):
+        return object.__new__(cls._compact_class)
+
+    def __init__(self, *args, **kwargs):
+        pre_init.send(sender=self.__class__, instance=self, args=args, kwargs=kwargs)
+        if args:
+            kwargs.update(zip(self._mapper.fields.keys(), args))
+        for name in self._mapper.fields:
+            setattr(self, name, kwargs.pop(name, None))
+        for name, value in kwargs.items():  # relations
+            setattr(self, name, value)
+        post_init.send(sender=self.__class__, instance=self)
+
+    def __dir__(self):
+        return dir(self.__class__) + list(self._mapper.fields)
+
+
 class CompositeModel(object):
     """Composite model.
 
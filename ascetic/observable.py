@@ -39,6 +39,13 @@ class Observable(interfaces.IObservable):
         for observer in observers:
             observer(self.get_subject(), aspect, *args, **kwargs)
 
+    def is_observed(self, aspect):
+        """
+        :type aspect: collections.Hashable
+        :rtype: bool
+        """
+        return bool(self._observers.get(None) or self._observers.get(aspect))
+
     def is_null(self):
         """
         :rtype: bool
@@ -66,6 +73,13 @@ class DummyObservable(interfaces.IObservable):
         :type aspect: collections.Hashable
         """
 
+    def is_observed(self, aspect):
+        """
+        :type aspect: collections.Hashable
+        :rtype: bool
+        """
+        return False
+
     def is_null(self):
         """
         :rtype: bool
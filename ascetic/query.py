@@ -1,8 +1,11 @@
 import copy
+import collections
 import operator
 from functools import reduce, partial
 from sqlbuilder import smartsql
+from sqlbuilder.smartsql.dialects import mysql, sqlite
 from ascetic.exceptions import ObjectDoesNotExist
+from ascetic.instrumentation import LazyLoadDetector
 from ascetic.relations import Relation, ForeignKey, OneToOne, OneToMany
 from ascetic.signals import field_mangling, column_mangling
 from ascetic.utils import to_tuple
@@ -47,10 +50,13 @@ class Table(smartsql.Table):
         elif isinstance(self._mapper.relations.get(name, None), Relation):
             relation = self._mapper.relations.get(name)
             related_alias = relation.related_mapper.sql_table.as_(next(smartsql.auto_name))
-            return AutoJoinedTable(
+            related_table = AutoJoinedTable(
                 related_alias,
                 smartsql.InnerJoin(None, related_alias, relation.get_join_where(self, related_alias))
-            ).f
+            )
+            if len(parts) > 1:  # Path through relations, like "author__last_name"
+                return related_table.get_field(parts[1])
+            return related_table.f
             # name = self._mapper.relations.get(name).field
 
         if type(name) == tuple:
@@ -113,6 +119,139 @@ def compile_autojoinedtable(compile, expr, state):
     compile(expr.m_delegate__, state)
 
 
+class Excluded(smartsql.Expr):
+    """Value of the column which was proposed for insertion, for update on conflict of upsert."""
+
+    __slots__ = ('column',)
+
+    def __init__(self, column):
+        smartsql.Operable.__init__(self)
+        self.column = column
+
+
+@smartsql.compile.when(Excluded)
+def compile_excluded(compile, expr, state):
+    state.sql.append('excluded.')
+    compile(smartsql.Name(expr.column), state)
+
+
+@mysql.compile.when(Excluded)
+def compile_excluded_mysql(compile, expr, state):
+    state.sql.append('VALUES(')
+    compile(smartsql.Name(expr.column), state)
+    state.sql.append(')')
+
+
+class Returning(smartsql.Expr):
+    """Statement which returns values of given fields of inserted or updated rows."""
+
+    __slots__ = ('query', 'fields')
+
+    def __init__(self, query, fields):
+        smartsql.Operable.__init__(self)
+        self.query = query
+        self.fields = fields
+
+
+@smartsql.compile.when(Returning)
+def compile_returning(compile, expr, state):
+    compile(smartsql.OmitParentheses(expr.query), state)
+    state.sql.append(' RETURNING ')
+    compile(smartsql.FieldList(*expr.fields), state)
+
+
+class RowValues(smartsql.Expr):
+    """List of row values, the right side of condition "(a, b) IN ((1, 2), (3, 4))"."""
+
+    __slots__ = ('rows',)
+
+    def __init__(self, rows):
+        smartsql.Operable.__init__(self)
+        self.rows = rows
+
+
+@smartsql.compile.when(RowValues)
+def compile_rowvalues(compile, expr, state):
+    state.sql.append('(')
+    compile_rows(compile, expr.rows, state)
+    state.sql.append(')')
+
+
+@sqlite.compile.when(RowValues)
+def compile_rowvalues_sqlite(compile, expr, state):
+    # SQLite accepts only subquery on the right side of row value IN.
+    state.sql.append('(VALUES ')
+    compile_rows(compile, expr.rows, state)
+    state.sql.append(')')
+
+
+def compile_rows(compile, rows, state):
+    for i, row in enumerate(rows):
+        if i:
+            state.sql.append(', ')
+        state.sql.append('(')
+        for j, value in enumerate(row):
+            if j:
+                state.sql.append(', ')
+            compile(value, state)
+        state.sql.append(')')
+
+
+def make_in_where(table, names, values):
+    """Returns condition "names IN values", values is a subquery or a list of keys (tuples).
+
+    Composite keys are compared as row values, since a long chain of OR can't be compiled (it's recursive).
+    """
+    names = to_tuple(names)
+    if len(names) == 1:
+        if not isinstance(values, smartsql.Query):
+            values = [key[0] for key in values]
+        return table.get_field(names[0]).in_(values)
+    if not isinstance(values, smartsql.Query):
+        values = RowValues([to_tuple(key) for key in values])
+    return smartsql.Binary(smartsql.Parentheses(table.get_field(names)), 'IN', values)
+
+
+@factory.register
+class Query(smartsql.Query):
+    """Query adapted for mapper."""
+
+    def count(self):
+        return self.result(self).count()
+
+    def exists(self):
+        return self.result(self).exists()
+
+    def update(self, key_values=None, **kwargs):
+        """Updates rows of query by single statement. Accepts names of fields also.
+
+        The keyword argument "signals" is the same option as of delete(),
+        so, pass a field with this name by key_values.
+        """
+        signals = kwargs.pop('signals', False)  # Keyword-only, Python 2.* compatible
+        values = dict(key_values or (), **kwargs)
+        return self.result(self).update(values, signals=signals)
+
+    def delete(self, signals=False):
+        """Deletes rows of query and its dependent rows by set-based statements."""
+        return self.result(self).delete(signals=signals)
+
+    def group_by(self, *args, **opts):
+        """Accepts names of fields also."""
+        mapper = getattr(self.result, 'mapper', None)
+        if mapper is not None:
+            args = tuple(mapper.sql_table.get_field(i) if isinstance(i, string_types) else i for i in args)
+        return super(Query, self).group_by(*args, **opts)
+
+    def __bool__(self):
+        return self.result(self).__bool__()
+
+    __nonzero__ = __bool__  # Python 2.* compatible
+
+
+smartsql.compile.set_precedence(20, Query)  # Precedence is looked up by exact class
+
+
 class Result(smartsql.Result):
     """Result adapted for table."""
 
@@ -124,6 +263,7 @@ class Result(smartsql.Result):
         self.mapper = mapper
         self._prefetch = {}
         self._select_related = {}
+        self._loaded_fields = None  # None means all fields
         self._is_base = True
         self._map = default_map
         self._cache = None  # empty list also can be a cached result, so, using None instead of empty list
@@ -137,6 +277,13 @@ class Result(smartsql.Result):
         self.fill_cache()
         return iter(self._cache)
 
+    def __bool__(self):
+        if self._cache is not None:
+            return bool(self._cache)
+        return self.exists()
+
+    __nonzero__ = __bool__  # Python 2.* compatible
+
     def __getitem__(self, key):
         if self._cache:
             return self._cache[key]
@@ -149,19 +296,110 @@ class Result(smartsql.Result):
         else:
             return super(Result, self).__getitem__(key)
 
-    def execute(self):
+    def execute(self, server_side=False):
         """Implementation of query execution"""
+        if server_side:
+            return self._db.execute(self._query, server_side=True)
         return self._db.execute(self._query)
 
-    insert = update = delete = execute
+    insert = execute
+
+    def update(self, values, signals=False):
+        return self.mapper.bulk_update(self._query, values, self._db, signals)
+
+    def delete(self, signals=False):
+        return self.mapper.bulk_delete(self._query, self._db, signals)
 
     def select(self):
         return self
 
     def count(self):
+        """Returns number of rows without loading of objects."""
         if self._cache is not None:
             return len(self._cache)
-        return self.execute().fetchone()[0]
+        return self._db.execute(self._make_aggregate_query(smartsql.func.Count(smartsql.Constant('1')))).fetchone()[0]
+
+    def exists(self):
+        """Returns True if query has at least one row, without loading of objects."""
+        if self._cache is not None:
+            return bool(self._cache)
+        return self._db.execute(self._make_aggregate_query(smartsql.Constant('1')).limit(1)).fetchone() is not None
+
+    def aggregate(self, *args, **kwargs):
+        """Returns dict of aggregated values without loading of objects.
+
+        Example of usage:
+        >>> Book.q.where(Book.s.author_id == 1).aggregate(Count(), total=Sum('price'))
+        {'all__count': 2, 'total': 30}
+        """
+        aggregates = self._get_aggregates(args, kwargs)
+        table = self.mapper.sql_table
+        q = self._query
+        if q._distinct or q._group_by:
+            raise Exception("Aggregation of distinct or grouped query is not supported, use annotate() instead.")
+        if q._limit is None and not q._offset:
+            q = q.order_by(reset=True).fields([i.resolve(table) for i in aggregates.values()], reset=True)
+        else:
+            aliases = ['_aggregate_{0}'.format(i) for i in range(len(aggregates))]
+            subquery = q.fields(
+                [(smartsql.Constant('1') if i.field == '*' else i.get_field(table)).as_(alias)
+                 for alias, i in zip(aliases, aggregates.values())], reset=True
+            ).as_table('aggregate_list')
+            q = smartsql.Query(subquery).fields(
+                [i.wrap(smartsql.Constant('*') if i.field == '*' else smartsql.Field(alias, subquery))
+                 for alias, i in zip(aliases, aggregates.values())]
+            )
+        row = self._db.execute(q).fetchone()
+        return dict(zip(aggregates, row))
+
+    def annotate(self, *args, **kwargs):
+        """Selects fields of group_by() and given aggregates. Rows are returned as dicts.
+
+        Example of usage:
+        >>> list(Book.q.group_by('author_id').annotate(total=Sum('price')))
+        [{'author_id': 1, 'total': 30}, {'author_id': 2, 'total': 15}]
+        """
+        aggregates = self._get_aggregates(args, kwargs)
+        table = self.mapper.sql_table
+        self._prefetch = {}
+        self._map = dict_map
+        return self._query.fields(
+            list(self._query._group_by) + [i.resolve(table).as_(alias) for alias, i in aggregates.items()],
+            reset=True
+        )
+
+    @staticmethod
+    def _get_aggregates(args, kwargs):
+        aggregates = collections.OrderedDict((i.default_alias, i) for i in args)
+        aggregates.update(sorted(kwargs.items()))
+        return aggregates
+
+    def _make_aggregate_query(self, field):
+        q = self._query
+        if q._limit is None and not q._offset:
+            q = q.order_by(reset=True)
+            if not q._distinct and not q._group_by:
+                return q.fields(field, reset=True)
+        if not q._distinct and not q._group_by:
+            q = q.fields(smartsql.Constant('1'), reset=True)
+        return smartsql.Query(q.as_table('aggregate_list')).fields(field)
+
+    def copy_to(self, file_or_callback):
+        """Streams rows by COPY, PostgreSQL only.
+
+        The callback receives objects loaded by map of this result, with values decoded by types of columns.
+        """
+        if hasattr(file_or_callback, 'write'):
+            return self._db.copy_to(self._query, file_or_callback)
+        fields = self.mapper.fields
+        names = self._loaded_fields or self._get_sql_field_names()
+        columns = tuple(fields[name].column for name in names)
+        type_codes = tuple(getattr(fields[name], 'type_code', None) for name in names)
+        query = self._query.fields([self.mapper.sql_table.get_field(name) for name in names], reset=True)
+        map_row = self._make_map_row()
+        return self._db.copy_to(
+            query, lambda row: file_or_callback(map_row(row=zip(columns, row))), type_codes=type_codes
+        )
 
     def clone(self):
         c = smartsql.Result.clone(self)
@@ -176,18 +414,71 @@ class Result(smartsql.Result):
             self._cache = list(self.iterator())
             self.populate_prefetch()
 
-    def iterator(self):
-        """Iterator"""
-        cursor = self.execute()
-        fields = tuple(f[0] for f in cursor.description)
+    def iterator(self, chunk_size=None):
+        """Iterator
 
-        if isinstance(self._map, type):
-            map_row = self._map(self)
+        If chunk_size is given, rows are fetched by chunks instead of all at once,
+        by server-side cursor where the database supports it, otherwise by LIMIT/OFFSET queries.
+        """
+        if chunk_size is None:
+            rows = self._fetch_all(self.execute())
+        elif self._db.supports_server_side_cursors:
+            rows = self._fetch_chunks(self.execute(server_side=True), chunk_size)
         else:
-            map_row = partial(self._map, result=self, state={})
+            rows = self._fetch_slices(chunk_size)
 
+        map_row = self._make_map_row()
+        detector = LazyLoadDetector.current()
+        if detector is None:
+            for row in rows:
+                yield map_row(row=row)
+        else:
+            origin = detector.make_origin()
+            for row in rows:
+                obj = map_row(row=row)
+                detector.on_load(obj, origin)
+                yield obj
+
+    def _make_map_row(self):
+        if isinstance(self._map, type):
+            return self._map(self)
+        return partial(self._map, result=self, state={})
+
+    @staticmethod
+    def _fetch_all(cursor):
+        fields = tuple(f[0] for f in cursor.description)
         for row in cursor.fetchall():
-            yield map_row(row=zip(fields, row))
+            yield zip(fields, row)
+
+    @staticmethod
+    def _fetch_chunks(cursor, chunk_size):
+        rows = cursor.fetchmany(chunk_size)
+        # Description of server-side cursor is available only after the first fetch.
+        fields = tuple(f[0] for f in cursor.description)
+        while rows:
+            for row in rows:
+                yield zip(fields, row)
+            rows = cursor.fetchmany(chunk_size)
+        cursor.close()
+
+    def _fetch_slices(self, chunk_size):
+        q = self._query
+        if not q._order_by and not q._group_by:
+            q = q.order_by(self.mapper.sql_table.pk)  # Slices should not overlap
+        offset, limit = q._offset or 0, q._limit
+        while limit is None or limit > 0:
+            size = chunk_size if limit is None else min(chunk_size, limit)
+            chunk = q.limit(offset, size)
+            rows = self._fetch_all(chunk.result(chunk).execute())
+            count = 0
+            for row in rows:
+                count += 1
+                yield row
+            if count < size:
+                break
+            offset += size
+            if limit is not None:
+                limit -= size
 
     def db(self, db=None):
         """
@@ -211,6 +502,35 @@ class Result(smartsql.Result):
         c._map = map
         return c._query
 
+    def only(self, *names):
+        """Selects only given fields, the rest fields are deferred and loaded on first access."""
+        names = self._expand_names(names) | set(to_tuple(self.mapper.pk))
+        return self._set_loaded_fields(name for name in self._get_sql_field_names() if name in names)
+
+    def defer(self, *names):
+        """Defers loading of given fields until first access."""
+        if names and names[0] is None:  # .defer(None)
+            return self._set_loaded_fields(None)
+        names = self._expand_names(names) - set(to_tuple(self.mapper.pk))
+        loaded = self._loaded_fields or self._get_sql_field_names()
+        return self._set_loaded_fields(name for name in loaded if name not in names)
+
+    def _expand_names(self, names):
+        result = set()
+        for name in names:
+            result.update(to_tuple(self.mapper.pk) if name == 'pk' else (name,))
+        return result
+
+    def _get_sql_field_names(self):
+        return tuple(name for name, field in self.mapper.fields.items() if not getattr(field, 'virtual', False))
+
+    def _set_loaded_fields(self, names):
+        self._loaded_fields = None if names is None else tuple(names)
+        return self._query.fields(
+            self.mapper.get_sql_fields() if names is None else
+            [self.mapper.sql_table.get_field(name) for name in self._loaded_fields]
+        )
+
     def prefetch(self, *a, **kw):
         """Prefetch relations"""
         relations = self.mapper.relations
@@ -226,14 +546,18 @@ class Result(smartsql.Result):
         relations = self.mapper.relations
         for key, query in self._prefetch.items():
             relation = relations[key]
+            if hasattr(relation, 'prefetch'):  # Relation has own strategy, e.g. GenericForeignKey
+                relation.prefetch(self._cache, query)
+                continue
             preset_relation = RelationPresetter(relation)
             # recursive handle prefetch
             cond = reduce(operator.or_, (relation.get_related_where(obj) for obj in self._cache))
             query = query.where(cond)
-            for obj in self._cache:
-                for prefetched_obj in query:
-                    if relation.get_value(obj) == relation.get_related_value(prefetched_obj):
-                        preset_relation(obj, related_obj=prefetched_obj)
+            with LazyLoadDetector.suspend():
+                for obj in self._cache:
+                    for prefetched_obj in query:
+                        if relation.get_value(obj) == relation.get_related_value(prefetched_obj):
+                            preset_relation(obj, related_obj=prefetched_obj)
 
 
 class RelationPresetter(object):
@@ -296,8 +620,21 @@ class OneToManyPresetter(RelationPresetter):
         self.set_value(related_obj, self.related_name, obj)
 
 
+def dict_map(result, row, state):
+    columns = result.mapper.columns
+    return {columns[k].name if k in columns else k: v for k, v in row}
+
+
+def tuple_map(result, row, state):
+    return tuple(v for k, v in row)
+
+
 def default_map(result, row, state):
-    return result.mapper.load(row, result.db(), from_db=True)
+    try:
+        deferred_loader = state['deferred_loader']
+    except KeyError:
+        deferred_loader = state['deferred_loader'] = result.mapper.deferred_loader_factory(result.mapper, result.db())
+    return result.mapper.load(row, result.db(), from_db=True, deferred_loader=deferred_loader)
 
 
 class SelectRelatedMap(object):
@@ -341,6 +678,7 @@ class SelectRelatedMap(object):
         return objs
 
     def _build_relations(self, relations, objs):
-        for i, relation in enumerate(relations):
-            obj, related_obj = objs[i], objs[i + 1]
-            RelationPresetter(relation)(obj, related_obj)
+        with LazyLoadDetector.suspend():
+            for i, relation in enumerate(relations):
+                obj, related_obj = objs[i], objs[i + 1]
+                RelationPresetter(relation)(obj, related_obj)
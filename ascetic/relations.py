@@ -5,6 +5,7 @@ from ascetic.interfaces import IRelation, IRelationDescriptor
 from ascetic.mappers import mapper_registry, Mapper
 from ascetic.utils import to_tuple
 from ascetic.exceptions import MapperNotRegistered
+from ascetic.instrumentation import LazyLoadDetector
 from ascetic.utils import cached_property, SpecialAttrAccessor, SpecialMappingAccessor
 
 try:
@@ -21,7 +22,7 @@ def cascade(parent, child, parent_relation, db, visited):
 
 
 def set_null(parent, child, parent_relation, db, visited):
-    setattr(child, parent_relation.related_field, None)
+    parent_relation.set_related_value(child, None)
     mapper_registry[child.__class__].save(child, db=db)
 
 
@@ -222,6 +223,11 @@ class Relation(BaseRelation, IRelation):
     def _set_cache(self, instance, key, value):
         self._cache.update(instance, {key: value})
 
+    def _detect_lazy_load(self, instance):
+        detector = LazyLoadDetector.current()
+        if detector is not None:
+            detector.on_lazy_load(self, instance)
+
     def setup_reverse_relation(self):
         try:
             related_model = self.related_model
@@ -279,8 +285,13 @@ class ForeignKey(Relation):
         if cached_obj is None or not isinstance(cached_obj, self.related_model) or self.get_related_value(cached_obj) != val:
             db = self.mapper.used_db(instance)
             if self._related_query is None and self.related_field == to_tuple(self.related_mapper.pk):
+                # Probe IdentityMap only for detector, since hit doesn't cause query
+                if LazyLoadDetector.current() is not None and not self.related_mapper.get_identity_map(db).exists(
+                        self.related_mapper.make_identity_key(self.related_model, val)):
+                    self._detect_lazy_load(instance)
                 obj = self.related_mapper.get(val, db)  # to use IdentityMap before query
             else:
+                self._detect_lazy_load(instance)
                 obj = self.related_query.where(self.get_related_where(instance)).db(db)[0]
             self._set_cache(instance, self.name, obj)
         return self._get_cache(instance, self.name)
@@ -356,6 +367,7 @@ class OneToMany(Relation):
                     cached_query = None
                     break
         if cached_query is None:
+            self._detect_lazy_load(instance)
             db = self.mapper.used_db(instance)
             q = self.related_query.where(self.get_related_where(instance)).db(db)
             self._set_cache(instance, self.name, q)
@@ -1,8 +1,12 @@
 from __future__ import absolute_import
-from weakref import WeakKeyDictionary, WeakValueDictionary
+import threading
+from contextlib import contextmanager
+from weakref import WeakKeyDictionary, WeakValueDictionary, ref
 
 __all__ = ('Signal', 'pre_save', 'post_save', 'pre_delete', 'post_delete',
-           'pre_init', 'post_init', 'class_prepared', 'field_mangling', 'column_mangling', )
+           'pre_init', 'post_init', 'class_prepared', 'field_mangling', 'column_mangling', 'suppress', )
+
+NO_RESPONSES = ()
 
 
 class UndefinedSender(object):
@@ -19,6 +23,8 @@ class Signal(object):
     def _flush(self):
         self._receivers = WeakKeyDictionary()
         self._weak_cache = set()
+        self._snapshots = WeakKeyDictionary()
+        self._local = threading.local()
 
     def connect(self, receiver, sender=None, weak=True, receiver_id=None):
         if sender is None:
@@ -30,6 +36,7 @@ class Signal(object):
         if sender not in self._receivers:
             self._receivers[sender] = WeakValueDictionary()
         self._receivers[sender][receiver_id] = receiver
+        self._snapshots.clear()
 
     @staticmethod
     def _make_id(target):
@@ -50,18 +57,62 @@ class Signal(object):
                     del self._receivers[sender]
             except KeyError:
                 pass
+            self._snapshots.clear()
         else:
             raise ValueError('a receiver or a receiver_id must be provided')
 
+    def _get_snapshot(self, sender):
+        try:
+            return self._snapshots[sender]
+        except KeyError:
+            snapshot = self._snapshots[sender] = self._make_snapshot(sender)
+            return snapshot
+        except TypeError:  # sender can't be weakly referenced
+            return self._make_snapshot(sender)
+
+    def _make_snapshot(self, sender):
+        """Returns tuple of (weak reference to receiver, is receiver connected to any sender)."""
+        snapshot = []
+        for key in ((sender, undefined_sender) if sender is not undefined_sender else (undefined_sender,)):
+            if key in self._receivers:
+                for receiver in self._receivers[key].values():
+                    snapshot.append((ref(receiver), key is undefined_sender))
+        return tuple(snapshot)
+
+    def has_receivers(self, sender=None):
+        if not self._receivers:
+            return False
+        if sender is None:
+            sender = undefined_sender
+        return any(receiver_ref() is not None for receiver_ref, _ in self._get_snapshot(sender))
+
+    def is_suppressed(self):
+        return getattr(self._local, 'suppressed', 0) > 0
+
+    @contextmanager
+    def suppressed(self):
+        """Suppresses the signal in the current thread, for example, for batch operations."""
+        self._local.suppressed = getattr(self._local, 'suppressed', 0) + 1
+        try:
+            yield
+        finally:
+            self._local.suppressed -= 1
+
     def send(self, sender, *args, **kwargs):
+        if not self._receivers:  # Fast path without allocations
+            return NO_RESPONSES
+        if self.is_suppressed():
+            return NO_RESPONSES
         if sender is None:
             sender = undefined_sender
+        snapshot = self._get_snapshot(sender)
+        if not snapshot:
+            return NO_RESPONSES
         responses = []
-        if sender in self._receivers:
-            for receiver in self._receivers[sender].values():
-                responses.append((receiver, receiver(sender, *args, **kwargs)))
-        if sender is not undefined_sender:
-            responses += self.send(undefined_sender, *args, **kwargs)
+        for receiver_ref, is_global in snapshot:
+            receiver = receiver_ref()
+            if receiver is not None:
+                responses.append((receiver, receiver(undefined_sender if is_global else sender, *args, **kwargs)))
         return responses
 
 
@@ -81,3 +132,29 @@ post_init = Signal()
 class_prepared = Signal()
 field_mangling = Signal()
 column_mangling = Signal()
+
+
+@contextmanager
+def suppress(*signals):
+    """Suppresses the signals of model's lifecycle (or given signals) in the current thread.
+
+    Example of usage:
+    >>> with suppress():
+    ...     for row in rows:
+    ...         Model(**row).save()
+    """
+    if not signals:
+        signals = (pre_save, post_save, pre_delete, post_delete, pre_init, post_init)
+    with _suppressed(signals):
+        yield
+
+
+@contextmanager
+def _suppressed(signals):
+    """Enters Signal.suppressed() of each signal, like contextlib.ExitStack, which is absent in Python 2."""
+    if not signals:
+        yield
+        return
+    with signals[0].suppressed():
+        with _suppressed(signals[1:]):
+            yield
@@ -0,0 +1,47 @@
+import unittest
+
+from ascetic.databases.postgresql import CopyFromStream, CopyToStream
+
+
+class TestCopyStreams(unittest.TestCase):
+
+    def test_encode_row(self):
+        self.assertEqual(
+            CopyFromStream([]).encode_row((1, None, True, 'a\tb\\c\nd\r', b'\x00\xff', {'key': 'value'})),
+            '1\t\\N\tt\ta\\tb\\\\c\\nd\\r\t\\\\x00ff\t{"key": "value"}\n'
+        )
+
+    def test_round_trip(self):
+        rows = []
+        stream = CopyFromStream([(1, None, 'a\tb\\c\nd\r', b'ab', [1, 2]), ('\\N', '', False, 2.5, 'x')])
+        out = CopyToStream(rows.append)
+        out.write(stream.read(7))  # Split by chunks as COPY does
+        out.write(stream.read())
+        out.close()
+        self.assertEqual(rows, [
+            ('1', None, 'a\tb\\c\nd\r', '\\x6162', '[1, 2]'),
+            ('\\N', '', 'f', '2.5', 'x'),
+        ])
+
+    def test_casters(self):
+        rows = []
+        out = CopyToStream(rows.append, (lambda value, cursor: int(value), None))
+        out.write('1\t\\N\n2\ta\n')
+        self.assertEqual(rows, [(1, None), (2, 'a')])
+
+    def test_decode_chunks(self):
+        rows = []
+        data = u'1\t\u0418\u043c\u044f\n'.encode('cp1251') + u'2\t\u0416\n'.encode('cp1251')
+        out = CopyToStream(rows.append, encoding='cp1251')
+        for i in range(len(data)):
+            out.write(data[i:i + 1])
+        out.close()
+        self.assertEqual(rows, [('1', u'\u0418\u043c\u044f'), ('2', u'\u0416')])
+
+        rows = []
+        data = u'\u0418\u043c\u044f\n'.encode('utf-8')
+        out = CopyToStream(rows.append)
+        out.write(data[:1])  # Split inside of the first character
+        out.write(data[1:])
+        out.close()
+        self.assertEqual(rows, [(u'\u0418\u043c\u044f',)])
@@ -0,0 +1,41 @@
+import unittest
+
+from ascetic import instrumentation
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    maxDiff = None
+
+    def test_fingerprint(self):
+        self.assertEqual(
+            instrumentation.fingerprint(
+                'SELECT "t"."id" FROM "t" WHERE "t"."id" IN (%s, %s, %s) AND  "t"."name" = \'Ivan\' LIMIT 10'
+            ),
+            'SELECT "t"."id" FROM "t" WHERE "t"."id" IN (...) AND "t"."name" = ? LIMIT ?'
+        )
+        self.assertEqual(
+            instrumentation.fingerprint('SELECT "_auto_1"."id" FROM "t" AS "_auto_1" WHERE "_auto_1"."id" = ?'),
+            'SELECT "_auto_1"."id" FROM "t" AS "_auto_1" WHERE "_auto_1"."id" = ?'
+        )
+
+    def test_histogram(self):
+        histogram = instrumentation.Histogram(bounds=(0.01, 0.1))
+        for value in (0.001, 0.002, 0.05, 0.2):
+            histogram.add(value)
+        self.assertEqual(histogram.buckets, [2, 1, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.mean, 0.06325)
+        self.assertEqual(histogram.max, 0.2)
+        self.assertEqual(histogram.percentile(50), 0.01)
+        self.assertEqual(histogram.percentile(100), 0.2)
+
+    def test_query_stats(self):
+        stats = instrumentation.QueryStats()
+        stats(None, 'execute', instrumentation.ExecuteEvent('SELECT 1', (), 0.5, None, None))
+        stats(None, 'execute', instrumentation.ExecuteEvent('SELECT 2', (), 0.25, None, None))
+        stats(None, 'execute', instrumentation.ExecuteEvent('SELECT %s', (3,), 0.1, None, None))
+        [(fingerprint, histogram)] = stats.top(1)
+        self.assertEqual(fingerprint, 'SELECT ?')
+        self.assertEqual(histogram.count, 3)
+        self.assertAlmostEqual(histogram.total, 0.85)
@@ -3,8 +3,10 @@ import unittest
 
 from sqlbuilder import smartsql
 
-from ascetic import exceptions, validators
+from ascetic import exceptions, signals, validators
+from ascetic.aggregates import Count, Max
 from ascetic.databases import databases
+from ascetic.instrumentation import LazyLoadDetector, QueryLog
 from ascetic.mappers import Mapper, mapper_registry
 from ascetic.relations import ForeignKey
 
@@ -27,7 +29,7 @@ class TestMapper(unittest.TestCase):
             DROP TABLE IF EXISTS books CASCADE;
             CREATE TABLE books (
                 id serial NOT NULL PRIMARY KEY,
-                title VARCHAR(255),
+                title VARCHAR(255) DEFAULT 'Untitled',
                 author_id integer REFERENCES ascetic_tests_author(id) ON DELETE CASCADE
             );
          """,
@@ -43,7 +45,7 @@ class TestMapper(unittest.TestCase):
             DROP TABLE IF EXISTS books CASCADE;
             CREATE TABLE books (
                 id INT(11) NOT NULL auto_increment,
-                title VARCHAR(255),
+                title VARCHAR(255) DEFAULT 'Untitled',
                 author_id INT(11),
                 FOREIGN KEY (author_id) REFERENCES ascetic_tests_author(id),
                 PRIMARY KEY (id)
@@ -60,7 +62,7 @@ class TestMapper(unittest.TestCase):
             DROP TABLE IF EXISTS books;
             CREATE TABLE books (
               id INTEGER PRIMARY KEY AUTOINCREMENT,
-              title VARCHAR(255),
+              title VARCHAR(255) DEFAULT 'Untitled',
               author_id INT(11),
               FOREIGN KEY (author_id) REFERENCES ascetic_tests_author(id)
             );
@@ -201,6 +203,87 @@ class TestMapper(unittest.TestCase):
         self.assertEqual(author_mapper.query.count(), 3)
         self.assertEqual(len(book_mapper.query.clone()), 4)
         self.assertEqual(len(book_mapper.query.clone()[1:4]), 3)
+        self.assertEqual(book_mapper.query.order_by(book_mapper.sql_table.title).count(), 4)
+        self.assertEqual(book_mapper.query.order_by(book_mapper.sql_table.title)[:2].count(), 2)
+
+    def test_iterator(self):
+        db = databases['default']
+        book_mapper = mapper_registry[Book]
+        q = book_mapper.query.order_by(book_mapper.sql_table.id)
+        ids = [obj.id for obj in q.clone()]
+
+        if db.supports_server_side_cursors:
+            fetched = []
+            cursor = db.cursor
+
+            class Cursor(object):
+                def __init__(self, cursor):
+                    self._cursor = cursor
+
+                def fetchmany(self, size):
+                    rows = self._cursor.fetchmany(size)
+                    fetched.append(len(rows))
+                    return rows
+
+                def __getattr__(self, name):
+                    return getattr(self._cursor, name)
+
+            db.cursor = lambda server_side=False: Cursor(cursor(server_side))
+            try:
+                objs = q.clone().iterator(chunk_size=3)
+                next(objs)
+                self.assertEqual(fetched, [3])  # Only the first chunk is fetched
+                self.assertEqual([ids[0]] + [obj.id for obj in objs], ids)
+            finally:
+                del db.cursor
+
+        db.supports_server_side_cursors = False
+        try:
+            with QueryLog(db) as queries:
+                objs = q.clone().iterator(chunk_size=3)
+                next(objs)
+                self.assertEqual(len(queries), 1)
+                self.assertEqual([ids[0]] + [obj.id for obj in objs], ids)
+                self.assertEqual(len(queries), 2)  # Slices of LIMIT 3
+        finally:
+            del db.supports_server_side_cursors
+
+    def test_exists(self):
+        author_mapper = mapper_registry[Author]
+        self.assertTrue(author_mapper.query.exists())
+        self.assertTrue(author_mapper.query.where(author_mapper.sql_table.first_name == 'Kurt'))
+        self.assertFalse(author_mapper.query.where(author_mapper.sql_table.first_name == 'Nobody').exists())
+        self.assertFalse(author_mapper.query.where(author_mapper.sql_table.first_name == 'Nobody'))
+
+        db = databases['default']
+        q = author_mapper.query
+        with QueryLog(db) as queries:
+            self.assertTrue(q)
+            self.assertNotIn('first_name', queries[0])  # Objects are not loaded
+            list(q)
+            del queries[:]
+            self.assertTrue(q)
+            self.assertEqual(queries, [])  # The filled cache is used
+
+    def test_aggregate(self):
+        book_mapper = mapper_registry[Book]
+        tom = self.data['tom']
+
+        self.assertDictEqual(
+            book_mapper.query.where(book_mapper.sql_table.author_id == tom.id).aggregate(Count(), last=Max('id')),
+            {'all__count': 2, 'last': self.data['slww'].id}
+        )
+        self.assertDictEqual(
+            book_mapper.query.aggregate(authors=Count('author__last_name', distinct=True)),
+            {'authors': 3}
+        )
+        self.assertDictEqual(book_mapper.query.order_by(book_mapper.sql_table.id)[:2].aggregate(Count()),
+                             {'all__count': 2})
+        self.assertListEqual(
+            list(book_mapper.query.group_by('author_id').annotate(Count()).order_by(book_mapper.sql_table.author_id)),
+            [{'author_id': self.data[name].id, 'all__count': count} for name, count in
+             (('james', 1), ('kurt', 1), ('tom', 2))]
+        )
 
     def test_delete(self):
         author_mapper, book_mapper = mapper_registry[Author], mapper_registry[Book]
@@ -210,6 +293,129 @@ class TestMapper(unittest.TestCase):
         self.assertEqual(author_mapper.query.count(), 2)
         self.assertEqual(len(book_mapper.query.clone()), 3)
 
+    def test_delete_signals(self):
+        author_mapper = mapper_registry[Author]
+        tom = self.data['tom']
+        deleted = []
+
+        def receiver(sender, instance, db):
+            deleted.append(instance.title)
+
+        signals.pre_delete.connect(receiver, sender=Book)
+        try:
+            self.assertTrue(author_mapper.delete(tom))
+        finally:
+            signals.pre_delete.disconnect(receiver, sender=Book)
+        self.assertListEqual(sorted(deleted), ['Jitterbug Perfume', 'Still Life with Woodpecker'])
+        self.assertFalse(author_mapper.query.where(author_mapper.sql_table.id == tom.id).exists())
+
+    def test_query_delete(self):
+        author_mapper, book_mapper = mapper_registry[Author], mapper_registry[Book]
+        tom = self.data['tom']
+
+        self.assertEqual(author_mapper.query.where(author_mapper.sql_table.id == tom.id).delete(), 1)
+        self.assertEqual(author_mapper.query.count(), 2)
+        self.assertEqual(book_mapper.query.count(), 2)
+        self.assertFalse(book_mapper.query.where(book_mapper.sql_table.author_id == tom.id).exists())
+
+        self.assertEqual(book_mapper.query.order_by(book_mapper.sql_table.id)[:1].delete(), 1)
+        self.assertEqual(book_mapper.query.count(), 1)
+
+    def test_query_update(self):
+        book_mapper = mapper_registry[Book]
+        t = book_mapper.sql_table
+        tom = self.data['tom']
+
+        self.assertEqual(book_mapper.query.where(t.author_id == tom.id).update(title='Untitled'), 2)
+        self.assertListEqual([i.title for i in book_mapper.query.where(t.author_id == tom.id)],
+                             ['Untitled', 'Untitled'])
+        self.assertEqual(book_mapper.query.where(t.title == 'Untitled').update({t.author_id: None}), 2)
+        self.assertEqual(book_mapper.query.where(t.author_id == tom.id).count(), 0)
+
+    def test_upsert(self):
+        author_mapper = mapper_registry[Author]
+        kurt = self.data['kurt']
+
+        kurt_copy = Author(id=kurt.id, first_name='Kurt', last_name='Vonnegut, Jr.', bio='American writer')
+        ray = Author(id=kurt.id + 100, first_name='Ray', last_name='Bradbury')
+        self.assertListEqual(author_mapper.upsert([kurt_copy, ray], update_fields=('bio',)),
+                             [kurt.id, kurt.id + 100])
+        self.assertEqual(kurt_copy.last_name, 'Vonnegut')  # Values which are not updated are reloaded
+        self.assertFalse(author_mapper.is_new(ray))
+        self.assertEqual(ray.bio, 'No bio available')
+
+        kurt = author_mapper.get(kurt.id)
+        self.assertEqual((kurt.last_name, kurt.bio), ('Vonnegut', 'American writer'))
+        self.assertEqual(author_mapper.get(ray.id).first_name, 'Ray')
+
+    def test_upsert_identity_map(self):
+        db = databases['default']
+        author_mapper = mapper_registry[Author]
+        db.identity_map.enable()
+        try:
+            kurt = author_mapper.get(self.data['kurt'].id)
+            kurt_copy = Author(id=kurt.id, first_name='Kurt', last_name='Vonnegut, Jr.', bio='American writer')
+            ray = Author(id=kurt.id + 100, first_name='Ray', last_name='Bradbury')
+            author_mapper.upsert([kurt_copy, ray], update_fields=('bio',))
+            self.assertEqual((kurt_copy.last_name, kurt_copy.bio), ('Vonnegut', 'American writer'))
+            self.assertIs(author_mapper.get(kurt.id), kurt_copy)  # Identity map has the actual state of row
+            self.assertIs(author_mapper.get(ray.id), ray)
+            self.assertFalse(author_mapper.get_changed(ray))
+        finally:
+            db.identity_map.disable()
+
+    def test_identity_map_sync(self):
+        author_mapper = mapper_registry[Author]
+        db = databases['default']
+        db.identity_map.enable()
+        try:
+            author = author_mapper.get(self.data['tom'].id)
+            self.assertRaises(exceptions.ObjectDoesNotExist, author_mapper.get, -1)  # Nonexistent object is cached
+            with db.transaction:
+                db.execute('UPDATE ascetic_tests_author SET last_name = %s WHERE id = %s', ['New last name', author.id])
+            self.assertEqual(author.last_name, 'New last name')  # Alive objects are reloaded on commit
+            self.assertFalse(author_mapper.get_changed(author))
+        finally:
+            db.identity_map.clear()
+            db.identity_map.disable()
+
+    def test_returning(self):
+        author_mapper = mapper_registry[Author]
+        db = databases['default']
+        if not db.supports_returning:
+            self.skipTest('RETURNING is not supported by {0}'.format(db.engine))
+
+        with QueryLog(db) as queries:
+            a = Author(first_name='Ray', last_name='Bradbury')
+            author_mapper.save(a)
+            self.assertIsNotNone(a.id)
+            self.assertEqual(len(queries), 1)
+            self.assertIn('RETURNING', queries[0])
+            self.assertEqual(author_mapper.get(a.id).last_name, 'Bradbury')
+
+        book_mapper = mapper_registry[Book]
+        book = Book()
+        book_mapper.save(book)
+        self.assertEqual(book.title, 'Untitled')  # Field which value is None gets DB default
+
+        book.author_id = self.data['tom'].id
+        with QueryLog(db) as queries:
+            book_mapper.save(book)
+            self.assertNotIn('RETURNING', queries[0])  # Values set by DB are already known
+
+        book_mapper.fields['title'].db_generated = True  # Like a column maintained by trigger
+        try:
+            db.execute('UPDATE books SET title = %s WHERE id = %s', ['Set by trigger', book.id])
+            book.author_id = self.data['kurt'].id
+            with QueryLog(db) as queries:
+                book_mapper.save(book)
+                self.assertEqual(len(queries), 1)
+                self.assertIn('RETURNING', queries[0])
+            self.assertEqual(book.title, 'Set by trigger')
+            self.assertEqual(book_mapper.get_changed(book), frozenset())
+        finally:
+            del book_mapper.fields['title'].db_generated
+
     def test_validation(self):
         author_mapper = mapper_registry[Author]
 
@@ -301,3 +507,53 @@ class TestMapper(unittest.TestCase):
             self.assertEqual(len(obj._cache['books']._cache), len(obj.books))
             for i in obj._cache['books']._cache:
                 self.assertEqual(i._cache['author'], obj)
+
+    def test_copy(self):
+        db = databases['default']
+        if db.engine != 'postgresql':
+            self.skipTest('COPY is supported only by PostgreSQL')
+        author_mapper = mapper_registry[Author]
+
+        author_mapper.copy_from([
+            Author(first_name='Bill', last_name='Ted'),
+            {'first_name': 'Jo', 'last_name': 'Nesbo'},
+        ])
+        self.assertEqual(author_mapper.query.count(), 5)
+
+        objs = []
+        author_mapper.query.where(author_mapper.sql_table.first_name == 'Jo').copy_to(objs.append)
+        self.assertEqual(len(objs), 1)
+        self.assertIsInstance(objs[0], Author)
+        self.assertIsInstance(objs[0].id, int)
+        self.assertEqual(objs[0].last_name, 'Nesbo')
+        self.assertIsNone(objs[0].bio)
+
+    def test_executemany(self):
+        db = databases['default']
+        author_mapper = mapper_registry[Author]
+        t = author_mapper.sql_table
+
+        db.executemany(
+            smartsql.Insert(table=t, fields=(t.first_name, t.last_name), values=(('', ''),)),
+            [('Bill', 'Ted'), ('Jo', 'Nesbo')]
+        )
+        self.assertEqual(author_mapper.query.count(), 5)
+        self.assertEqual(author_mapper.get(first_name='Jo').last_name, 'Nesbo')
+
+        rows = iter([('Bill', 'Ted'), (None, 'Nesbo')])  # The second row violates NOT NULL constraint
+        with self.assertRaises(Exception):  # It's not retried with partially consumed iterator
+            db.executemany(
+                smartsql.Insert(table=t, fields=(t.first_name, t.last_name), values=(('', ''),)), rows
+            )
+
+    def test_lazy_load_detector(self):
+        book_mapper = mapper_registry[Book]
+
+        with LazyLoadDetector(threshold=1, raise_error=True) as detector:
+            for obj in book_mapper.query.prefetch('author'):
+                self.assertIsNotNone(obj.author)
+            self.assertFalse(detector.lazy_loads)
+
+            with self.assertRaises(exceptions.NPlusOneError):
+                for obj in book_mapper.query.order_by(book_mapper.sql_table.id):
+                    self.assertIsNotNone(obj.author)
@@ -1,11 +1,12 @@
 import unittest
 
-from ascetic import validators
+from ascetic import signals, validators
 from ascetic.databases import databases
-from ascetic.models import Model
+from ascetic.mappers import NOT_CHANGED
+from ascetic.models import Model, CompactModel
 from ascetic.relations import ForeignKey
 
-Author = Book = None
+Author = Book = CompactAuthor = CompactBook = None
 
 
 class TestCompositeRelation(unittest.TestCase):
@@ -92,6 +93,19 @@ class TestCompositeRelation(unittest.TestCase):
             class Mapper(object):
                 db_table = 'ascetic_composite_book'
 
+        class CompactAuthor(CompactModel):
+
+            class Mapper(object):
+                db_table = 'ascetic_composite_author'
+
+        class CompactBook(CompactModel):
+            author = ForeignKey(
+                CompactAuthor, related_field=('id', 'lang'), field=('author_id', 'lang'), related_name='books'
+            )
+
+            class Mapper(object):
+                db_table = 'ascetic_composite_book'
+
         return locals()
 
     @classmethod
@@ -120,6 +134,10 @@ class TestCompositeRelation(unittest.TestCase):
         author_pk = (1, 'en')
         author = Author.get(author_pk)
         self.assertEqual(author.pk, author_pk)
+        self.assertIs(author._changed, NOT_CHANGED)  # Loaded object doesn't keep own set until the first write
+        author.last_name = 'Last name'
+        self.assertEqual(author._changed, {'last_name'})
+        self.assertEqual(Author._mapper.get_changed(author), frozenset())
 
         book = Book(
             id=5,
@@ -135,3 +153,93 @@ class TestCompositeRelation(unittest.TestCase):
 
         author = Author.get(author_pk)
         self.assertEqual(author.books[0].pk, book_pk)
+
+    def test_compact_model(self):
+        author = CompactAuthor(id=1, lang='en', first_name='First name', last_name='Last name')
+        self.assertIsInstance(author, CompactAuthor)
+        self.assertFalse(hasattr(author, '__dict__'))
+        self.assertIsNone(author.bio)
+        self.assertIn('first_name', dir(author))
+        author.save()
+        author_pk = (1, 'en')
+        author = CompactAuthor.get(author_pk)
+        self.assertEqual(author.pk, author_pk)
+        self.assertEqual(author.first_name, 'First name')
+        self.assertEqual(CompactAuthor._mapper.get_changed(author), frozenset())
+        author.last_name = 'New last name'
+        self.assertEqual(CompactAuthor._mapper.get_changed(author), frozenset(['last_name']))
+        author.save()
+
+        book = CompactBook(id=5, lang='en', title='Book title', author=author)
+        book.save()
+        book = CompactBook.get((5, 'en'))
+        self.assertEqual(book.author.pk, author_pk)
+        self.assertEqual(book.author.last_name, 'New last name')
+        self.assertEqual(CompactAuthor.get(author_pk).books[0].pk, (5, 'en'))
+
+    def test_deferred_fields(self):
+        for i in range(1, 4):
+            Author(id=i, lang='en', first_name='First name {}'.format(i), last_name='Last name', bio='Bio').save()
+        authors = list(Author.q.only('first_name').order_by(Author.s.id))
+        self.assertEqual(Author._mapper.get_deferred(authors[0]), frozenset(['last_name', 'bio']))
+        self.assertEqual(Author._mapper.get_changed(authors[0]), frozenset())
+        authors[1].bio = 'New bio'
+        self.assertEqual(authors[0].last_name, 'Last name')  # loads deferred fields of all siblings
+        self.assertEqual(Author._mapper.get_deferred(authors[2]), frozenset())
+        self.assertIs(authors[2]._changed, NOT_CHANGED)
+        self.assertEqual(authors[2].bio, 'Bio')
+        self.assertEqual(authors[1].bio, 'New bio')
+        self.assertEqual(Author._mapper.get_changed(authors[1]), frozenset(['bio']))
+        authors[1].save()
+        self.assertEqual(Author.get((2, 'en')).bio, 'New bio')
+
+        author = list(Author.q.defer('bio').order_by(Author.s.id))[0]
+        author.first_name = 'New first name'
+        author.save()
+        self.assertEqual(Author._mapper.get_deferred(author), frozenset(['bio']))
+        self.assertEqual(Author.get((1, 'en')).first_name, 'New first name')
+
+    def test_deferred_fields_chunks(self):
+        db = databases['default']
+        count = 600  # More than chunk of DeferredLoader
+        db.executemany('INSERT INTO {0} (id, lang, first_name, last_name, bio) VALUES (%s, %s, %s, %s, %s)'.format(
+            db.qn('ascetic_composite_author')
+        ), [(i, 'en', 'First name', 'Last name', 'Bio {0}'.format(i)) for i in range(1, count + 1)])
+        authors = list(Author.q.only('first_name').order_by(Author.s.id))
+        self.assertEqual(len(authors), count)
+        self.assertEqual(authors[0].bio, 'Bio 1')  # Composite keys of all siblings are selected by row value IN
+        self.assertEqual(authors[-1].bio, 'Bio {0}'.format(count))
+
+    def test_upsert_composite_key(self):
+        count = 600  # More than chunk of upsert()
+        Author(id=1, lang='en', first_name='First name', last_name='Last name').save()
+        authors = [Author(id=i, lang='en', first_name='New first name', last_name='Last name', bio='Bio')
+                   for i in range(1, count + 1)]
+        Author._mapper.upsert(authors, update_fields=('bio',))
+        self.assertEqual(authors[0].first_name, 'First name')  # Values which are not updated are reloaded
+        self.assertEqual(Author.get((1, 'en')).bio, 'Bio')
+        self.assertEqual(Author.q.count(), count)
+
+    def test_query_update_signals(self):
+        count = 600  # More than chunk of reloading
+        for i in range(1, count + 1):
+            Author(id=i, lang='en', first_name='First name', last_name='Last name').save()
+        pre_saved, post_saved = [], []
+
+        def pre_save_receiver(sender, instance, db):
+            pre_saved.append(instance)
+
+        def post_save_receiver(sender, instance, created, db):
+            post_saved.append(instance)
+
+        signals.pre_save.connect(pre_save_receiver, sender=Author)
+        signals.post_save.connect(post_save_receiver, sender=Author)
+        try:
+            self.assertEqual(Author.q.update(bio='New bio', signals=True), count)
+        finally:
+            signals.pre_save.disconnect(pre_save_receiver, sender=Author)
+            signals.post_save.disconnect(post_save_receiver, sender=Author)
+        self.assertEqual(len(post_saved), count)
+        self.assertTrue(all(a is b for a, b in zip(pre_saved, post_saved)))  # Instances are refreshed in place
+        self.assertEqual(set(author.bio for author in post_saved), {'New bio'})
+        self.assertEqual(Author._mapper.get_changed(post_saved[0]), frozenset())
@@ -0,0 +1,59 @@
+import unittest
+
+from ascetic import signals
+
+
+class Sender(object):
+    pass
+
+
+class TestSignals(unittest.TestCase):
+
+    maxDiff = None
+
+    def test_send(self):
+        signal = signals.Signal()
+        calls = []
+
+        def receiver(sender, **kwargs):
+            calls.append((sender, kwargs))
+            return 'response'
+
+        self.assertEqual(signal.send(Sender, value=1), ())
+        self.assertFalse(signal.has_receivers(Sender))
+
+        signal.connect(receiver, sender=Sender)
+        self.assertTrue(signal.has_receivers(Sender))
+        self.assertEqual(signal.send(Sender, value=2), [(receiver, 'response')])
+        self.assertEqual(calls, [(Sender, {'value': 2})])
+
+        signal.disconnect(receiver, sender=Sender)
+        self.assertFalse(signal.has_receivers(Sender))
+        self.assertEqual(signal.send(Sender, value=3), ())
+        self.assertEqual(len(calls), 1)
+
+    def test_suppress(self):
+        signal = signals.Signal()
+        calls = []
+
+        def receiver(sender, **kwargs):
+            calls.append(sender)
+
+        signal.connect(receiver)
+        with signal.suppressed():
+            signal.send(Sender)
+        self.assertEqual(calls, [])
+        with signals.suppress(signal):
+            signal.send(Sender)
+        self.assertEqual(calls, [])
+        signal.send(Sender)
+        self.assertEqual(len(calls), 1)
+
+        other = signals.Signal()
+        try:
+            with signals.suppress(signal, other):
+                self.assertTrue(signal.is_suppressed() and other.is_suppressed())
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertFalse(signal.is_suppressed() or other.is_suppressed())
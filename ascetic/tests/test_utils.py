@@ -10,3 +10,18 @@ class TestUtils(unittest.TestCase):
     def test_resolve(self):
         from ascetic.databases import Database
         self.assertTrue(utils.resolve('ascetic.databases.Database') is Database)
+
+    def test_snapshot(self):
+        snapshot = utils.Snapshot({'id': 1, 'title': 'Title'})
+        self.assertEqual(dict(snapshot), {'id': 1, 'title': 'Title'})
+        self.assertEqual(len(snapshot), 2)
+        self.assertIn('title', snapshot)
+        self.assertNotIn('author_id', snapshot)
+        other = utils.Snapshot({'id': 2, 'title': 'Other title'})
+        self.assertIs(snapshot._index, other._index)
+
+        snapshot.update(title='New title', author_id=3)
+        self.assertEqual(dict(snapshot), {'id': 1, 'title': 'New title', 'author_id': 3})
+        self.assertEqual(len(snapshot), 3)
+        self.assertEqual(snapshot._values, (1, 'Title'))
+        self.assertEqual(dict(other), {'id': 2, 'title': 'Other title'})
@@ -2,6 +2,11 @@ from __future__ import absolute_import
 import sys
 import collections
 
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
 try:
     str = unicode  # Python 2.* compatible
     string_types = (basestring,)
@@ -117,3 +122,56 @@ class SpecialMappingAccessor(object):
             self.update(obj, **data)
         else:
             return self.get(obj)
+
+
+class Snapshot(Mapping):
+    """Read-only mapping of values stored in a tuple.
+
+    The index of names is shared between all snapshots with the same names (i.e. rows of the same query),
+    so, each snapshot keeps only a tuple of values instead of a dict.
+    Values are copied from the given mapping once, since loaded row is already mapped to field names,
+    and the cursor row is not shared. Updates are stored separately and don't copy the tuple.
+    """
+    __slots__ = ('_index', '_values', '_updated')
+    _indexes = {}
+
+    def __init__(self, data):
+        names = tuple(data)
+        try:
+            index = self._indexes[names]
+        except KeyError:
+            if len(self._indexes) > 1000:
+                self._indexes.clear()
+            index = self._indexes[names] = {name: i for i, name in enumerate(names)}
+        self._index = index
+        self._values = tuple(data[name] for name in names)
+        self._updated = None
+
+    def __getitem__(self, key):
+        if self._updated is not None and key in self._updated:
+            return self._updated[key]
+        return self._values[self._index[key]]
+
+    def __contains__(self, key):
+        return key in self._index or (self._updated is not None and key in self._updated)
+
+    def __iter__(self):
+        for name in self._index:
+            yield name
+        if self._updated is not None:
+            for name in self._updated:
+                if name not in self._index:
+                    yield name
+
+    def __len__(self):
+        if self._updated is None:
+            return len(self._index)
+        return len(self._index) + sum(1 for name in self._updated if name not in self._index)
+
+    def update(self, *args, **kwargs):
+        if self._updated is None:
+            self._updated = {}
+        self._updated.update(*args, **kwargs)
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(self.__class__.__name__, dict(self))
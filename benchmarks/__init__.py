@@ -0,0 +1,27 @@
+"""Benchmarks of the hot paths of ORM.
+
+Benchmarks run against in-process SQLite database, so they don't need any server.
+Run them from the root of repository::
+
+    python -m benchmarks                        # run all and compare with baselines
+    python -m benchmarks bench_mappers          # run only given modules
+    python -m benchmarks --save                 # add results of new benchmarks to baselines
+    python -m benchmarks --resave               # overwrite baselines by current results
+
+Baselines are stored in benchmarks/baselines/<module>.json. Timings depend on the machine,
+so, update baselines by the same machine before and after your change.
+Re-save all baselines only when the way of measurement changes, otherwise
+changes of timings of other benchmarks are hidden in the diff.
+"""
+from ascetic import settings
+
+settings.configure({
+    'DATABASES': {
+        'default': {
+            'engine': "sqlite3",
+            'database': ":memory:",
+            'initial_sql': "",
+        }
+    },
+    'DEBUG': False,
+})
@@ -0,0 +1,43 @@
+from ascetic.databases import databases
+
+
+class Benchmark(object):
+    """Base class of benchmarks, the API is similar to asv.
+
+    Each method with name "time_*" is a benchmark. If params is not empty,
+    the benchmark runs once per value of params, and the value is passed to setup(),
+    teardown() and to the benchmark method.
+    """
+    params = ()
+    repeat = 5
+    number = None  # Calls per repeat, it's calibrated by runner if None
+
+    def setup(self, *params):
+        pass
+
+    def teardown(self, *params):
+        pass
+
+
+def get_db():
+    return databases['default']
+
+
+def create_tables(sql):
+    get_db().cursor().executescript(sql)
+
+
+def insert_rows(table, columns, rows):
+    db = get_db()
+    db.executemany('INSERT INTO {0} ({1}) VALUES ({2})'.format(
+        db.qn(table),
+        ', '.join(db.qn(column) for column in columns),
+        ', '.join(['%s'] * len(columns))
+    ), rows)
+
+
+def truncate_tables(*tables):
+    db = get_db()
+    for table in tables:
+        db.execute('DELETE FROM {0}'.format(db.qn(table)))
+    db.identity_map.clear()
@@ -0,0 +1,34 @@
+from ascetic.identity_maps import CacheLru
+from benchmarks.base import Benchmark
+
+
+class Value(object):
+    pass
+
+
+class CacheLruChurn(Benchmark):
+    """Adding to the full cache, and touching of the oldest (the worst case) and the newest values."""
+    params = (100, 1000)
+
+    def setup(self, size):
+        self.cache = CacheLru(size)
+        self.values = [Value() for i in range(size)]
+        for value in self.values:
+            self.cache.add(value)
+        self.extra_values = [Value() for i in range(size)]
+
+    def time_add(self, size):
+        add = self.cache.add
+        for value in self.extra_values:
+            add(value)
+
+    def time_touch_oldest(self, size):
+        touch = self.cache.touch
+        for value in self.values:
+            touch(value)
+
+    def time_touch_newest(self, size):
+        touch = self.cache.touch
+        value = self.values[-1]
+        for i in range(size):
+            touch(value)
@@ -0,0 +1,152 @@
+from ascetic.mappers import Mapper, mapper_registry
+from ascetic.relations import ForeignKey
+from benchmarks.base import Benchmark, get_db, create_tables, insert_rows, truncate_tables
+
+create_tables("""
+    CREATE TABLE bench_author (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name VARCHAR(40) NOT NULL,
+        last_name VARCHAR(40) NOT NULL,
+        bio TEXT
+    );
+    CREATE TABLE bench_book (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title VARCHAR(255),
+        author_id INTEGER REFERENCES bench_author(id)
+    );
+""")
+
+
+class Author(object):
+    def __init__(self, id=None, first_name=None, last_name=None, bio=None):
+        self.id = id
+        self.first_name = first_name
+        self.last_name = last_name
+        self.bio = bio
+
+
+class AuthorMapper(Mapper):
+    db_table = 'bench_author'
+    defaults = {'bio': 'No bio available'}
+
+AuthorMapper(Author)
+
+
+class Book(object):
+    def __init__(self, id=None, title=None, author_id=None):
+        self.id = id
+        self.title = title
+        self.author_id = author_id
+
+
+class BookMapper(Mapper):
+    db_table = 'bench_book'
+    relationships = {
+        'author': ForeignKey(Author, related_name='books')
+    }
+
+BookMapper(Book)
+
+
+def populate(authors, books_per_author=0):
+    truncate_tables('bench_book', 'bench_author')
+    insert_rows('bench_author', ('id', 'first_name', 'last_name', 'bio'), [
+        (i, 'First name {0}'.format(i), 'Last name {0}'.format(i), 'Bio {0}'.format(i))
+        for i in range(1, authors + 1)
+    ])
+    insert_rows('bench_book', ('id', 'title', 'author_id'), [
+        (i * books_per_author + j + 1, 'Title {0}'.format(j), i + 1)
+        for i in range(authors) for j in range(books_per_author)
+    ])
+
+
+class Load(Benchmark):
+    """Hydration of objects from rows, without identity map."""
+
+    def setup(self):
+        populate(100)
+        db = get_db()
+        cursor = db.execute(mapper_registry[Author].query)
+        fields = tuple(f[0] for f in cursor.description)
+        self.rows = [tuple(zip(fields, row)) for row in cursor.fetchall()]
+        db.identity_map.disable()
+
+    def teardown(self):
+        get_db().identity_map.enable()
+
+    def time_load(self):
+        author_mapper, db = mapper_registry[Author], get_db()
+        for row in self.rows:
+            author_mapper.load(row, db)
+
+
+class Iterator(Benchmark):
+    params = (10, 100, 1000)
+
+    def setup(self, rows):
+        populate(rows)
+        get_db().identity_map.disable()
+
+    def teardown(self, rows):
+        get_db().identity_map.enable()
+
+    def time_iterator(self, rows):
+        for obj in mapper_registry[Author].query.iterator():
+            pass
+
+    def time_list(self, rows):
+        list(mapper_registry[Author].query)
+
+
+class Get(Benchmark):
+
+    def setup(self):
+        populate(10)
+        self.author = mapper_registry[Author].get(1)  # Keep it alive in identity map
+
+    def time_get_hit(self):
+        mapper_registry[Author].get(1)
+
+    def time_get_miss(self):
+        get_db().identity_map.clear()
+        mapper_registry[Author].get(2)
+
+
+class Save(Benchmark):
+
+    def setup(self):
+        populate(1)
+        self.author = mapper_registry[Author].get(1)
+        self.counter = 0
+
+    def time_insert(self):
+        mapper_registry[Author].save(Author(first_name='First name', last_name='Last name'))
+
+    def time_update(self):
+        self.counter += 1
+        self.author.last_name = 'Last name {0}'.format(self.counter)
+        mapper_registry[Author].save(self.author)
+
+    def time_insert_delete(self):
+        author_mapper = mapper_registry[Author]
+        author = Author(first_name='First name', last_name='Last name')
+        author_mapper.save(author)
+        author_mapper.delete(author)
+
+
+class Prefetch(Benchmark):
+    """Prefetch of relations of 10 authors by several fan-outs (books per author)."""
+    params = (1, 5, 20)
+
+    def setup(self, fan_out):
+        populate(10, fan_out)
+        get_db().identity_map.disable()
+
+    def teardown(self, fan_out):
+        get_db().identity_map.enable()
+
+    def time_prefetch_one_to_many(self, fan_out):
+        list(mapper_registry[Author].query.prefetch('books'))
+
+    def time_prefetch_foreign_key(self, fan_out):
+        list(mapper_registry[Book].query.prefetch('author'))
@@ -0,0 +1,127 @@
+from ascetic.contrib.polymorphic import PolymorphicMapper
+from ascetic.mappers import Mapper, mapper_registry
+from benchmarks.base import Benchmark, get_db, create_tables, insert_rows, truncate_tables
+
+create_tables("""
+    CREATE TABLE bench_polymorphic_book (
+        id INTEGER PRIMARY KEY,
+        title VARCHAR(255),
+        polymorphic_type_id VARCHAR(255)
+    );
+    CREATE TABLE bench_polymorphic_nonfiction (
+        nonfiction_ptr_id INTEGER PRIMARY KEY REFERENCES bench_polymorphic_book (id) ON DELETE CASCADE,
+        branch VARCHAR(255)
+    );
+    CREATE TABLE bench_polymorphic_avia (
+        avia_ptr_id INTEGER PRIMARY KEY REFERENCES bench_polymorphic_nonfiction (nonfiction_ptr_id) ON DELETE CASCADE,
+        model VARCHAR(255)
+    );
+""")
+
+
+class Book(object):
+    def __init__(self, id=None, polymorphic_type_id=None, title=None):
+        self.id = id
+        self.polymorphic_type_id = polymorphic_type_id
+        self.title = title
+
+
+class BookMapper(PolymorphicMapper, Mapper):
+    name = 'benchmarks.bench_polymorphic.Book'
+    db_table = 'bench_polymorphic_book'
+    polymorphic = True
+
+BookMapper(Book)
+
+
+class Nonfiction(Book):
+    def __init__(self, nonfiction_ptr_id=None, branch=None, **kwargs):
+        super(Nonfiction, self).__init__(**kwargs)
+        self.nonfiction_ptr_id = nonfiction_ptr_id
+        self.branch = branch
+
+
+class NonfictionMapper(PolymorphicMapper, Mapper):
+    name = 'benchmarks.bench_polymorphic.Nonfiction'
+    db_table = 'bench_polymorphic_nonfiction'
+    pk = 'nonfiction_ptr_id'
+    polymorphic = True
+
+NonfictionMapper(Nonfiction)
+
+
+class Avia(Nonfiction):
+    def __init__(self, avia_ptr_id=None, model=None, **kwargs):
+        super(Avia, self).__init__(**kwargs)
+        self.avia_ptr_id = avia_ptr_id
+        self.model = model
+
+
+class AviaMapper(PolymorphicMapper, Mapper):
+    name = 'benchmarks.bench_polymorphic.Avia'
+    db_table = 'bench_polymorphic_avia'
+    pk = 'avia_ptr_id'
+    polymorphic = True
+
+AviaMapper(Avia)
+
+
+def populate(objects_per_type):
+    """Creates objects of each type of the hierarchy."""
+    truncate_tables('bench_polymorphic_avia', 'bench_polymorphic_nonfiction', 'bench_polymorphic_book')
+    books, nonfictions, avias = [], [], []
+    for i in range(objects_per_type * 3):
+        pk = i + 1
+        model = (Book, Nonfiction, Avia)[i % 3]
+        books.append((pk, 'Title {0}'.format(pk), mapper_registry[model].name))
+        if model in (Nonfiction, Avia):
+            nonfictions.append((pk, 'Branch {0}'.format(pk)))
+        if model is Avia:
+            avias.append((pk, 'Model {0}'.format(pk)))
+    insert_rows('bench_polymorphic_book', ('id', 'title', 'polymorphic_type_id'), books)
+    insert_rows('bench_polymorphic_nonfiction', ('nonfiction_ptr_id', 'branch'), nonfictions)
+    insert_rows('bench_polymorphic_avia', ('avia_ptr_id', 'model'), avias)
+
+
+class PolymorphicLoad(Benchmark):
+    params = (10, 100)
+
+    def setup(self, objects_per_type):
+        populate(objects_per_type)
+        get_db().identity_map.disable()
+
+    def teardown(self, objects_per_type):
+        get_db().identity_map.enable()
+
+    def time_polymorphic(self, objects_per_type):
+        book_mapper = mapper_registry[Book]
+        list(book_mapper.query.order_by(book_mapper.sql_table.pk))
+
+    def time_polymorphic_eager(self, objects_per_type):
+        book_mapper = mapper_registry[Book]
+        list(book_mapper.query.order_by(book_mapper.sql_table.pk).polymorphic(eager=True))
+
+    def time_polymorphic_iterator(self, objects_per_type):
+        book_mapper = mapper_registry[Book]
+        for obj in book_mapper.query.order_by(book_mapper.sql_table.pk).iterator(chunk_size=100):
+            pass
+
+    def time_not_polymorphic(self, objects_per_type):
+        book_mapper = mapper_registry[Book]
+        list(book_mapper.query.order_by(book_mapper.sql_table.pk).polymorphic(False))
+
+    def time_derived(self, objects_per_type):
+        avia_mapper = mapper_registry[Avia]
+        list(avia_mapper.query.order_by(avia_mapper.sql_table.pk))
+
+
+class PolymorphicSave(Benchmark):
+
+    def setup(self):
+        populate(0)
+
+    def time_insert(self):
+        mapper_registry[Avia].save(Avia(title='Title', branch='Branch', model='Model'))
+
+    def time_bulk_insert_100(self):
+        mapper_registry[Avia].bulk_insert([Avia(title='Title', branch='Branch', model='Model') for i in range(100)])
@@ -0,0 +1,28 @@
+from ascetic.mappers import mapper_registry
+from benchmarks.base import Benchmark, get_db
+from benchmarks.bench_mappers import Author, Book
+
+
+class GetField(Benchmark):
+    """Resolution of field names by Table.get_field()."""
+
+    def time_column(self):
+        mapper_registry[Author].sql_table.get_field('last_name')
+
+    def time_composite(self):
+        mapper_registry[Author].sql_table.get_field(('first_name', 'last_name'))
+
+    def time_relation(self):
+        mapper_registry[Book].sql_table.get_field('author')
+
+    def time_relation_path(self):
+        mapper_registry[Book].sql_table.get_field('author__last_name')
+
+
+class Compile(Benchmark):
+    """Building and compiling of select query."""
+
+    def time_compile_select(self):
+        author_mapper = mapper_registry[Author]
+        t = author_mapper.sql_table
+        get_db().compile(author_mapper.query.where(t.last_name == 'Last name').order_by(t.id).limit(10))
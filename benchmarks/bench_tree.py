@@ -0,0 +1,121 @@
+from ascetic.contrib.tree import MpMapper, MpModel
+from ascetic.mappers import Mapper, mapper_registry
+from benchmarks.base import Benchmark, get_db, create_tables, truncate_tables
+
+create_tables("""
+    CREATE TABLE bench_tree_location (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name VARCHAR(40),
+        parent_id INTEGER REFERENCES bench_tree_location (id) ON DELETE CASCADE,
+        tree_path VARCHAR(256)
+    );
+""")
+
+
+class Location(MpModel):
+    def __init__(self, id=None, name=None, parent_id=None, tree_path=None):
+        self.id = id
+        self.name = name
+        self.parent_id = parent_id
+        self.tree_path = tree_path
+
+
+class LocationMapper(MpMapper, Mapper):
+    db_table = 'bench_tree_location'
+
+LocationMapper(Location)
+
+
+def populate(fan_out, depth):
+    """Creates a tree by saving of nodes, and returns the root node."""
+    truncate_tables('bench_tree_location')
+    location_mapper = mapper_registry[Location]
+    root = Location(name='root')
+    location_mapper.save(root)
+    level = [root]
+    for i in range(depth):
+        next_level = []
+        for parent in level:
+            for j in range(fan_out):
+                obj = Location(name='{0}.{1}'.format(parent.name, j))
+                obj.parent = parent
+                location_mapper.save(obj)
+                next_level.append(obj)
+        level = next_level
+    return root
+
+
+class MpTreeQuery(Benchmark):
+    """Queries of materialized path tree with the given fan-out and depth 3."""
+    params = (2, 10)
+
+    def setup(self, fan_out):
+        self.root = populate(fan_out, 3)
+        location_mapper = mapper_registry[Location]
+        self.leaf_pk = location_mapper.get_pk(location_mapper.query.order_by(location_mapper.sql_table.pk.desc())[0])
+        self.leaves = list(location_mapper.query.order_by(location_mapper.sql_table.pk.desc())[:20])
+        get_db().identity_map.disable()
+
+    def teardown(self, fan_out):
+        get_db().identity_map.enable()
+
+    def time_get_children(self, fan_out):
+        list(self.root.get_children())
+
+    def time_get_descendants(self, fan_out):
+        list(self.root.get_descendants())
+
+    def time_get_ancestors_many(self, fan_out):
+        location_mapper = mapper_registry[Location]
+        location_mapper.get_ancestors_many(self.leaves, root=True)
+
+    def time_load_tree(self, fan_out):
+        mapper_registry[Location].load_tree(self.root)
+
+    def time_get_ancestors_chained(self, fan_out):
+        location_mapper = mapper_registry[Location]
+        location_mapper.get_ancestors_chained(location_mapper.get(self.leaf_pk), root=True)
+
+
+class MpTreeSave(Benchmark):
+
+    def setup(self):
+        # The identity map reloads all cached objects on commit of the save, the count of them grows with calls.
+        get_db().identity_map.disable()
+        self.root = populate(2, 1)
+
+    def teardown(self):
+        get_db().identity_map.enable()
+
+    def time_insert_leaf(self):
+        obj = Location(name='leaf')
+        obj.parent = self.root
+        mapper_registry[Location].save(obj)
+
+
+class MpTreeMove(Benchmark):
+    """Moving of node with the given count of children between two roots."""
+    params = (10, 100)
+
+    def setup(self, children):
+        get_db().identity_map.disable()
+        location_mapper = mapper_registry[Location]
+        truncate_tables('bench_tree_location')
+        self.roots = [Location(name='root 1'), Location(name='root 2')]
+        for root in self.roots:
+            location_mapper.save(root)
+        self.node = Location(name='node')
+        self.node.parent = self.roots[0]
+        location_mapper.save(self.node)
+        for i in range(children):
+            obj = Location(name='child {0}'.format(i))
+            obj.parent = self.node
+            location_mapper.save(obj)
+
+    def time_move(self, children):
+        self.roots.reverse()
+        self.node.parent = self.roots[0]
+        mapper_registry[Location].save(self.node)
+
+    def teardown(self, children):
+        get_db().identity_map.enable()
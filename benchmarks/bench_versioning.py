@@ -0,0 +1,34 @@
+from ascetic.contrib.versioning.serializers import Encoder2, Serializer
+from benchmarks.base import Benchmark
+
+
+def make_delta(i):
+    return {
+        'Article.title': '@@ -1,5 +1,5 @@\n-Title\n+Title {0}\n'.format(i),
+        'Article.body': '@@ -1,{0} +1,{0} @@\n{1}'.format(i, 'Lorem ipsum dolor sit amet\n' * 10),
+        'Article.rating': i,
+    }
+
+
+class SerializerRevisions(Benchmark):
+    """Serialization of revision deltas, as commit does, and their deserialization, as replay of history does.
+
+    Only the serializer is measured, not the repository of revisions.
+    """
+    params = (10, 100)
+
+    def setup(self, revisions):
+        self.serializer = Serializer(Encoder2())
+        self.deltas = [make_delta(i) for i in range(revisions)]
+        self.dumps = [self.serializer.dumps(delta) for delta in self.deltas]
+
+    def time_serialize(self, revisions):
+        dumps = self.serializer.dumps
+        for delta in self.deltas:
+            dumps(delta)
+
+    def time_deserialize(self, revisions):
+        serializer = self.serializer
+        for dump in self.dumps:
+            if serializer.is_acceptable(dump):
+                serializer.loads(dump)
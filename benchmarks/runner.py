@@ -0,0 +1,163 @@
+from __future__ import print_function
+import argparse
+import gc
+import importlib
+import inspect
+import json
+import os
+import platform
+import sqlite3
+import sys
+import timeit
+from functools import partial
+
+from benchmarks.base import Benchmark
+
+MODULES = (
+    'bench_mappers',
+    'bench_identity_maps',
+    'bench_query',
+    'bench_polymorphic',
+    'bench_tree',
+    'bench_versioning',
+)
+
+BASELINES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+MIN_REPEAT_TIME = 0.1
+
+# A benchmark which exceeds threshold is measured again, up to this number of times,
+# and the best minimum is compared, since noise of shared machines only slows down runs.
+RECHECKS = 3
+
+
+def get_benchmarks(module):
+    """Yields (name, benchmark class, method name, params)."""
+    classes = [cls for cls in vars(module).values()
+               if inspect.isclass(cls) and issubclass(cls, Benchmark) and cls.__module__ == module.__name__]
+    for cls in sorted(classes, key=lambda cls: cls.__name__):
+        methods = sorted(name for name in dir(cls) if name.startswith('time_'))
+        for method_name in methods:
+            if cls.params:
+                for param in cls.params:
+                    yield '{0}.{1}({2!r})'.format(cls.__name__, method_name, param), cls, method_name, (param,)
+            else:
+                yield '{0}.{1}'.format(cls.__name__, method_name), cls, method_name, ()
+
+
+def calibrate(timer):
+    number = 1
+    while True:
+        if timer.timeit(number) >= MIN_REPEAT_TIME or number >= 10 ** 6:
+            return number
+        number *= 2
+
+
+def measure(cls, method_name, params):
+    bench = cls()
+    bench.setup(*params)
+    # Garbage of setup() affects allocation of loaded objects, so timings would depend on the way of setup.
+    gc.collect()
+    try:
+        timer = timeit.Timer(partial(getattr(bench, method_name), *params))
+        number = cls.number or calibrate(timer)
+        times = sorted(t / number for t in timer.repeat(cls.repeat, number))
+    finally:
+        bench.teardown(*params)
+    return {
+        'min': times[0],
+        'median': times[len(times) // 2],
+        'number': number,
+        'repeat': cls.repeat,
+    }
+
+
+def get_environment():
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'sqlite': sqlite3.sqlite_version,
+        'machine': platform.machine(),
+    }
+
+
+def get_baseline_path(module_name):
+    return os.path.join(BASELINES_DIR, '{0}.json'.format(module_name))
+
+
+def load_baseline(module_name):
+    try:
+        with open(get_baseline_path(module_name)) as f:
+            return json.load(f)['results']
+    except (IOError, OSError):
+        return {}
+
+
+def save_baseline(module_name, results):
+    with open(get_baseline_path(module_name), 'w') as f:
+        json.dump({'environment': get_environment(), 'results': results}, f, indent=4, sort_keys=True)
+        f.write('\n')
+
+
+def format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return '{0:.2f}{1}'.format(seconds / scale, unit)
+    return '{0:.0f}ns'.format(seconds / 1e-9)
+
+
+def run_module(module_name, save=False, resave=False, threshold=None):
+    """Runs benchmarks of module and returns names of regressed benchmarks.
+
+    If save is True, results of benchmarks which have no baseline are added to baselines,
+    if resave is True, baselines are overwritten by all results.
+    """
+    module = importlib.import_module('benchmarks.{0}'.format(module_name))
+    baseline = load_baseline(module_name)
+    results = {}
+    regressions = []
+    print(module_name)
+    for name, cls, method_name, params in get_benchmarks(module):
+        result = measure(cls, method_name, params)
+        if threshold is not None and name in baseline:
+            for _ in range(RECHECKS):
+                if result['min'] / baseline[name]['min'] <= threshold:
+                    break
+                result = min(result, measure(cls, method_name, params), key=lambda r: r['min'])
+        results[name] = result
+        line = '    {0:<50} {1:>10}'.format(name, format_time(result['min']))
+        if name in baseline:
+            ratio = result['min'] / baseline[name]['min']
+            line += ' {0:>10} {1:6.2f}x'.format(format_time(baseline[name]['min']), ratio)
+            if threshold is not None and ratio > threshold:
+                regressions.append(name)
+                line += '  REGRESSION'
+        print(line)
+    if resave:
+        save_baseline(module_name, results)
+    elif save and set(results) - set(baseline):
+        results.update(baseline)
+        save_baseline(module_name, results)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('modules', nargs='*', default=MODULES, help='Benchmark modules to run')
+    parser.add_argument('--save', action='store_true', help='Add results of new benchmarks to baselines')
+    parser.add_argument('--resave', action='store_true', help='Overwrite baselines by current results')
+    parser.add_argument('--threshold', type=float, default=1.5,
+                        help='Ratio to baseline which is reported as regression (default: 1.5)')
+    args = parser.parse_args(argv)
+
+    regressions = []
+    for module_name in args.modules:
+        regressions += run_module(module_name, save=args.save, resave=args.resave, threshold=args.threshold)
+    if regressions and not args.resave:
+        print('Regressions: {0}'.format(', '.join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
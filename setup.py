@@ -8,7 +8,7 @@ setup(
     name='ascetic',
     version='0.7.2.40',
 
-    packages = find_packages(exclude=('examples*',)),
+    packages = find_packages(exclude=('examples*', 'benchmarks*')),
     include_package_data=True,
 
     author="Ivan Zakrevsky",